@@ -7,6 +7,7 @@ and scheduled task execution.
 
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_server.src.django_settings')
@@ -70,6 +71,12 @@ def hello():
     """Simple hello task for testing."""
     return 'Hello from Guild AI Celery!'
 
+@worker_process_init.connect
+def warm_blueprint_registry(**kwargs):
+    """Load blueprints (from the snapshot when it is current) before the first task arrives."""
+    from guild.src.core.blueprint_engine import get_blueprint_registry
+    get_blueprint_registry()
+
 @celery_app.task
 def execute_blueprint(blueprint_id: str, trigger_data: dict = None):
     """Execute a blueprint as a Celery task."""
@@ -83,6 +90,8 @@ def execute_blueprint(blueprint_id: str, trigger_data: dict = None):
             pass
         
         orchestrator = MockOrchestrator()
+        # Cheap per task: blueprints are parsed once per worker process (or read
+        # from the registry snapshot) and only re-parsed when their file changes
         blueprint_engine = BlueprintEngine(orchestrator)
         
         # Execute the blueprint
@@ -32,6 +32,13 @@ async def startup_event():
     print("Server ready to handle agent interactions!")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Release the pooled LLM connections held by this worker's event loop
+    from guild.src.core.llm_transport import get_llm_transport
+    await get_llm_transport().aclose()
+
+
 # Import routes
 from .routes import agents, oauth, document_processing
 
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, Any, List, Optional
 import asyncio
+import inspect
+import json
 import uuid
 from datetime import datetime
 
@@ -12,6 +15,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '../../..'))
 
 from guild.src.core.orchestrator import AGENT_REGISTRY, Orchestrator
 from guild.src.models.user_input import UserInput
+from guild.src.core.streaming import stream_agent_run
 
 router = APIRouter(
     prefix="/agents",
@@ -30,6 +34,9 @@ class AgentResponse(BaseModel):
     data: Dict[str, Any] = {}
     workflow_id: Optional[str] = None
 
+class AgentStreamRequest(BaseModel):
+    user_input: Optional[str] = None
+
 class WorkflowStatus(BaseModel):
     workflow_id: str
     status: str  # pending, running, completed, failed
@@ -43,100 +50,39 @@ class WorkflowStatus(BaseModel):
 # In-memory storage for demo (in production, use Redis or database)
 workflow_storage: Dict[str, WorkflowStatus] = {}
 
-# Initialize real agents from orchestrator
-real_agents = {}
-for agent_name, agent_class in AGENT_REGISTRY.items():
+# Constructor arguments for agents that need more than the defaults
+AGENT_INIT_KWARGS: Dict[str, Dict[str, Any]] = {
+    "ContentStrategist": {"user_input": "Initialize content strategist"},
+    "Copywriter": {"user_input": "Initialize copywriter", "content_strategy": "general"},
+    "CRMAgent": {"user_input": "Initialize CRM agent", "sales_funnel_context": "general"},
+    "HRAgent": {"user_input": "Initialize HR agent"},
+    "ComplianceAgent": {"user_input": "Initialize compliance agent", "business_operations_details": "general", "jurisdiction": "US"},
+    "SkillDevelopmentAgent": {"user_input": "Initialize skill development agent", "business_goals": "growth", "learning_preferences": "online", "time_availability": "flexible"},
+    "OutsourcingAgent": {"user_input": "Initialize outsourcing agent", "task_details": "general", "budget": 1000, "deadline": "30 days"},
+    "OnboardingAgent": {"user_input": "Initialize onboarding agent"},
+    "VisionEnhancedTrainingAgent": {"user_input": "Initialize vision training agent", "source_information": "general", "target_audience": "business owners"},
+    "WellBeingAgent": {"user_input": "Initialize wellbeing agent", "workload_data": "moderate", "solo_founder_preferences": "balanced"},
+}
+
+# Agents are imported and instantiated on first use rather than at module load;
+# None records an agent that failed to initialize
+real_agents: Dict[str, Any] = {}
+
+def get_real_agent(agent_name: str) -> Optional[Any]:
+    """Returns the shared instance of an agent, creating it on first use."""
+    if agent_name in real_agents:
+        return real_agents[agent_name]
+    if agent_name not in AGENT_REGISTRY:
+        return None
     try:
-        # Initialize agent with proper parameters based on agent type
-        if agent_name == "ContentStrategist":
-            real_agents[agent_name] = agent_class(user_input="Initialize content strategist")
-        elif agent_name == "Copywriter":
-            real_agents[agent_name] = agent_class(user_input="Initialize copywriter", content_strategy="general")
-        elif agent_name == "CRMAgent":
-            real_agents[agent_name] = agent_class(user_input="Initialize CRM agent", sales_funnel_context="general")
-        elif agent_name == "HRAgent":
-            real_agents[agent_name] = agent_class(user_input="Initialize HR agent")
-        elif agent_name == "ComplianceAgent":
-            real_agents[agent_name] = agent_class(user_input="Initialize compliance agent", business_operations_details="general", jurisdiction="US")
-        elif agent_name == "SkillDevelopmentAgent":
-            real_agents[agent_name] = agent_class(user_input="Initialize skill development agent", business_goals="growth", learning_preferences="online", time_availability="flexible")
-        elif agent_name == "OutsourcingAgent":
-            real_agents[agent_name] = agent_class(user_input="Initialize outsourcing agent", task_details="general", budget=1000, deadline="30 days")
-        elif agent_name == "OnboardingAgent":
-            real_agents[agent_name] = agent_class(user_input="Initialize onboarding agent")
-        elif agent_name == "VisionEnhancedTrainingAgent":
-            real_agents[agent_name] = agent_class(user_input="Initialize vision training agent", source_information="general", target_audience="business owners")
-        elif agent_name == "WellBeingAgent":
-            real_agents[agent_name] = agent_class(user_input="Initialize wellbeing agent", workload_data="moderate", solo_founder_preferences="balanced")
-        else:
-            # For agents that don't require specific parameters
-            real_agents[agent_name] = agent_class()
+        agent_class = AGENT_REGISTRY[agent_name]
+        real_agents[agent_name] = agent_class(**AGENT_INIT_KWARGS.get(agent_name, {}))
     except Exception as e:
         print(f"Warning: Could not initialize {agent_name}: {e}")
-        # Skip this agent if it fails to initialize
-        continue
-
-# Real agents are now initialized from the orchestrator
-    
-    def create_campaign(self, **kwargs):
-        return {
-            "campaign_id": f"camp_{uuid.uuid4().hex[:8]}",
-            "status": "created",
-            "message": f"Campaign '{kwargs.get('campaign_name', 'Unnamed')}' created successfully",
-            "details": kwargs
-        }
-    
-    def generate_report(self, **kwargs):
-        return {
-            "report_id": f"report_{uuid.uuid4().hex[:8]}",
-            "status": "generated",
-            "message": f"Report '{kwargs.get('report_type', 'performance')}' generated successfully",
-            "details": kwargs
-        }
-    
-    def analyze_goals(self, goals):
-        return {
-            "analysis_id": f"analysis_{uuid.uuid4().hex[:8]}",
-            "status": "analyzed",
-            "message": f"Analyzed {len(goals)} goals successfully",
-            "goals": goals,
-            "recommendations": ["Focus on high-impact goals first", "Set measurable milestones"]
-        }
-    
-    def research_topic(self, query):
-        return {
-            "research_id": f"research_{uuid.uuid4().hex[:8]}",
-            "status": "completed",
-            "message": f"Research on '{query}' completed successfully",
-            "query": query,
-            "findings": ["Market is growing rapidly", "Competition is moderate", "Opportunities exist"]
-        }
-    
-    def create_content_plan(self, **kwargs):
-        return {
-            "content_id": f"content_{uuid.uuid4().hex[:8]}",
-            "status": "created",
-            "message": f"Content plan for '{kwargs.get('topic', 'topic')}' created successfully",
-            "details": kwargs,
-            "outline": ["Introduction", "Main points", "Conclusion", "Call to action"]
-        }
-    
-    def analyze_performance(self, metrics):
-        return {
-            "analysis_id": f"perf_{uuid.uuid4().hex[:8]}",
-            "status": "analyzed",
-            "message": "Performance analysis completed successfully",
-            "metrics": metrics,
-            "insights": ["Traffic is increasing", "Conversion rate is stable", "Revenue is growing"]
-        }
+        real_agents[agent_name] = None
+    return real_agents[agent_name]
 
-# Create aliases for backward compatibility
-marketing_agent = real_agents.get("MarketingAgent")
-research_agent = real_agents.get("ResearchAgent")
-content_strategist = real_agents.get("ContentStrategist")
-business_strategist = real_agents.get("BusinessStrategistAgent")
 analytics_agent = None  # This one doesn't exist yet
-orchestrator = real_agents.get("OrchestratorAgent")
 
 @router.post("/interact", response_model=AgentResponse)
 async def interact_with_agent(request: AgentRequest):
@@ -220,32 +166,13 @@ async def handle_launch_campaign(data: Dict[str, Any], workflow_id: str) -> Dict
         "channels": data.get("channels", ["social", "email"])
     }
     
-    # Use real marketing agent if available, otherwise fallback to mock
-    try:
-        if "MarketingAgent" in real_agents and real_agents["MarketingAgent"] is not None:
-            # Use real agent - you would call the actual agent method here
-            campaign_result = real_agents["MarketingAgent"].create_campaign(
-                campaign_name=campaign_data["name"],
-                target_audience=campaign_data["target_audience"],
-                budget=campaign_data["budget"],
-                duration_days=campaign_data["duration"]
-            )
-        else:
-            # Use mock agent
-            campaign_result = marketing_agent.create_campaign(
-                campaign_name=campaign_data["name"],
-                target_audience=campaign_data["target_audience"],
-                budget=campaign_data["budget"],
-                duration_days=campaign_data["duration"]
-            )
-    except Exception as e:
-        # Fallback to mock on error
-        campaign_result = marketing_agent.create_campaign(
-            campaign_name=campaign_data["name"],
-            target_audience=campaign_data["target_audience"],
-            budget=campaign_data["budget"],
-            duration_days=campaign_data["duration"]
-        )
+    marketing_agent = get_real_agent("MarketingAgent")
+    campaign_result = marketing_agent.create_campaign(
+        campaign_name=campaign_data["name"],
+        target_audience=campaign_data["target_audience"],
+        budget=campaign_data["budget"],
+        duration_days=campaign_data["duration"]
+    )
     
     workflow_storage[workflow_id].progress = 75
     workflow_storage[workflow_id].current_step = "Campaign launched successfully"
@@ -302,7 +229,7 @@ async def handle_set_goals(data: Dict[str, Any], workflow_id: str) -> Dict[str,
     goals = data.get("goals", [])
     
     # Use business strategist to analyze goals
-    strategy_result = business_strategist.analyze_goals(goals)
+    strategy_result = get_real_agent("BusinessStrategistAgent").analyze_goals(goals)
     
     workflow_storage[workflow_id].progress = 70
     workflow_storage[workflow_id].current_step = "Goals analyzed and roadmap created"
@@ -333,7 +260,7 @@ async def handle_research_market(data: Dict[str, Any], workflow_id: str) -> Dict
     query = data.get("query", "market trends")
     
     # Use research agent to conduct research
-    research_result = research_agent.research_topic(query)
+    research_result = get_real_agent("ResearchAgent").research_topic(query)
     
     workflow_storage[workflow_id].progress = 85
     workflow_storage[workflow_id].current_step = "Research completed"
@@ -362,6 +289,7 @@ async def handle_create_content(data: Dict[str, Any], workflow_id: str) -> Dict[
     content_request = data.get("content_request", {})
     
     # Use content strategist to create content
+    content_strategist = get_real_agent("ContentStrategist")
     if content_strategist is not None:
         # Update the agent's user_input with the new request
         content_strategist.user_input = type('UserInput', (), {
@@ -449,14 +377,14 @@ async def handle_lead_generation_workflow(data: Dict[str, Any], workflow_id: str
     workflow_storage[workflow_id].progress = 30
     await asyncio.sleep(1)
     
-    research_result = research_agent.research_topic(f"lead generation for {target_audience}")
+    research_result = get_real_agent("ResearchAgent").research_topic(f"lead generation for {target_audience}")
     
     # Step 2: Create campaign
     workflow_storage[workflow_id].current_step = "Creating lead generation campaign"
     workflow_storage[workflow_id].progress = 60
     await asyncio.sleep(1)
     
-    campaign_result = marketing_agent.create_campaign(
+    campaign_result = get_real_agent("MarketingAgent").create_campaign(
         campaign_name=f"Lead Gen - {target_audience}",
         target_audience=target_audience,
         budget=2000,
@@ -491,14 +419,14 @@ async def handle_content_marketing_workflow(data: Dict[str, Any], workflow_id: s
     workflow_storage[workflow_id].progress = 40
     await asyncio.sleep(1)
     
-    research_result = research_agent.research_topic("content marketing trends 2024")
+    research_result = get_real_agent("ResearchAgent").research_topic("content marketing trends 2024")
     
     # Step 2: Create content plan
     workflow_storage[workflow_id].current_step = "Creating content calendar"
     workflow_storage[workflow_id].progress = 70
     await asyncio.sleep(1)
     
-    content_plan = content_strategist.create_content_plan(
+    content_plan = get_real_agent("ContentStrategist").create_content_plan(
         topic=content_strategy.get("topic", "Business Growth"),
         format=content_strategy.get("format", "blog_post"),
         target_audience=content_strategy.get("audience", "entrepreneurs")
@@ -537,6 +465,50 @@ async def get_all_workflows():
     """Get all workflows"""
     return list(workflow_storage.values())
 
+def agent_run_arguments(run, user_input: Optional[str]):
+    """
+    Arguments for calling an agent's `run` with the request's user input.
+
+    Agents disagree on `run`'s signature: some take the input positionally, some
+    only as a `user_input` keyword, and some take nothing at all (they were given
+    their input at construction). The input is passed only where it is accepted.
+    """
+    if user_input is None:
+        return (), {}
+    for parameter in inspect.signature(run).parameters.values():
+        if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD, parameter.VAR_POSITIONAL):
+            return (user_input,), {}
+        if parameter.kind == parameter.KEYWORD_ONLY and parameter.name == "user_input":
+            return (), {"user_input": user_input}
+    return (), {}
+
+@router.post("/{agent_name}/stream")
+async def stream_agent(agent_name: str, request: AgentStreamRequest):
+    """
+    Run an agent and stream its partial LLM output as server-sent events.
+
+    Emits `token` events with `delta` text while the agent works, then a single
+    `result` event with the agent's final output (or an `error` event).
+    """
+    agent = get_real_agent(agent_name)
+    if agent is None:
+        raise HTTPException(status_code=404, detail=f"Agent '{agent_name}' not found")
+
+    args, kwargs = agent_run_arguments(agent.run, request.user_input)
+
+    async def event_stream():
+        try:
+            async for event in stream_agent_run(agent.run, *args, **kwargs):
+                yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/list")
 async def get_available_agents():
     """Get list of all available agents"""
@@ -545,15 +517,26 @@ async def get_available_agents():
         "total_count": len(AGENT_REGISTRY),
         "agent_details": {
             name: {
-                "class_name": agent_class.__name__,
-                "module": agent_class.__module__,
+                "class_name": AGENT_REGISTRY.class_name_of(name),
+                "module": AGENT_REGISTRY.module_of(name),
+                "is_loaded": AGENT_REGISTRY.is_loaded(name),
                 "is_initialized": name in real_agents,
                 "is_real": name in real_agents and real_agents[name] is not None
             }
-            for name, agent_class in AGENT_REGISTRY.items()
+            for name in AGENT_REGISTRY
         }
     }
 
+@router.get("/import-costs")
+async def get_agent_import_costs():
+    """Import time of each agent module loaded so far, most expensive first"""
+    report = AGENT_REGISTRY.import_report()
+    return {
+        "agents": report,
+        "loaded_count": sum(1 for entry in report if entry["loaded"]),
+        "total_import_seconds": round(sum(entry["import_seconds"] for entry in report), 4),
+    }
+
 @router.get("/status")
 async def get_agents_status():
     """Get status of all agents"""
@@ -588,5 +571,6 @@ async def get_agents_status():
         "agents": agents_status,
         "total_agents": len(real_agents),
         "active_agents": active_count,
-        "system_status": "healthy" if active_count > 0 else "degraded"
+        # Agents initialize on first use, so an empty set is not a failure
+        "system_status": "healthy" if active_count > 0 or not real_agents else "degraded"
     }
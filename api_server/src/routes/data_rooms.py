@@ -7,6 +7,7 @@ from guild.src.core.models.schemas import DataRoom as PydanticDataRoom, DataRoom
 
 from .. import models
 from ..database import get_db
+from ..tasks import sync_data_room_task
 
 router = APIRouter(
     prefix="/datarooms",
@@ -44,6 +45,19 @@ def get_data_room(data_room_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Data Room not found")
     return db_data_room
 
+@router.post("/{data_room_id}/sync", status_code=202)
+def sync_data_room(data_room_id: str, db: Session = Depends(get_db)):
+    """
+    Queue an incremental re-index of a Data Room from its provider.
+    """
+    db_data_room = db.query(models.DataRoom).filter(models.DataRoom.id == data_room_id).first()
+    if db_data_room is None:
+        raise HTTPException(status_code=404, detail="Data Room not found")
+
+    sync_data_room_task.delay(data_room_id=data_room_id)
+
+    return {"message": "Data Room sync started.", "data_room_id": data_room_id}
+
 @router.delete("/{data_room_id}", status_code=204)
 def delete_data_room(data_room_id: str, db: Session = Depends(get_db)):
     """
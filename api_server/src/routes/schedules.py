@@ -18,8 +18,7 @@ from guild.src.core.blueprint_engine import BlueprintEngine
 
 router = APIRouter(prefix="/schedules", tags=["schedules"])
 
-# Initialize blueprint engine (in production, this should be a singleton)
-# For now, we'll create a mock one
+# Initialize blueprint engine; parsed blueprints come from the process-wide registry
 class MockOrchestrator:
     pass
 
@@ -19,7 +19,7 @@ from guild.src.core.blueprint_engine import BlueprintEngine
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
-# Initialize blueprint engine (in production, this should be a singleton)
+# Initialize blueprint engine; parsed blueprints come from the process-wide registry
 class MockOrchestrator:
     pass
 
@@ -1,5 +1,5 @@
 import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Any
 
 from .celery_app import celery_app
@@ -10,6 +10,7 @@ from . import models
 from guild.src.core.orchestrator import Orchestrator
 from guild.src.models.user_input import UserInput
 from guild.src.models.workflow import Workflow as PydanticWorkflow, Task as PydanticTask
+from guild.src.core.models.schemas import DataRoom as PydanticDataRoom
 
 
 @celery_app.task(bind=True)
@@ -84,3 +85,38 @@ def run_workflow_task(self, workflow_id: str):
         raise
     finally:
         db.close()
+
+
+@celery_app.task(bind=True)
+def sync_data_room_task(self, data_room_id: str):
+    """
+    A Celery task that re-indexes a data room from its provider, touching only what changed.
+    """
+    # Imported here so workers that never sync do not load the vector store stack
+    from guild.src.core.sync import sync_data_room
+    from guild.src.integrations.registry import get_connector
+
+    print(f"Celery task started for data room sync: {data_room_id}")
+    db = SessionLocal()
+    try:
+        db_data_room = db.query(models.DataRoom).filter(models.DataRoom.id == data_room_id).first()
+        if not db_data_room:
+            print(f"Data room {data_room_id} not found for sync.")
+            return "Data room not found."
+
+        data_room = PydanticDataRoom.from_orm(db_data_room)
+        report = sync_data_room(data_room, get_connector(data_room.provider))
+
+        db_data_room.last_sync_at = datetime.now(timezone.utc)
+        db.commit()
+
+        summary = {key: value for key, value in report.items() if key != "diff"}
+        print(f"Celery task finished data room sync {data_room_id}: {summary}")
+        return summary
+
+    except Exception as e:
+        print(f"Error during data room sync {data_room_id}: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -148,6 +148,10 @@ class JudgeAgent:
         ]
         self.quality_rubrics = {}
     
+    def reset(self):
+        """Drops rubrics generated for previous evaluations."""
+        self.quality_rubrics = {}
+    
     async def run(self, user_input: str = None) -> Dict[str, Any]:
         """
         Main execution method for the Judge Agent.
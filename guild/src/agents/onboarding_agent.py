@@ -287,10 +287,20 @@ class OnboardingAgent(Agent):
         import os
         provider = os.getenv("LLM_PROVIDER", "ollama")
         model = os.getenv("OLLAMA_MODEL", "tinyllama")
-        self.llm_client = LlmClient(Llm(provider=provider, model=model))
+        # Onboarding routes call this agent directly, outside the orchestrator's
+        # current_agent context, so name the cache namespace explicitly
+        self.llm_client = LlmClient(Llm(provider=provider, model=model), cache_namespace=type(self).__name__)
         self.state = "GREETING" # Initial state
         self.business_description = ""
     
+    def reset(self):
+        """Returns the agent to the start of a fresh conversation, dropping the previous user's answers."""
+        self.state = "GREETING"
+        self.business_description = ""
+        if hasattr(self, "onboarding_database"):
+            self.onboarding_database = {}
+            self.user_profiles = {}
+    
     async def run(self, user_input: str = None) -> Dict[str, Any]:
         """
         Main execution method for the Onboarding Agent.
@@ -4,7 +4,7 @@ Comprehensive research and information gathering using advanced prompting strate
 """
 
 from guild.src.core.llm_client import LlmClient
-from playwright.sync_api import sync_playwright
+from guild.src.core.browser_pool import get_browser_pool
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from guild.src.core.agent_helpers import inject_knowledge
@@ -269,7 +269,7 @@ class ResearchAgent:
             quality_assurance = strategy.get("quality_assurance", {})
             
             # Use existing search_web function for compatibility
-            web_search_result = search_web(research_topic)
+            web_search_result = await search_web_async(research_topic)
             
             return {
                 "status": "success",
@@ -303,9 +303,38 @@ class ResearchAgent:
                 "message": f"Research strategy execution failed: {str(e)}"
             }
 
-def search_web(query: str) -> Dict[str, Any]:
+async def _fetch_top_result(page, query: str) -> Dict[str, Any]:
+    """Runs a DuckDuckGo search on a pooled page and returns the top result's text."""
+    # Use DuckDuckGo as it's generally more scraper-friendly than Google.
+    search_url = f"https://duckduckgo.com/?q={query}"
+    await page.goto(search_url, wait_until="networkidle")
+
+    # Find the first search result link.
+    # This selector targets the main result links on DuckDuckGo's page.
+    first_result_selector = 'a[data-testid="result-title-a"]'
+
+    # Wait for the selector to ensure the page has loaded results
+    await page.wait_for_selector(first_result_selector, timeout=5000)
+
+    first_result_href = await page.get_attribute(first_result_selector, 'href')
+
+    if not first_result_href:
+        # No URL: the knowledge cache treats this as a failed search, not as content
+        return {"url": None, "content": "Could not find a valid search result link."}
+
+    # Go to the first result page
+    await page.goto(first_result_href, wait_until="domcontentloaded")
+
+    # Extract text content using Playwright's built-in method
+    # This is generally more robust than BeautifulSoup for dynamic pages.
+    text_content = await page.evaluate("document.body.innerText")
+
+    print(f"Research Agent: Successfully fetched content from {first_result_href}")
+    return {"url": first_result_href, "content": text_content[:5000]} # Limit content size
+
+async def search_web_async(query: str) -> Dict[str, Any]:
     """
-    Performs a web search for a given query using a headless browser
+    Performs a web search for a given query on the shared browser pool
     and returns the content of the top search result.
 
     Args:
@@ -315,44 +344,28 @@ def search_web(query: str) -> Dict[str, Any]:
         A dictionary containing the URL and the extracted text content.
     """
     print(f"Research Agent: Searching for '{query}' with Playwright...")
+    try:
+        return await get_browser_pool().run(lambda page: _fetch_top_result(page, query))
+    except Exception as e:
+        print(f"Research Agent: Error during Playwright web search - {e}")
+        return {"url": None, "content": f"An error occurred: {e}"}
 
-    with sync_playwright() as p:
-        try:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-
-            # Use DuckDuckGo as it's generally more scraper-friendly than Google.
-            search_url = f"https://duckduckgo.com/?q={query}"
-            page.goto(search_url, wait_until="networkidle")
-
-            # Find the first search result link.
-            # This selector targets the main result links on DuckDuckGo's page.
-            first_result_selector = 'a[data-testid="result-title-a"]'
-
-            # Wait for the selector to ensure the page has loaded results
-            page.wait_for_selector(first_result_selector, timeout=5000)
-
-            first_result_href = page.get_attribute(first_result_selector, 'href')
-
-            if not first_result_href:
-                browser.close()
-                return {"url": search_url, "content": "Could not find a valid search result link."}
-
-            # Go to the first result page
-            page.goto(first_result_href, wait_until="domcontentloaded")
-
-            # Extract text content using Playwright's built-in method
-            # This is generally more robust than BeautifulSoup for dynamic pages.
-            text_content = page.evaluate("document.body.innerText")
+def search_web(query: str) -> Dict[str, Any]:
+    """
+    Performs a web search for a given query using a headless browser
+    and returns the content of the top search result.
 
-            browser.close()
+    Blocks the calling thread; async code should await search_web_async instead.
 
-            print(f"Research Agent: Successfully fetched content from {first_result_href}")
-            return {"url": first_result_href, "content": text_content[:5000]} # Limit content size
+    Args:
+        query: The search query.
 
-        except Exception as e:
-            print(f"Research Agent: Error during Playwright web search - {e}")
-            # Ensure browser is closed in case of an error
-            if 'browser' in locals() and browser.is_connected():
-                browser.close()
-            return {"url": None, "content": f"An error occurred: {e}"}
+    Returns:
+        A dictionary containing the URL and the extracted text content.
+    """
+    print(f"Research Agent: Searching for '{query}' with Playwright...")
+    try:
+        return get_browser_pool().run_sync(lambda page: _fetch_top_result(page, query))
+    except Exception as e:
+        print(f"Research Agent: Error during Playwright web search - {e}")
+        return {"url": None, "content": f"An error occurred: {e}"}
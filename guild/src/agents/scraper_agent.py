@@ -4,7 +4,7 @@ Comprehensive lead prospecting and data collection using advanced prompting stra
 """
 
 from guild.src.core.llm_client import LlmClient
-from playwright.sync_api import sync_playwright
+from guild.src.core.browser_pool import get_browser_pool
 from typing import Dict, Any, List, Optional
 import logging
 import json
@@ -522,7 +522,7 @@ class ScraperAgent:
             num_leads = 10  # Default, could be extracted from strategy
             
             # Use existing scrape_leads method with advanced capabilities
-            leads = self.scrape_leads(
+            leads = await self.scrape_leads_async(
                 query=search_query,
                 num_leads=num_leads,
                 use_advanced=True,
@@ -647,16 +647,47 @@ class ScraperAgent:
         logger.info(f"Scraper Agent: Scraping for '{query}'...")
 
         if use_advanced and self.advanced_scraper:
-            return self._scrape_leads_advanced(query, num_leads, icp_criteria)
-        else:
-            return self._scrape_leads_basic(query, num_leads)
+            leads = self._scrape_leads_advanced(query, num_leads, icp_criteria)
+            if leads is not None:
+                return leads
+        return self._scrape_leads_basic(query, num_leads)
+    
+    async def scrape_leads_async(self, 
+                                 query: str, 
+                                 num_leads: int = 10,
+                                 use_advanced: bool = True,
+                                 icp_criteria: Optional[Dict[str, Any]] = None) -> List[Dict[str, str]]:
+        """
+        Async version of scrape_leads for callers already on an event loop.
+
+        The Scrapy crawl blocks while it waits for its reactor thread, so it runs
+        in a worker thread; the basic path awaits the shared browser pool directly.
+
+        Args:
+            query: The search query for the leads
+            num_leads: The desired number of leads to find
+            use_advanced: Whether to use advanced Scrapy-based scraping
+            icp_criteria: Ideal Customer Profile criteria for filtering
+
+        Returns:
+            A list of dictionaries, where each dictionary represents a lead.
+        """
+        logger.info(f"Scraper Agent: Scraping for '{query}'...")
+
+        if use_advanced and self.advanced_scraper:
+            leads = await asyncio.to_thread(self._scrape_leads_advanced, query, num_leads, icp_criteria)
+            if leads is not None:
+                return leads
+        return await self._scrape_leads_basic_async(query, num_leads)
     
     def _scrape_leads_advanced(self, 
                               query: str, 
                               num_leads: int,
-                              icp_criteria: Optional[Dict[str, Any]] = None) -> List[Dict[str, str]]:
+                              icp_criteria: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, str]]]:
         """
         Use advanced Scrapy-based scraping for better results.
+
+        Returns None when the crawl failed, so the caller falls back to basic scraping.
         """
         try:
             # Generate search URLs based on query
@@ -678,62 +709,67 @@ class ScraperAgent:
                 return leads
             else:
                 logger.warning(f"Advanced scraping failed: {results.get('error')}")
-                # Fall back to basic scraping
-                return self._scrape_leads_basic(query, num_leads)
+                return None
                 
         except Exception as e:
             logger.error(f"Error in advanced scraping: {e}")
-            # Fall back to basic scraping
-            return self._scrape_leads_basic(query, num_leads)
+            return None
     
     def _scrape_leads_basic(self, query: str, num_leads: int) -> List[Dict[str, str]]:
         """
-        Basic Playwright-based scraping (original implementation).
+        Basic Playwright-based scraping (original implementation), run on the shared browser pool.
+        """
+        try:
+            leads = get_browser_pool().run_sync(lambda page: self._scrape_search_results(page, query, num_leads))
+            logger.info(f"Scraper Agent: Successfully scraped {len(leads)} potential leads.")
+            return leads
+        except Exception as e:
+            logger.error(f"Scraper Agent: Error during lead scraping - {e}")
+            return []
+    
+    async def _scrape_leads_basic_async(self, query: str, num_leads: int) -> List[Dict[str, str]]:
+        """
+        Async version of _scrape_leads_basic; awaits the shared browser pool instead of blocking on it.
         """
+        try:
+            leads = await get_browser_pool().run(lambda page: self._scrape_search_results(page, query, num_leads))
+            logger.info(f"Scraper Agent: Successfully scraped {len(leads)} potential leads.")
+            return leads
+        except Exception as e:
+            logger.error(f"Scraper Agent: Error during lead scraping - {e}")
+            return []
+    
+    async def _scrape_search_results(self, page, query: str, num_leads: int) -> List[Dict[str, str]]:
         leads = []
 
-        with sync_playwright() as p:
-            try:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-
-                search_url = f"https://duckduckgo.com/?q={query}"
-                page.goto(search_url, wait_until="networkidle")
+        search_url = f"https://duckduckgo.com/?q={query}"
+        await page.goto(search_url, wait_until="networkidle")
 
-                # This is a very simplified example of lead scraping.
-                # A real implementation would be much more sophisticated, potentially
-                # visiting each search result link to find contact information.
+        # This is a very simplified example of lead scraping.
+        # A real implementation would be much more sophisticated, potentially
+        # visiting each search result link to find contact information.
 
-                # For now, we'll just scrape the titles and snippets from the search results page.
-                result_elements_selector = 'article[data-testid="result"]'
-                page.wait_for_selector(result_elements_selector, timeout=10000)
+        # For now, we'll just scrape the titles and snippets from the search results page.
+        result_elements_selector = 'article[data-testid="result"]'
+        await page.wait_for_selector(result_elements_selector, timeout=10000)
 
-                results = page.query_selector_all(result_elements_selector)
+        results = await page.query_selector_all(result_elements_selector)
 
-                for result in results[:num_leads]:
-                    title_element = result.query_selector('a[data-testid="result-title-a"]')
-                    snippet_element = result.query_selector('div[data-testid="result-snippet"]')
+        for result in results[:num_leads]:
+            title_element = await result.query_selector('a[data-testid="result-title-a"]')
+            snippet_element = await result.query_selector('div[data-testid="result-snippet"]')
 
-                    title = title_element.inner_text() if title_element else "No Title"
-                    link = title_element.get_attribute('href') if title_element else "No Link"
-                    snippet = snippet_element.inner_text() if snippet_element else "No Snippet"
+            title = await title_element.inner_text() if title_element else "No Title"
+            link = await title_element.get_attribute('href') if title_element else "No Link"
+            snippet = await snippet_element.inner_text() if snippet_element else "No Snippet"
 
-                    leads.append({
-                        "title": title,
-                        "link": link,
-                        "summary": snippet
-                    })
+            leads.append({
+                "title": title,
+                "link": link,
+                "summary": snippet
+            })
 
-                browser.close()
-
-                logger.info(f"Scraper Agent: Successfully scraped {len(leads)} potential leads.")
-                return leads
-
-            except Exception as e:
-                logger.error(f"Scraper Agent: Error during lead scraping - {e}")
-                if 'browser' in locals() and browser.is_connected():
-                    browser.close()
-                return []
+        return leads
     
     def _generate_search_urls(self, query: str) -> List[str]:
         """
@@ -1,42 +1,176 @@
+import asyncio
+import contextvars
+import inspect
+from collections import OrderedDict
 from functools import wraps
-from guild.src.agents import research_agent
+from typing import Any, Dict, Iterable, List, Optional
 
-def inject_knowledge(agent_function):
+from guild.src.core.knowledge_cache import get_knowledge_cache, normalize_query
+from guild.src.core.llm_cache import current_agent
+
+# Searches in flight on the event loop, by normalized query, so prefetches and injections share them
+_searches: Dict[str, asyncio.Task] = {}
+# Queries each agent's injected prompts searched for, most recent last; what a workflow prefetches
+_agent_queries: Dict[str, "OrderedDict[str, None]"] = {}
+_MAX_QUERIES_PER_AGENT = 8
+
+
+class _InjectionScope:
+    """The call to a decorated coroutine function whose LLM prompts get knowledge injected."""
+
+    def __init__(self, prompt: Optional[str] = None, search: Optional[asyncio.Task] = None):
+        self.prompt = prompt
+        self.search = search
+
+
+_injection_scope: contextvars.ContextVar[Optional[_InjectionScope]] = contextvars.ContextVar(
+    "knowledge_injection_scope", default=None
+)
+
+
+def extract_search_query(prompt: str) -> str:
     """
-    A decorator that injects real-time knowledge into an agent's prompt.
+    Heuristic to find a good search query from the prompt.
 
-    It performs a web search based on the core task in the prompt and
-    prepends the findings to the original prompt.
+    This is a simplification; a better approach might be to use an LLM
+    to extract key topics from the prompt.
     """
-    @wraps(agent_function)
-    def wrapper(*args, **kwargs):
-        # The prompt is expected to be a keyword argument to the decorated function.
-        prompt = kwargs.get("prompt")
-        if not prompt:
-            # If there's no prompt, we can't do much.
-            return agent_function(*args, **kwargs)
+    try:
+        # Look for a line like "Client's Objective: '...'"
+        query_line = next(line for line in prompt.split('\n') if "objective" in line.lower())
+        return query_line.split(':')[1].strip().replace('"', '')
+    except (StopIteration, IndexError):
+        # Fallback to using the first non-empty line of the prompt
+        return next((line for line in prompt.split('\n') if line.strip()), "general context")
 
-        # Heuristic to find a good search query from the prompt.
-        # This is a simplification; a better approach might be to use an LLM
-        # to extract key topics from the prompt.
-        try:
-            # Look for a line like "Client's Objective: '...'"
-            query_line = next(line for line in prompt.split('\n') if "objective" in line.lower())
-            search_query = query_line.split(':')[1].strip().replace('"', '')
-        except StopIteration:
-            # Fallback to using the first non-empty line of the prompt
-            search_query = next((line for line in prompt.split('\n') if line.strip()), "general context")
 
-        print(f"  [Knowledge Injector]: Performing web search for query: '{search_query}'...")
-        research_results = research_agent.search_web(query=search_query)
+def fetch_knowledge(search_query: str) -> Dict[str, Any]:
+    """Runs (or reuses a cached) web search for `search_query`. Blocks the calling thread."""
+    # Imported here: research_agent itself imports this module for the decorator
+    from guild.src.agents import research_agent
+
+    knowledge_cache = get_knowledge_cache()
+    if knowledge_cache is not None:
+        return knowledge_cache.get_or_fetch(search_query, research_agent.search_web)
+    return research_agent.search_web(query=search_query)
+
+
+async def fetch_knowledge_async(search_query: str) -> Dict[str, Any]:
+    """`fetch_knowledge` on a worker thread, so the event loop keeps running other agents."""
+    return await asyncio.to_thread(fetch_knowledge, search_query)
+
+
+def start_knowledge_search(search_query: str) -> asyncio.Task:
+    """
+    Returns the task searching for `search_query` on the running loop, starting one if needed.
+
+    A search already in flight for the same query (after normalization), such
+    as one started by `prefetch_knowledge`, is returned instead of starting
+    another. Await the task through `asyncio.shield`, since other callers may share it.
+    """
+    key = normalize_query(search_query)
+    loop = asyncio.get_running_loop()
+    task = _searches.get(key)
+    if task is not None and not task.done() and task.get_loop() is loop:
+        return task
+    task = loop.create_task(fetch_knowledge_async(search_query))
+    _searches[key] = task
+    task.add_done_callback(lambda done: _finish_search(key, done))
+    return task
+
+
+def _finish_search(key: str, task: asyncio.Task) -> None:
+    if _searches.get(key) is task:
+        del _searches[key]
+    # Errors surface to whoever awaits the task; a prefetch nobody awaited must not warn
+    if not task.cancelled():
+        task.exception()
+
+
+def prefetch_knowledge(search_queries: Iterable[str]) -> List[asyncio.Task]:
+    """
+    Starts knowledge searches in the background, ahead of the prompts that need them.
+
+    Must be called from a running event loop. Injections for the same queries
+    reuse the searches while they are in flight, and the knowledge cache once
+    they are done.
+
+    Args:
+        search_queries: Queries as `extract_search_query` returns them for the prompts
+
+    Returns:
+        The searches, one per distinct query
+    """
+    if get_knowledge_cache() is None:
+        # A search that finishes before its prompt is built would be lost
+        return []
+    searches: Dict[str, asyncio.Task] = {}
+    for search_query in search_queries:
+        if search_query and search_query.strip():
+            searches.setdefault(normalize_query(search_query), start_knowledge_search(search_query))
+    return list(searches.values())
 
-        knowledge_context = "No relevant context found."
-        if research_results and research_results.get("content"):
-            knowledge_context = research_results["content"]
-            print(f"  [Knowledge Injector]: Found context from {research_results.get('url')}")
 
-        # Prepend the fetched context to the original prompt
-        injected_prompt = f"""
+def known_knowledge_queries(agent_name: str) -> List[str]:
+    """Returns the queries the injected prompts of `agent_name` searched for in this process."""
+    return list(_agent_queries.get(agent_name, ()))
+
+
+def _record_query(search_query: str) -> None:
+    agent_name = current_agent.get()
+    if agent_name is None:
+        return
+    queries = _agent_queries.setdefault(agent_name, OrderedDict())
+    queries[search_query] = None
+    queries.move_to_end(search_query)
+    while len(queries) > _MAX_QUERIES_PER_AGENT:
+        queries.popitem(last=False)
+
+
+def _start_injection_search(prompt: str) -> asyncio.Task:
+    search_query = extract_search_query(prompt)
+    print(f"  [Knowledge Injector]: Performing web search for query: '{search_query}'...")
+    _record_query(search_query)
+    return start_knowledge_search(search_query)
+
+
+async def inject_pending_knowledge(prompt: str) -> str:
+    """
+    Injects knowledge into a prompt about to be sent to the LLM.
+
+    Outside a call to an `inject_knowledge` coroutine function the prompt is
+    returned unchanged. Inside one, this is where the search is awaited, so
+    everything the function did before sending the prompt overlapped it. When
+    the function's own `prompt` argument is part of the prompt sent, it is
+    replaced by its injected form, using the search started for it when the
+    function was called.
+
+    Args:
+        prompt: The prompt as the LLM client is about to send it
+
+    Returns:
+        The prompt to send
+    """
+    scope = _injection_scope.get()
+    if scope is None or not prompt:
+        return prompt
+    original, search = prompt, None
+    if scope.prompt and scope.prompt in prompt:
+        original, search = scope.prompt, scope.search
+    if search is None:
+        search = _start_injection_search(original)
+    research_results = await asyncio.shield(search)
+    return prompt.replace(original, build_injected_prompt(original, research_results), 1)
+
+
+def build_injected_prompt(prompt: str, research_results: Optional[Dict[str, Any]]) -> str:
+    """Prepends the fetched context to the original prompt."""
+    knowledge_context = "No relevant context found."
+    if research_results and research_results.get("content"):
+        knowledge_context = research_results["content"]
+        print(f"  [Knowledge Injector]: Found context from {research_results.get('url')}")
+
+    return f"""
 Here is some up-to-date context from a web search. Use this information to inform your response and ensure your output is current and based on real-world data.
 
 --- WEB CONTEXT START ---
@@ -50,9 +184,72 @@ Now, proceed with your original task based on the prompt below.
 --- ORIGINAL PROMPT END ---
 """
 
+
+def inject_knowledge(agent_function):
+    """
+    A decorator that injects real-time knowledge into an agent's prompt.
+
+    It performs a web search based on the core task in the prompt and
+    prepends the findings to the original prompt. The prompt is taken from
+    the function's `prompt` argument, whether passed by keyword or position.
+
+    Coroutine functions get an async wrapper: the knowledge is injected into
+    the prompts the function sends through `LlmClient`, including prompts it
+    builds itself (see `inject_pending_knowledge`). The search for a `prompt`
+    argument starts before the function runs and is awaited only when the
+    prompt is sent, so the function's other work overlaps it. Searches run on
+    a worker thread and are shared with any prefetch or concurrent call for
+    the same query.
+    """
+    signature = inspect.signature(agent_function)
+    accepts_prompt = "prompt" in signature.parameters
+
+    def bind_prompt(args, kwargs):
+        if not accepts_prompt:
+            # The prompt is expected to be a keyword argument to the decorated function.
+            return kwargs.get("prompt"), None
+        try:
+            bound = signature.bind_partial(*args, **kwargs)
+        except TypeError:
+            return kwargs.get("prompt"), None
+        return bound.arguments.get("prompt"), bound
+
+    def call_with_prompt(bound, args, kwargs, injected_prompt):
         # Replace the original prompt with the new, injected prompt
-        kwargs["prompt"] = injected_prompt
+        if bound is None:
+            kwargs["prompt"] = injected_prompt
+            return args, kwargs
+        bound.arguments["prompt"] = injected_prompt
+        return bound.args, bound.kwargs
+
+    if inspect.iscoroutinefunction(agent_function):
+        @wraps(agent_function)
+        async def async_wrapper(*args, **kwargs):
+            prompt, _ = bind_prompt(args, kwargs)
+            scope = _InjectionScope()
+            if prompt:
+                scope.prompt = prompt
+                scope.search = _start_injection_search(prompt)
+            token = _injection_scope.set(scope)
+            try:
+                return await agent_function(*args, **kwargs)
+            finally:
+                _injection_scope.reset(token)
+
+        return async_wrapper
+
+    @wraps(agent_function)
+    def wrapper(*args, **kwargs):
+        prompt, bound = bind_prompt(args, kwargs)
+        if not prompt:
+            # If there's no prompt, we can't do much.
+            return agent_function(*args, **kwargs)
+
+        search_query = extract_search_query(prompt)
+        print(f"  [Knowledge Injector]: Performing web search for query: '{search_query}'...")
+        research_results = fetch_knowledge(search_query)
 
+        args, kwargs = call_with_prompt(bound, args, kwargs, build_injected_prompt(prompt, research_results))
         return agent_function(*args, **kwargs)
 
     return wrapper
@@ -0,0 +1,122 @@
+"""
+Lazy registry of agent classes.
+
+Agent modules pull in heavy dependencies (torch, diffusers, playwright, moviepy,
+OpenCV, ...), so the registry stores import paths and imports an agent's module
+only when the agent is first looked up. Each import is timed, which gives a
+per-agent import-cost report for startup tuning:
+
+    python -m guild.src.core.agent_registry
+"""
+
+import importlib
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+from guild.src.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class LazyAgentRegistry(Mapping):
+    """
+    Maps agent names to classes, importing each class on first access.
+
+    Listing names, `in` checks and `len()` never import anything; indexing,
+    `.get()`, `.values()` and `.items()` import the agents they touch. Import
+    errors propagate to the caller and are retried on the next lookup.
+    """
+
+    def __init__(self, paths: Dict[str, str]):
+        # name -> "package.module:ClassName"
+        self.paths = dict(paths)
+        self._classes: Dict[str, type] = {}
+        self._import_seconds: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+    def __getitem__(self, name: str) -> type:
+        agent_class = self._classes.get(name)
+        if agent_class is not None:
+            return agent_class
+        path = self.paths[name]
+        with self._lock:
+            if name not in self._classes:
+                self._classes[name] = self._import(name, path)
+        return self._classes[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.paths
+
+    def _import(self, name: str, path: str) -> type:
+        module_name, class_name = path.split(":")
+        started = time.perf_counter()
+        try:
+            module = importlib.import_module(module_name)
+            agent_class = getattr(module, class_name)
+        except Exception as e:
+            self._errors[name] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._import_seconds[name] = time.perf_counter() - started
+        self._errors.pop(name, None)
+        logger.info(f"Loaded agent {name} from {module_name} in {self._import_seconds[name]:.3f}s")
+        return agent_class
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._classes
+
+    def module_of(self, name: str) -> str:
+        return self.paths[name].split(":")[0]
+
+    def class_name_of(self, name: str) -> str:
+        return self.paths[name].split(":")[1]
+
+    def preload(self, names: Optional[List[str]] = None) -> None:
+        """Imports the given agents (all by default), e.g. to warm a worker before serving."""
+        for name in names or list(self.paths):
+            try:
+                self[name]
+            except Exception as e:
+                logger.warning(f"Could not load agent {name}: {e}")
+
+    def import_report(self) -> List[Dict[str, Any]]:
+        """
+        Import cost of every agent imported so far, most expensive first.
+
+        Imports run in lookup order, so a dependency shared by several agents
+        is charged to whichever of them was imported first.
+        """
+        report = [
+            {
+                "agent": name,
+                "module": self.module_of(name),
+                "loaded": name in self._classes,
+                "import_seconds": round(seconds, 4),
+                "error": self._errors.get(name),
+            }
+            for name, seconds in self._import_seconds.items()
+        ]
+        report.sort(key=lambda entry: entry["import_seconds"], reverse=True)
+        return report
+
+
+if __name__ == "__main__":
+    from guild.src.core.orchestrator import AGENT_REGISTRY
+
+    started = time.perf_counter()
+    AGENT_REGISTRY.preload()
+    total = time.perf_counter() - started
+    print(f"{'agent':<32} {'seconds':>8}  module")
+    for entry in AGENT_REGISTRY.import_report():
+        status = f"  FAILED ({entry['error']})" if entry["error"] else ""
+        print(f"{entry['agent']:<32} {entry['import_seconds']:>8.3f}  {entry['module']}{status}")
+    print(f"{len(AGENT_REGISTRY)} agents imported in {total:.2f}s")
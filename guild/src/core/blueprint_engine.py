@@ -8,16 +8,29 @@ specialized agents into comprehensive "cloud employees."
 import yaml
 import json
 import logging
+import threading
 from typing import Dict, List, Any, Optional, Union
 from pathlib import Path
 from datetime import datetime
-import re
-from dataclasses import dataclass
+from collections import ChainMap
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 
+from guild.src.core.blueprint_registry import BlueprintRegistry
+from guild.src.core.blueprint_templates import CompiledTemplate, TemplateError, compile_template
+from guild.src.core.config import settings
 from guild.src.core.orchestrator import Orchestrator
 
 logger = logging.getLogger(__name__)
 
+# Top-level names a template may reference; `loop` is added for loop steps
+CONTEXT_ROOTS = {'blueprint_id', 'start_time', 'trigger_data', 'steps', 'config', 'date'}
+STEP_FIELDS = {'output', 'status', 'timestamp'}
+LOOP_FIELDS = {'item', 'index', 'total'}
+# Agents that drive one shared desktop/browser session or wait on a person;
+# their steps (and loop iterations) run one at a time unless marked otherwise
+EXCLUSIVE_AGENTS = {'visual_agent', 'human_in_the_loop'}
+
 @dataclass
 class BlueprintStep:
     name: str
@@ -27,6 +40,16 @@ class BlueprintStep:
     loop: Optional[str] = None
     condition: Optional[str] = None
     timeout: Optional[int] = None
+    # Steps that must finish before this one starts. When omitted, dependencies
+    # are inferred from the {{ steps.<name>... }} references in input/loop/condition.
+    depends_on: Optional[List[str]] = None
+    # Maximum number of loop iterations run at once (loop steps only)
+    max_parallel: Optional[int] = None
+    # Never run alongside another exclusive step; defaults to True for EXCLUSIVE_AGENTS
+    exclusive: Optional[bool] = None
+    # Filled in by BlueprintEngine.compile_blueprint
+    compiled_input: Optional[CompiledTemplate] = field(default=None, repr=False, compare=False)
+    compiled_loop: Optional[CompiledTemplate] = field(default=None, repr=False, compare=False)
 
 @dataclass
 class Blueprint:
@@ -36,37 +59,40 @@ class Blueprint:
     trigger: Dict[str, Any]
     steps: List[BlueprintStep]
     config: Dict[str, Any] = None
+    # Step name -> names of the steps it depends on; filled in by BlueprintEngine.compile_blueprint
+    step_graph: Optional[Dict[str, List[str]]] = field(default=None, repr=False, compare=False)
 
 class BlueprintEngine:
     """
     Engine for parsing and executing functional blueprints
     """
     
-    def __init__(self, orchestrator: Orchestrator, blueprints_dir: str = "guild/src/blueprints"):
+    def __init__(self, orchestrator: Orchestrator, blueprints_dir: str = "guild/src/blueprints",
+                 registry: Optional[BlueprintRegistry] = None):
         self.orchestrator = orchestrator
         self.blueprints_dir = Path(blueprints_dir)
-        self.blueprints: Dict[str, Blueprint] = {}
+        # Parsed blueprints are shared by every engine in the process
+        self.registry = registry or get_blueprint_registry(blueprints_dir)
         self.execution_context: Dict[str, Any] = {}
         
-        # Load all blueprints on initialization
+        # Pick up changed files; unchanged ones are not re-parsed
         self.load_all_blueprints()
     
+    @property
+    def blueprints(self) -> Dict[str, Blueprint]:
+        return self.registry.blueprints
+    
     def load_all_blueprints(self):
-        """Load all blueprint files from the blueprints directory"""
-        if not self.blueprints_dir.exists():
-            logger.warning(f"Blueprints directory not found: {self.blueprints_dir}")
-            return
-        
-        for blueprint_file in self.blueprints_dir.glob("*.yml"):
-            try:
-                blueprint = self.load_blueprint(blueprint_file)
-                if blueprint:
-                    self.blueprints[blueprint.id] = blueprint
-                    logger.info(f"Loaded blueprint: {blueprint.name}")
-            except Exception as e:
-                logger.error(f"Failed to load blueprint {blueprint_file}: {e}")
+        """Load new or changed blueprint files from the blueprints directory"""
+        self.registry.refresh()
+    
+    def register_blueprint(self, blueprint: Blueprint) -> Blueprint:
+        """Compile and register a blueprint that was built in code rather than loaded from YAML"""
+        self.registry.register(self.compile_blueprint(blueprint))
+        return blueprint
     
-    def load_blueprint(self, file_path: Path) -> Optional[Blueprint]:
+    @classmethod
+    def load_blueprint(cls, file_path: Path) -> Optional[Blueprint]:
         """Load a single blueprint from a YAML file"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -82,7 +108,10 @@ class BlueprintEngine:
                     output=step_data['output'],
                     loop=step_data.get('loop'),
                     condition=step_data.get('condition'),
-                    timeout=step_data.get('timeout')
+                    timeout=step_data.get('timeout'),
+                    depends_on=step_data.get('depends_on'),
+                    max_parallel=step_data.get('max_parallel'),
+                    exclusive=step_data.get('exclusive')
                 )
                 steps.append(step)
             
@@ -96,7 +125,8 @@ class BlueprintEngine:
                 config=data.get('config', {})
             )
             
-            return blueprint
+            # Fail at load time rather than mid-execution on bad variables or dependencies
+            return cls.compile_blueprint(blueprint)
             
         except Exception as e:
             logger.error(f"Error loading blueprint {file_path}: {e}")
@@ -123,26 +153,7 @@ class BlueprintEngine:
         }
         
         try:
-            # Execute steps sequentially
-            for step in blueprint.steps:
-                step_result = self._execute_step(step)
-                
-                if step_result is None:
-                    logger.warning(f"Step {step.name} returned no result")
-                    continue
-                
-                # Store step result
-                self.execution_context['steps'][step.name] = {
-                    'output': step_result,
-                    'status': 'completed',
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                # Check condition if specified
-                if step.condition:
-                    if not self._evaluate_condition(step.condition, step_result):
-                        logger.info(f"Step {step.name} condition not met, stopping execution")
-                        break
+            self._run_steps(blueprint, self.execution_context)
             
             # Generate execution summary
             execution_summary = {
@@ -172,17 +183,240 @@ class BlueprintEngine:
             }
             return execution_summary
     
-    def _execute_step(self, step: BlueprintStep) -> Any:
+    @classmethod
+    def compile_blueprint(cls, blueprint: Blueprint) -> Blueprint:
+        """
+        Compile every step's input and loop templates and build the step graph.
+        
+        References to `steps.<output name>` are rewritten to the producing step
+        here, once. Variables that can never resolve raise a TemplateError:
+        unknown top-level names, unknown steps or step fields, `loop` outside a
+        loop step, and steps that are not guaranteed to finish first. Values
+        supplied at run time (config, trigger_data, loop items) are not checked.
+        """
+        step_names = {step.name for step in blueprint.steps}
+        if len(step_names) != len(blueprint.steps):
+            raise ValueError(f"Blueprint {blueprint.id} has duplicate step names")
+        
+        aliases: Dict[str, str] = {}
+        for step in reversed(blueprint.steps):
+            if step.output not in step_names:
+                aliases[step.output] = step.name
+        
+        for step in blueprint.steps:
+            step.compiled_input = compile_template(step.input, aliases)
+            step.compiled_loop = compile_template(step.loop, aliases) if step.loop else None
+        
+        graph = cls._build_step_graph(blueprint)
+        
+        errors: List[str] = []
+        for step in blueprint.steps:
+            upstream = cls._upstream_steps(step.name, graph)
+            templates = [step.compiled_input] + ([step.compiled_loop] if step.compiled_loop else [])
+            roots = CONTEXT_ROOTS | {'loop'} if step.loop else CONTEXT_ROOTS
+            for template in templates:
+                for variable in template.variables():
+                    error = cls._check_variable(variable.path, roots, step_names, upstream)
+                    if error:
+                        errors.append(f"step {step.name}: {{{{ {variable.source} }}}} {error}")
+        # The loop source is rendered outside the iteration scope
+        for step in blueprint.steps:
+            if step.compiled_loop:
+                for variable in step.compiled_loop.variables():
+                    if variable.path[0] == 'loop':
+                        errors.append(f"step {step.name}: {{{{ {variable.source} }}}} loop source cannot use the loop item")
+        if errors:
+            raise TemplateError(f"Blueprint {blueprint.id} has unresolvable variables: " + "; ".join(errors))
+        
+        blueprint.step_graph = graph
+        return blueprint
+    
+    @staticmethod
+    def _check_variable(path: tuple, roots: set, step_names: set, upstream: set) -> Optional[str]:
+        """Why the variable can never resolve, or None if it might"""
+        root = path[0]
+        if root not in roots:
+            return "is not defined" if root != 'loop' else "is only available in loop steps"
+        if root == 'steps':
+            if len(path) < 2 or path[1] not in step_names:
+                return "references an unknown step"
+            if path[1] not in upstream:
+                return "references a step that does not run before it"
+            if len(path) > 2 and path[2] not in STEP_FIELDS:
+                return f"uses an unknown step field (expected one of {sorted(STEP_FIELDS)})"
+        if root == 'loop' and (len(path) < 2 or path[1] not in LOOP_FIELDS):
+            return f"uses an unknown loop field (expected one of {sorted(LOOP_FIELDS)})"
+        return None
+    
+    @staticmethod
+    def _upstream_steps(name: str, graph: Dict[str, List[str]]) -> set:
+        """All steps that finish before `name` starts"""
+        seen = set()
+        stack = list(graph[name])
+        while stack:
+            current = stack.pop()
+            if current not in seen:
+                seen.add(current)
+                stack.extend(graph[current])
+        return seen
+    
+    @staticmethod
+    def _build_step_graph(blueprint: Blueprint) -> Dict[str, List[str]]:
+        """
+        Map each step name to the names of the steps it depends on.
+        
+        Explicit `depends_on` lists win; otherwise dependencies are inferred from
+        the `steps.<name>` variables in the compiled input and loop templates.
+        A step with a `condition` stops the blueprint when the condition fails,
+        so every step declared after it also waits for it.
+        """
+        step_names = {step.name for step in blueprint.steps}
+        graph: Dict[str, List[str]] = {}
+        gates: List[str] = []
+        for step in blueprint.steps:
+            if step.depends_on is not None:
+                deps = list(step.depends_on)
+                unknown = [dep for dep in deps if dep not in step_names]
+                if unknown:
+                    raise ValueError(f"Step {step.name} depends on unknown steps: {unknown}")
+            else:
+                templates = [step.compiled_input] + ([step.compiled_loop] if step.compiled_loop else [])
+                deps = [
+                    variable.path[1]
+                    for template in templates
+                    for variable in template.variables()
+                    if len(variable.path) > 1 and variable.path[0] == 'steps' and variable.path[1] in step_names
+                ]
+            deps.extend(gates)
+            graph[step.name] = list(dict.fromkeys(dep for dep in deps if dep != step.name))
+            if step.condition:
+                gates.append(step.name)
+        
+        # Kahn's algorithm; anything left over sits on a cycle
+        in_degree = {name: len(deps) for name, deps in graph.items()}
+        ready = [name for name, degree in in_degree.items() if degree == 0]
+        visited = 0
+        while ready:
+            current = ready.pop()
+            visited += 1
+            for name, deps in graph.items():
+                if current in deps:
+                    in_degree[name] -= 1
+                    if in_degree[name] == 0:
+                        ready.append(name)
+        if visited != len(graph):
+            cyclic = sorted(name for name, degree in in_degree.items() if degree > 0)
+            raise ValueError(f"Blueprint {blueprint.id} has a dependency cycle between steps: {cyclic}")
+        
+        return graph
+    
+    def _run_steps(self, blueprint: Blueprint, context: Dict[str, Any]) -> None:
+        """
+        Run the blueprint's steps as a DAG, starting each step as soon as the
+        steps it depends on have finished.
+        
+        Results are written to context['steps'] from this thread only, so worker
+        threads never see a step's entry half-written. The first failing step
+        cancels everything not yet started and its exception is re-raised once
+        the steps already running have finished.
+        
+        Exclusive steps (see `_is_exclusive`) never overlap each other; a ready
+        exclusive step waits while another one is running and the steps behind
+        it in the ready list go ahead.
+        """
+        if blueprint.step_graph is None:
+            self.compile_blueprint(blueprint)
+        graph = blueprint.step_graph
+        steps = {step.name: step for step in blueprint.steps}
+        dependents: Dict[str, List[str]] = {name: [] for name in graph}
+        for name, deps in graph.items():
+            for dep in deps:
+                dependents[dep].append(name)
+        remaining = {name: len(deps) for name, deps in graph.items()}
+        # Preserve declaration order among steps that become ready together
+        ready = [step.name for step in blueprint.steps if remaining[step.name] == 0]
+        
+        config = blueprint.config or {}
+        max_workers = max(1, int(config.get('max_parallel_steps', settings.BLUEPRINT_MAX_PARALLEL_STEPS)))
+        error: Optional[BaseException] = None
+        stopped = False
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"blueprint-{blueprint.id}") as pool:
+            running = {}
+            exclusive_running = False
+            while ready or running:
+                while not stopped and error is None:
+                    name = next(
+                        (name for name in ready
+                         if not (exclusive_running and self._is_exclusive(steps[name]))),
+                        None
+                    )
+                    if name is None:
+                        break
+                    ready.remove(name)
+                    exclusive_running = exclusive_running or self._is_exclusive(steps[name])
+                    running[pool.submit(self._execute_step, steps[name], context)] = name
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    step = steps[name]
+                    if self._is_exclusive(step):
+                        exclusive_running = False
+                    try:
+                        step_result = future.result()
+                    except Exception as e:
+                        if error is None:
+                            error = e
+                        continue
+                    
+                    if step_result is None:
+                        logger.warning(f"Step {name} returned no result")
+                    else:
+                        # Store step result
+                        context['steps'][name] = {
+                            'output': step_result,
+                            'status': 'completed',
+                            'timestamp': datetime.now().isoformat()
+                        }
+                        
+                        # Check condition if specified
+                        if step.condition and not self._evaluate_condition(step.condition, step_result):
+                            logger.info(f"Step {name} condition not met, stopping execution")
+                            stopped = True
+                    
+                    for dependent in dependents[name]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0:
+                            ready.append(dependent)
+                
+                if stopped or error is not None:
+                    ready.clear()
+        
+        if error is not None:
+            raise error
+    
+    @staticmethod
+    def _is_exclusive(step: BlueprintStep) -> bool:
+        """Whether a step must not run concurrently with other exclusive steps"""
+        if step.exclusive is not None:
+            return bool(step.exclusive)
+        return step.agent in EXCLUSIVE_AGENTS
+    
+    def _execute_step(self, step: BlueprintStep, context: Optional[Dict[str, Any]] = None) -> Any:
         """Execute a single blueprint step"""
         logger.info(f"Executing step: {step.name} with agent: {step.agent}")
+        context = self.execution_context if context is None else context
         
         try:
-            # Resolve input variables
-            resolved_input = self._resolve_variables(step.input)
-            
-            # Handle loops
+            # Handle loops; their input is resolved per iteration against the loop item
             if step.loop:
-                return self._execute_loop_step(step, resolved_input)
+                return self._execute_loop_step(step, context)
+            
+            # Resolve input variables
+            resolved_input = step.compiled_input.render(context)
             
             # Execute single step
             if step.agent == 'human_in_the_loop':
@@ -194,45 +428,45 @@ class BlueprintEngine:
             logger.error(f"Step {step.name} execution failed: {e}")
             raise
     
-    def _execute_loop_step(self, step: BlueprintStep, resolved_input: Any) -> List[Any]:
-        """Execute a step that loops over items"""
-        loop_data = self._resolve_variables(step.loop)
+    def _execute_loop_step(self, step: BlueprintStep, context: Dict[str, Any]) -> List[Any]:
+        """
+        Execute a step that loops over items, running up to `max_parallel`
+        iterations at once (one at a time for exclusive steps unless
+        `max_parallel` is set). Each iteration sees a scoped view of the context
+        with its own `loop` entry layered on top; the shared context is never
+        copied or mutated. Results keep the order of the loop items.
+        """
+        loop_data = step.compiled_loop.render(context)
         
         if not isinstance(loop_data, list):
             logger.warning(f"Loop data is not a list: {type(loop_data)}")
             return []
+        if not loop_data:
+            return []
         
-        results = []
-        for i, item in enumerate(loop_data):
-            logger.info(f"Loop iteration {i+1}/{len(loop_data)} for step {step.name}")
-            
-            # Create loop context
-            loop_context = {
-                'loop': {
-                    'item': item,
-                    'index': i,
-                    'total': len(loop_data)
-                }
-            }
-            
-            # Temporarily add loop context to execution context
-            original_context = self.execution_context.copy()
-            self.execution_context.update(loop_context)
-            
-            try:
-                # Execute step with loop item
-                if step.agent == 'human_in_the_loop':
-                    result = self._execute_human_step(step, resolved_input)
-                else:
-                    result = self._execute_agent_step(step, resolved_input)
-                
-                results.append(result)
-                
-            finally:
-                # Restore original context
-                self.execution_context = original_context
+        total = len(loop_data)
+        
+        def run_iteration(index: int, item: Any) -> Any:
+            logger.info(f"Loop iteration {index+1}/{total} for step {step.name}")
+            scoped_context = ChainMap({'loop': {'item': item, 'index': index, 'total': total}}, context)
+            resolved_input = step.compiled_input.render(scoped_context)
+            if step.agent == 'human_in_the_loop':
+                return self._execute_human_step(step, resolved_input)
+            return self._execute_agent_step(step, resolved_input)
         
-        return results
+        default_parallel = 1 if self._is_exclusive(step) else settings.BLUEPRINT_LOOP_MAX_PARALLEL
+        max_parallel = max(1, min(step.max_parallel or default_parallel, total))
+        if max_parallel == 1:
+            return [run_iteration(i, item) for i, item in enumerate(loop_data)]
+        
+        with ThreadPoolExecutor(max_workers=max_parallel, thread_name_prefix=f"loop-{step.name}") as pool:
+            futures = [pool.submit(run_iteration, i, item) for i, item in enumerate(loop_data)]
+            try:
+                return [future.result() for future in futures]
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
     
     def _execute_agent_step(self, step: BlueprintStep, resolved_input: Any) -> Any:
         """Execute a step with an AI agent"""
@@ -290,34 +524,10 @@ class BlueprintEngine:
             'approved_at': datetime.now().isoformat()
         }
     
-    def _resolve_variables(self, template: Any) -> Any:
-        """Resolve template variables in the input"""
-        if isinstance(template, str):
-            return self._resolve_string_variables(template)
-        elif isinstance(template, dict):
-            return {k: self._resolve_variables(v) for k, v in template.items()}
-        elif isinstance(template, list):
-            return [self._resolve_variables(item) for item in template]
-        else:
-            return template
-    
-    def _resolve_string_variables(self, template: str) -> str:
-        """Resolve variables in a string template"""
-        # Replace {{ steps.step_name.output }} with actual values
-        def replace_variable(match):
-            var_path = match.group(1).strip()
-            try:
-                # Navigate the execution context
-                parts = var_path.split('.')
-                value = self.execution_context
-                for part in parts:
-                    value = value[part]
-                return str(value)
-            except (KeyError, TypeError):
-                logger.warning(f"Variable not found: {var_path}")
-                return f"{{{{ {var_path} }}}}"
-        
-        return re.sub(r'\{\{\s*([^}]+)\s*\}\}', replace_variable, template)
+    def _resolve_variables(self, template: Any, context: Optional[Dict[str, Any]] = None) -> Any:
+        """Resolve template variables in an ad-hoc input; step inputs are compiled at load time"""
+        context = self.execution_context if context is None else context
+        return compile_template(template).render(context)
     
     def _evaluate_condition(self, condition: str, step_result: Any) -> bool:
         """Evaluate a condition string"""
@@ -349,3 +559,28 @@ class BlueprintEngine:
             }
             for bp in self.blueprints.values()
         ]
+
+
+_registries: Dict[str, BlueprintRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_blueprint_registry(blueprints_dir: str = "guild/src/blueprints") -> BlueprintRegistry:
+    """Returns the process-wide registry for a blueprints directory, creating it on first use."""
+    key = str(Path(blueprints_dir).resolve())
+    registry = _registries.get(key)
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.get(key)
+            if registry is None:
+                registry = BlueprintRegistry(
+                    blueprints_dir,
+                    loader=BlueprintEngine.load_blueprint,
+                    snapshot_path=settings.BLUEPRINT_SNAPSHOT_PATH,
+                    poll_interval_seconds=settings.BLUEPRINT_RELOAD_INTERVAL_SECONDS,
+                )
+                registry.refresh()
+                if settings.BLUEPRINT_HOT_RELOAD:
+                    registry.start_watching()
+                _registries[key] = registry
+    return registry
@@ -0,0 +1,238 @@
+"""
+Process-wide cache of parsed and compiled blueprints.
+
+Every BlueprintEngine used to re-read and re-parse every YAML file in the
+blueprints directory when it was constructed. The registry parses each file
+once and keeps the compiled Blueprint keyed by the file's mtime, size and
+content hash; a refresh only stats the files and re-parses the ones that
+actually changed or previously failed to load. The cache can be written to a
+pickle snapshot so a fresh worker process starts without parsing any YAML, and
+an optional background thread polls the directory to hot-reload edited
+blueprints.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Modules whose classes end up pickled in a snapshot
+_SNAPSHOT_SOURCES = ("blueprint_engine.py", "blueprint_templates.py", "blueprint_registry.py")
+
+
+def _snapshot_version() -> str:
+    """Hash of the modules defining the pickled classes, so any code change invalidates old snapshots."""
+    digest = hashlib.sha256()
+    for name in _SNAPSHOT_SOURCES:
+        try:
+            digest.update((Path(__file__).parent / name).read_bytes())
+        except OSError:
+            digest.update(name.encode())
+    return digest.hexdigest()[:16]
+
+
+SNAPSHOT_VERSION = _snapshot_version()
+
+
+@dataclass
+class _Entry:
+    mtime_ns: int
+    size: int
+    sha256: str
+    # None when the file failed to load; such entries are retried on every refresh
+    # and never written to the snapshot
+    blueprint: Optional[Any]
+
+
+class BlueprintRegistry:
+    """
+    Caches the blueprints of one directory.
+
+    `blueprints` is replaced wholesale on every change, so readers can hold on to
+    it without locking; they simply see the previous generation until the next
+    lookup.
+    """
+
+    def __init__(
+        self,
+        blueprints_dir: str,
+        loader: Callable[[Path], Optional[Any]],
+        snapshot_path: Optional[str] = None,
+        poll_interval_seconds: float = 2.0,
+    ):
+        self.blueprints_dir = Path(blueprints_dir)
+        self.loader = loader
+        self.snapshot_path = Path(snapshot_path).expanduser() if snapshot_path else None
+        self.poll_interval_seconds = poll_interval_seconds
+        self.blueprints: Dict[str, Any] = {}
+        self.generation = 0
+        self._entries: Dict[str, _Entry] = {}
+        self._registered: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self._stats = {"parsed": 0, "reused": 0, "snapshot_loaded": False}
+
+        if self.snapshot_path:
+            self._load_snapshot()
+
+    def refresh(self) -> int:
+        """
+        Bring the cache in line with the directory.
+
+        Returns:
+            Number of files that were (re)parsed or removed
+        """
+        with self._lock:
+            if not self.blueprints_dir.exists():
+                logger.warning(f"Blueprints directory not found: {self.blueprints_dir}")
+                changed = len(self._entries)
+                self._entries = {}
+            else:
+                seen = set()
+                changed = 0
+                for blueprint_file in sorted(self.blueprints_dir.glob("*.yml")):
+                    key = str(blueprint_file.resolve())
+                    seen.add(key)
+                    if self._refresh_file(key, blueprint_file):
+                        changed += 1
+                for key in set(self._entries) - seen:
+                    logger.info(f"Blueprint file removed: {key}")
+                    del self._entries[key]
+                    changed += 1
+
+            if changed or self.generation == 0:
+                self._publish()
+                if changed and self.snapshot_path:
+                    self.save_snapshot()
+            return changed
+
+    def _refresh_file(self, key: str, blueprint_file: Path) -> bool:
+        try:
+            stat = blueprint_file.stat()
+        except OSError as e:
+            logger.error(f"Failed to stat blueprint {blueprint_file}: {e}")
+            return False
+
+        entry = self._entries.get(key)
+        failed_before = entry is not None and entry.blueprint is None
+        if failed_before:
+            # The failure may not come from the file itself (a missing import, a
+            # half-written file with the final mtime); always try again
+            entry = None
+        if entry and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            self._stats["reused"] += 1
+            return False
+
+        # mtime moved (touch, checkout); only re-parse when the content differs
+        sha256 = hashlib.sha256(blueprint_file.read_bytes()).hexdigest()
+        if entry and entry.sha256 == sha256:
+            entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+            self._stats["reused"] += 1
+            return False
+
+        blueprint = self.loader(blueprint_file)
+        self._stats["parsed"] += 1
+        self._entries[key] = _Entry(stat.st_mtime_ns, stat.st_size, sha256, blueprint)
+        if blueprint:
+            logger.info(f"Loaded blueprint: {blueprint.name}")
+        # A file that fails again changes nothing that is published
+        return not (failed_before and blueprint is None)
+
+    def _publish(self) -> None:
+        # Caller holds self._lock
+        blueprints = {
+            entry.blueprint.id: entry.blueprint
+            for entry in self._entries.values()
+            if entry.blueprint is not None
+        }
+        blueprints.update(self._registered)
+        self.blueprints = blueprints
+        self.generation += 1
+
+    def register(self, blueprint: Any) -> None:
+        """Add a blueprint that did not come from a file; it survives refreshes."""
+        with self._lock:
+            self._registered[blueprint.id] = blueprint
+            self._publish()
+
+    def get(self, blueprint_id: str) -> Optional[Any]:
+        return self.blueprints.get(blueprint_id)
+
+    def save_snapshot(self) -> None:
+        """Write the parsed blueprints to the snapshot file, atomically."""
+        if not self.snapshot_path:
+            return
+        with self._lock:
+            payload = {
+                "version": SNAPSHOT_VERSION,
+                "blueprints_dir": str(self.blueprints_dir.resolve()),
+                "entries": {key: entry for key, entry in self._entries.items() if entry.blueprint is not None},
+            }
+            try:
+                self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.snapshot_path.with_suffix(self.snapshot_path.suffix + f".{os.getpid()}.tmp")
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self.snapshot_path)
+            except Exception as e:
+                logger.warning(f"Could not write blueprint snapshot {self.snapshot_path}: {e}")
+
+    def _load_snapshot(self) -> None:
+        if not self.snapshot_path.exists():
+            return
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                payload = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable blueprint snapshot {self.snapshot_path}: {e}")
+            return
+        if (
+            payload.get("version") != SNAPSHOT_VERSION
+            or payload.get("blueprints_dir") != str(self.blueprints_dir.resolve())
+        ):
+            return
+        # Entries are still validated against each file's mtime/size on the next refresh
+        self._entries = payload["entries"]
+        self._stats["snapshot_loaded"] = True
+        logger.info(f"Loaded {len(self._entries)} blueprint entries from snapshot {self.snapshot_path}")
+
+    def start_watching(self) -> None:
+        """Poll the directory in a daemon thread and hot-reload changed blueprints."""
+        with self._lock:
+            if self._watcher and self._watcher.is_alive():
+                return
+            self._stop_watching.clear()
+            self._watcher = threading.Thread(target=self._watch, name="blueprint-registry-watcher", daemon=True)
+            self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop_watching.set()
+        if self._watcher:
+            self._watcher.join(timeout=self.poll_interval_seconds + 1)
+            self._watcher = None
+
+    def _watch(self) -> None:
+        while not self._stop_watching.wait(self.poll_interval_seconds):
+            try:
+                changed = self.refresh()
+                if changed:
+                    logger.info(f"Hot-reloaded {changed} blueprint file(s) from {self.blueprints_dir}")
+            except Exception as e:
+                logger.error(f"Blueprint hot reload failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "blueprints": len(self.blueprints),
+            "files": len(self._entries),
+            "failed_files": sorted(key for key, entry in self._entries.items() if entry.blueprint is None),
+            "generation": self.generation,
+            "watching": bool(self._watcher and self._watcher.is_alive()),
+            **self._stats,
+        }
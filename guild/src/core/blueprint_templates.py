@@ -0,0 +1,210 @@
+"""
+Compiled templates for blueprint step inputs.
+
+Blueprint inputs are YAML strings, dicts and lists containing `{{ dotted.path }}`
+variables. They are compiled once, when the blueprint is loaded, into a small
+tree of template nodes whose variables hold their path pre-split, so rendering a
+step (or each iteration of a loop step) is a plain walk with no regex or string
+splitting. Compiling also exposes every variable a template uses, which the
+blueprint engine validates at load time.
+"""
+
+import copy
+import logging
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+VARIABLE_PATTERN = re.compile(r'\{\{\s*([^}]+)\s*\}\}')
+
+_MISSING = object()
+
+
+class TemplateError(ValueError):
+    """A blueprint template references a variable that can never resolve."""
+
+
+class Variable:
+    """A `{{ a.b.c }}` reference with its path split once, at compile time."""
+
+    __slots__ = ('path', 'source')
+
+    def __init__(self, path: Tuple[str, ...]):
+        self.path = path
+        self.source = '.'.join(path)
+
+    def lookup(self, context: Any) -> Any:
+        """The referenced value, or _MISSING if any part of the path is absent."""
+        value = context
+        try:
+            for part in self.path:
+                value = value[part]
+        except (KeyError, TypeError, IndexError):
+            return _MISSING
+        return value
+
+    def placeholder(self) -> str:
+        return f"{{{{ {self.source} }}}}"
+
+    def __repr__(self) -> str:
+        return f"Variable({self.source!r})"
+
+
+class CompiledTemplate:
+    """Base class for compiled template nodes."""
+
+    __slots__ = ()
+
+    def render(self, context: Any) -> Any:
+        raise NotImplementedError
+
+    def variables(self) -> Iterator[Variable]:
+        return iter(())
+
+
+class Literal(CompiledTemplate):
+    """
+    A value with no variables. Scalars render as-is; dicts and lists are
+    copied on every render because compiled blueprints are shared across the
+    process and agents may mutate the input they are given.
+    """
+
+    __slots__ = ('value', 'mutable')
+
+    def __init__(self, value: Any):
+        self.value = value
+        self.mutable = isinstance(value, (dict, list))
+
+    def render(self, context: Any) -> Any:
+        if self.mutable:
+            return copy.deepcopy(self.value)
+        return self.value
+
+
+class Single(CompiledTemplate):
+    """A string that is exactly one variable; renders to the raw value."""
+
+    __slots__ = ('variable',)
+
+    def __init__(self, variable: Variable):
+        self.variable = variable
+
+    def render(self, context: Any) -> Any:
+        value = self.variable.lookup(context)
+        if value is _MISSING:
+            logger.warning(f"Variable not found: {self.variable.source}")
+            return self.variable.placeholder()
+        return value
+
+    def variables(self) -> Iterator[Variable]:
+        yield self.variable
+
+
+class Text(CompiledTemplate):
+    """A string mixing literal text and variables; renders to a string."""
+
+    __slots__ = ('parts',)
+
+    def __init__(self, parts: Tuple[Union[str, Variable], ...]):
+        self.parts = parts
+
+    def render(self, context: Any) -> str:
+        rendered: List[str] = []
+        for part in self.parts:
+            if isinstance(part, str):
+                rendered.append(part)
+                continue
+            value = part.lookup(context)
+            if value is _MISSING:
+                logger.warning(f"Variable not found: {part.source}")
+                rendered.append(part.placeholder())
+            else:
+                rendered.append(str(value))
+        return ''.join(rendered)
+
+    def variables(self) -> Iterator[Variable]:
+        for part in self.parts:
+            if isinstance(part, Variable):
+                yield part
+
+
+class DictTemplate(CompiledTemplate):
+    __slots__ = ('items',)
+
+    def __init__(self, items: Tuple[Tuple[Any, CompiledTemplate], ...]):
+        self.items = items
+
+    def render(self, context: Any) -> Dict[Any, Any]:
+        return {key: template.render(context) for key, template in self.items}
+
+    def variables(self) -> Iterator[Variable]:
+        for _, template in self.items:
+            yield from template.variables()
+
+
+class ListTemplate(CompiledTemplate):
+    __slots__ = ('items',)
+
+    def __init__(self, items: Tuple[CompiledTemplate, ...]):
+        self.items = items
+
+    def render(self, context: Any) -> List[Any]:
+        return [template.render(context) for template in self.items]
+
+    def variables(self) -> Iterator[Variable]:
+        for template in self.items:
+            yield from template.variables()
+
+
+def compile_template(template: Any, aliases: Optional[Dict[str, str]] = None) -> CompiledTemplate:
+    """
+    Compile a blueprint input (string, dict, list or scalar) into a template tree.
+
+    Args:
+        template: The raw value from the blueprint YAML
+        aliases: Maps step output names to step names, so `{{ steps.<output>... }}`
+            is rewritten to the producing step once instead of on every render
+
+    Returns:
+        The compiled template
+    """
+    if isinstance(template, str):
+        return _compile_string(template, aliases or {})
+    if isinstance(template, dict):
+        items = tuple((key, compile_template(value, aliases)) for key, value in template.items())
+        if all(isinstance(item, Literal) for _, item in items):
+            return Literal(template)
+        return DictTemplate(items)
+    if isinstance(template, list):
+        items = tuple(compile_template(value, aliases) for value in template)
+        if all(isinstance(item, Literal) for item in items):
+            return Literal(template)
+        return ListTemplate(items)
+    return Literal(template)
+
+
+def _compile_variable(expression: str, aliases: Dict[str, str]) -> Variable:
+    path = tuple(expression.strip().split('.'))
+    if len(path) > 1 and path[0] == 'steps' and path[1] in aliases:
+        path = ('steps', aliases[path[1]]) + path[2:]
+    return Variable(path)
+
+
+def _compile_string(template: str, aliases: Dict[str, str]) -> CompiledTemplate:
+    matches = list(VARIABLE_PATTERN.finditer(template))
+    if not matches:
+        return Literal(template)
+    if len(matches) == 1 and not template[:matches[0].start()].strip() and not template[matches[0].end():].strip():
+        return Single(_compile_variable(matches[0].group(1), aliases))
+
+    parts: List[Union[str, Variable]] = []
+    position = 0
+    for match in matches:
+        if match.start() > position:
+            parts.append(template[position:match.start()])
+        parts.append(_compile_variable(match.group(1), aliases))
+        position = match.end()
+    if position < len(template):
+        parts.append(template[position:])
+    return Text(tuple(parts))
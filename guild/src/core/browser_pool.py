@@ -0,0 +1,271 @@
+"""
+Process-wide pool of headless Chromium pages.
+
+Launching Chromium costs one to three seconds, and agents used to pay it on every
+web search or lead scrape. The pool keeps one browser alive with a few reusable
+contexts, and hands out pages up to a max-pages limit. Pages are reset to
+about:blank and returned to the pool after each use. They are health-checked
+before reuse and replaced after a fixed number of uses or on any error.
+
+Playwright's async objects are bound to the event loop that created them, so the
+pool runs on its own event loop in a daemon thread. Async callers await
+`pool.run(...)` without blocking their loop; sync callers use `pool.run_sync(...)`.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from guild.src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _PooledPage:
+    __slots__ = ("page", "context", "uses")
+
+    def __init__(self, page: Any, context: Any):
+        self.page = page
+        self.context = context
+        self.uses = 0
+
+
+class BrowserPool:
+    """
+    Shared Chromium browser with reusable contexts and a bounded set of pages.
+    """
+
+    def __init__(
+        self,
+        max_pages: int = 4,
+        max_contexts: int = 2,
+        page_max_uses: int = 50,
+        headless: bool = True,
+        timeout_seconds: float = 60.0,
+    ):
+        self.max_pages = max_pages
+        self.max_contexts = max_contexts
+        self.page_max_uses = page_max_uses
+        self.headless = headless
+        self.timeout_seconds = timeout_seconds
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+        # Everything below is only touched on the pool's own loop
+        self._playwright = None
+        self._browser = None
+        self._contexts: List[Any] = []
+        self._context_pages: Dict[int, int] = {}
+        self._idle: List[_PooledPage] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+        self._stats = {"launches": 0, "pages_created": 0, "pages_reused": 0, "pages_discarded": 0}
+
+    # ------------------------------------------------------------------
+    # Loop management
+    # ------------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._thread_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(
+                        target=loop.run_forever, name="browser-pool", daemon=True
+                    )
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    def submit(self, fn: Callable[[Any], Awaitable[T]]) -> "concurrent.futures.Future[T]":
+        """Schedules `fn(page)` on the pool's loop and returns a thread-safe future."""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self._run_with_page(fn), loop)
+
+    async def run(self, fn: Callable[[Any], Awaitable[T]]) -> T:
+        """
+        Runs `fn(page)` with a pooled page without blocking the caller's event loop.
+
+        Args:
+            fn: Coroutine function taking a Playwright page
+
+        Returns:
+            Whatever `fn` returns
+        """
+        future = self.submit(fn)
+        return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout_seconds)
+
+    def run_sync(self, fn: Callable[[Any], Awaitable[T]]) -> T:
+        """Blocking variant of `run` for synchronous callers."""
+        future = self.submit(fn)
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    # ------------------------------------------------------------------
+    # Browser and page lifecycle (pool loop only)
+    # ------------------------------------------------------------------
+
+    async def _run_with_page(self, fn: Callable[[Any], Awaitable[T]]) -> T:
+        async with self.page() as page:
+            return await fn(page)
+
+    @asynccontextmanager
+    async def page(self):
+        """Checks out a page for the duration of the block; must be used on the pool's loop."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pages)
+            self._launch_lock = asyncio.Lock()
+
+        async with self._slots:
+            pooled = await self._acquire()
+            healthy = False
+            try:
+                yield pooled.page
+                healthy = True
+            finally:
+                await self._release(pooled, healthy)
+
+    async def _ensure_browser(self) -> None:
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return
+            await self._reset()
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self._stats["launches"] += 1
+            logger.info("Browser pool launched Chromium")
+
+    async def _reset(self) -> None:
+        """Drops every page and context, e.g. after the browser crashed."""
+        self._idle.clear()
+        self._contexts.clear()
+        self._context_pages.clear()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    async def _acquire(self) -> _PooledPage:
+        await self._ensure_browser()
+        while self._idle:
+            pooled = self._idle.pop()
+            if await self._is_healthy(pooled):
+                self._stats["pages_reused"] += 1
+                return pooled
+            await self._discard(pooled)
+
+        context = await self._pick_context()
+        pooled = _PooledPage(await context.new_page(), context)
+        self._context_pages[id(context)] += 1
+        self._stats["pages_created"] += 1
+        return pooled
+
+    async def _pick_context(self) -> Any:
+        if len(self._contexts) < self.max_contexts:
+            context = await self._browser.new_context()
+            self._contexts.append(context)
+            self._context_pages[id(context)] = 0
+            return context
+        return min(self._contexts, key=lambda context: self._context_pages[id(context)])
+
+    async def _is_healthy(self, pooled: _PooledPage) -> bool:
+        if pooled.page.is_closed() or not self._browser.is_connected():
+            return False
+        try:
+            await asyncio.wait_for(pooled.page.evaluate("1"), timeout=2)
+            return True
+        except Exception:
+            return False
+
+    async def _release(self, pooled: _PooledPage, healthy: bool) -> None:
+        pooled.uses += 1
+        if healthy and pooled.uses < self.page_max_uses and self._browser is not None:
+            try:
+                await pooled.page.goto("about:blank")
+                self._idle.append(pooled)
+                return
+            except Exception as e:
+                logger.debug(f"Browser pool could not reset page: {e}")
+        await self._discard(pooled)
+
+    async def _discard(self, pooled: _PooledPage) -> None:
+        self._stats["pages_discarded"] += 1
+        key = id(pooled.context)
+        if key in self._context_pages:
+            self._context_pages[key] -= 1
+        try:
+            if not pooled.page.is_closed():
+                await pooled.page.close()
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # Shutdown and stats
+    # ------------------------------------------------------------------
+
+    def close(self) -> None:
+        """Closes the browser and stops the pool's loop."""
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._reset(), loop).result(timeout=10)
+        except Exception as e:
+            logger.warning(f"Browser pool did not shut down cleanly: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._loop = None
+        self._thread = None
+        self._slots = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "max_pages": self.max_pages,
+            "contexts": len(self._contexts),
+            "idle_pages": len(self._idle),
+            "browser_connected": bool(self._browser is not None and self._browser.is_connected()),
+            **self._stats,
+        }
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Returns the process-wide browser pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = BrowserPool(
+                    max_pages=settings.BROWSER_POOL_MAX_PAGES,
+                    max_contexts=settings.BROWSER_POOL_MAX_CONTEXTS,
+                    page_max_uses=settings.BROWSER_POOL_PAGE_MAX_USES,
+                    headless=settings.BROWSER_POOL_HEADLESS,
+                    timeout_seconds=settings.BROWSER_POOL_TIMEOUT_SECONDS,
+                )
+                atexit.register(_pool.close)
+    return _pool
@@ -0,0 +1,89 @@
+"""
+Streaming text chunking for document ingestion.
+
+``iter_chunks`` consumes text incrementally (file blocks, PDF pages, a
+transcript string) and yields overlapping chunks as soon as enough text has
+arrived, so ingestion never holds more than about one chunk of pending text on
+top of whatever the source itself keeps in memory. Split points prefer
+paragraph, then line, then word boundaries, like the recursive character
+splitter used previously, and every ingestion path uses the same splitter so
+identical text always produces identical chunks (and embedding cache hits).
+"""
+
+from typing import Iterable, Iterator
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_CHUNK_OVERLAP = 200
+_SEPARATORS = ("\n\n", "\n", " ")
+
+
+def _split_point(text: str, start: int, end: int) -> int:
+    """Latest separator boundary in text[start:end], or `end` if there is none."""
+    for separator in _SEPARATORS:
+        index = text.rfind(separator, start, end)
+        if index > start:
+            return index + len(separator)
+    return end
+
+
+def _overlap_start(text: str, cut: int, start: int, overlap: int) -> int:
+    """Where the next chunk begins: `overlap` chars before `cut`, moved forward to a word boundary."""
+    if overlap <= 0:
+        return cut
+    candidate = max(cut - overlap, start + 1)
+    boundary = text.find(" ", candidate, cut)
+    return boundary + 1 if boundary != -1 else candidate
+
+
+def iter_chunks(
+    pieces: Iterable[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+) -> Iterator[str]:
+    """
+    Yields overlapping chunks of at most `chunk_size` characters from a stream of text pieces.
+
+    Args:
+        pieces: Text in arrival order; pieces may be any size.
+        chunk_size: Maximum characters per chunk.
+        chunk_overlap: Characters repeated between consecutive chunks.
+    """
+    buffer = ""
+    start = 0
+    # Index in buffer up to which text has already been emitted in some chunk
+    emitted_until = 0
+    emitted_any = False
+
+    for piece in pieces:
+        if not piece:
+            continue
+        # Compact lazily so one huge piece does not cost quadratic copying
+        if start > len(buffer) // 2:
+            buffer = buffer[start:]
+            emitted_until -= start
+            start = 0
+        buffer += piece
+
+        while len(buffer) - start > chunk_size:
+            cut = _split_point(buffer, start, start + chunk_size)
+            chunk = buffer[start:cut].strip()
+            if chunk:
+                yield chunk
+                emitted_any = True
+            emitted_until = cut
+            start = _overlap_start(buffer, cut, start, chunk_overlap)
+
+    # Flush the tail only if it holds text that no chunk has covered yet
+    tail = buffer[start:].strip()
+    if tail and (len(buffer) > emitted_until or not emitted_any):
+        yield tail
+
+
+def iter_file_text(path: str, block_size: int = 64 * 1024, encoding: str = "utf-8") -> Iterator[str]:
+    """Reads a text file in fixed-size blocks."""
+    with open(path, "r", encoding=encoding, errors="replace") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                return
+            yield block
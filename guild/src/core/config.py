@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 class Settings(BaseSettings):
     # Database Configuration
@@ -31,6 +31,27 @@ class Settings(BaseSettings):
     QDRANT_HOST: str = "qdrant"
     QDRANT_URL: Optional[str] = None
 
+    # Embedding Service Configuration
+    EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_MAX_WAIT_MS: float = 5.0
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_DIR: str = "~/.cache/guild/embeddings"
+
+    # Batch Ingestion Configuration
+    INGEST_MAX_WORKERS: Optional[int] = None
+    INGEST_QUEUE_SIZE: int = 8
+    INGEST_UPSERT_BATCH_SIZE: int = 256
+    # Chunks embedded and upserted per window when streaming a single document
+    INGEST_STREAM_WINDOW: int = 64
+
+    # Hybrid Search Configuration
+    HYBRID_SEARCH_ALPHA: float = 0.7
+    HYBRID_SEARCH_CANDIDATE_MULTIPLIER: int = 4
+
+    # Incremental Sync Configuration
+    SYNC_MANIFEST_PATH: str = "~/.cache/guild/chunk_manifests.sqlite"
+
     # FastAPI Configuration
     FASTAPI_APP_ENV: str = "local"
     FASTAPI_SECRET_KEY: str = "a_strong_secret_key_here"
@@ -38,6 +59,29 @@ class Settings(BaseSettings):
 
     # LLM Configuration
     LLM_PROVIDER: Optional[str] = None
+    LLM_MAX_CONCURRENCY: int = 32
+    LLM_MAX_CONNECTIONS: int = 64
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 32
+    LLM_REQUEST_TIMEOUT_SECONDS: float = 120.0
+
+    # LLM Response Cache Configuration
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 2048
+    LLM_CACHE_DEFAULT_TTL_SECONDS: int = 3600
+    # Per-agent TTL overrides in seconds; 0 disables caching for that agent
+    LLM_CACHE_AGENT_TTLS: Dict[str, int] = {"OnboardingAgent": 0}
+    LLM_CACHE_SQLITE_PATH: Optional[str] = None
+
+    # Knowledge Injection Cache Configuration
+    KNOWLEDGE_CACHE_ENABLED: bool = True
+    KNOWLEDGE_CACHE_MAX_ENTRIES: int = 512
+    KNOWLEDGE_CACHE_TTL_SECONDS: int = 3600
+    # After the TTL, entries are still served for this long while a background refresh runs
+    KNOWLEDGE_CACHE_STALE_SECONDS: int = 21600
+    KNOWLEDGE_CACHE_MAX_TEXT_CHARS: int = 5000
+    KNOWLEDGE_CACHE_SQLITE_PATH: Optional[str] = None
+    # Start each task's knowledge searches as soon as a workflow's DAG is known
+    KNOWLEDGE_PREFETCH_ENABLED: bool = True
 
     # OpenAI Configuration
     OPENAI_API_KEY: Optional[str] = None
@@ -49,9 +93,53 @@ class Settings(BaseSettings):
     AGENT_QUALITY_THRESHOLD: float = 0.8
     AGENT_CONFIDENCE_THRESHOLD: float = 0.55
 
+    # Workflow Scheduling Configuration
+    WORKFLOW_MAX_CONCURRENCY: int = 8
+    # Per-agent caps on concurrently running tasks; agents not listed are limited only by the global cap
+    WORKFLOW_AGENT_CONCURRENCY: Dict[str, int] = {}
+    # Workflow execution history. Without a store path every execution stays in
+    # memory; with one, finished executions beyond WORKFLOW_EXECUTION_MAX_HOT are
+    # spilled to SQLite and evicted after WORKFLOW_EXECUTION_MAX_AGE_HOURS.
+    WORKFLOW_EXECUTION_STORE_PATH: Optional[str] = None
+    WORKFLOW_EXECUTION_MAX_HOT: int = 256
+    WORKFLOW_EXECUTION_MAX_AGE_HOURS: Optional[float] = 24
+    # Large outputs (screenshots, page dumps) of spilled executions are stored here
+    # by reference; defaults to an "execution_blobs" directory next to the store
+    WORKFLOW_EXECUTION_BLOB_DIR: Optional[str] = None
+
+    # Blueprint Execution Configuration
+    # Steps whose dependencies are satisfied run concurrently up to this cap
+    BLUEPRINT_MAX_PARALLEL_STEPS: int = 4
+    # Default fan-out for loop steps that do not set max_parallel themselves
+    BLUEPRINT_LOOP_MAX_PARALLEL: int = 4
+    # Parsed blueprints are pickled here so new worker processes skip YAML parsing; None disables
+    BLUEPRINT_SNAPSHOT_PATH: Optional[str] = "~/.cache/guild/blueprints.pickle"
+    # Poll the blueprints directory and reload edited files without a restart
+    BLUEPRINT_HOT_RELOAD: bool = False
+    BLUEPRINT_RELOAD_INTERVAL_SECONDS: float = 2.0
+
     # Web scraping configuration
     USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
+    # Shared headless browser pool (web search and basic lead scraping)
+    BROWSER_POOL_MAX_PAGES: int = 4
+    BROWSER_POOL_MAX_CONTEXTS: int = 2
+    # Pages are closed and replaced after this many uses
+    BROWSER_POOL_PAGE_MAX_USES: int = 50
+    BROWSER_POOL_HEADLESS: bool = True
+    BROWSER_POOL_TIMEOUT_SECONDS: float = 60.0
+
+    # Scrapy crawl service (advanced lead scraping)
+    CRAWL_MAX_CONCURRENT_JOBS: int = 4
+    CRAWL_JOB_TIMEOUT_SECONDS: float = 600.0
+    CRAWL_CONCURRENT_REQUESTS: int = 16
+    CRAWL_CONCURRENT_REQUESTS_PER_DOMAIN: int = 2
+    CRAWL_DOWNLOAD_DELAY: float = 2.0
+    CRAWL_AUTOTHROTTLE_ENABLED: bool = True
+    CRAWL_AUTOTHROTTLE_START_DELAY: float = 2.0
+    CRAWL_AUTOTHROTTLE_MAX_DELAY: float = 30.0
+    CRAWL_AUTOTHROTTLE_TARGET_CONCURRENCY: float = 1.0
+
     # Ollama Configuration
     OLLAMA_HOST: str = "http://ollama:11434"
     OLLAMA_MODEL: str = "llama3"
@@ -0,0 +1,160 @@
+"""
+Persistent embedding cache keyed by chunk content hash.
+
+Vectors are appended to a memory-mapped float32 matrix (``vectors.f32``) and a
+SQLite index maps each chunk's SHA-256 to its row. Re-ingesting a document only
+sends chunks whose text has never been embedded to the model. Each embedding
+model gets its own directory so vectors from different models never mix.
+Appends take an exclusive file lock, so several workers can share one cache.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of a chunk's text, used as its cache key."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Content-hash -> vector store backed by a memory-mapped float32 matrix."""
+
+    def __init__(self, directory: str, model_name: str, dimension: int):
+        self.dimension = dimension
+        self.directory = os.path.join(
+            os.path.expanduser(directory), re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+        )
+        os.makedirs(self.directory, exist_ok=True)
+        self.vectors_path = os.path.join(self.directory, "vectors.f32")
+        self.lock_path = os.path.join(self.directory, ".lock")
+        self._db = sqlite3.connect(os.path.join(self.directory, "index.sqlite"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS vectors (hash TEXT PRIMARY KEY, row INTEGER NOT NULL)")
+        self._db.commit()
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.memmap] = None
+        self.stats = {"hits": 0, "misses": 0, "writes": 0}
+
+    def _row_count(self) -> int:
+        if not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // (4 * self.dimension)
+
+    def _rows(self, needed: int) -> np.memmap:
+        # Caller holds self._lock; remap only when the file has grown past our view
+        if self._matrix is None or self._matrix.shape[0] < needed:
+            self._matrix = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r", shape=(self._row_count(), self.dimension)
+            )
+        return self._matrix
+
+    def get_many(self, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Returns the cached vectors for whichever of `hashes` are known."""
+        unique = list(dict.fromkeys(hashes))
+        found: Dict[str, int] = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(unique), 500):
+                batch = unique[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                found.update(self._db.execute(
+                    f"SELECT hash, row FROM vectors WHERE hash IN ({placeholders})", batch
+                ).fetchall())
+            result: Dict[str, np.ndarray] = {}
+            if found:
+                matrix = self._rows(max(found.values()) + 1)
+                result = {h: np.array(matrix[row]) for h, row in found.items()}
+        self.stats["hits"] += len(result)
+        self.stats["misses"] += len(unique) - len(result)
+        return result
+
+    def put_many(self, hashes: Sequence[str], vectors: np.ndarray) -> None:
+        """Appends vectors for hashes not already cached."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock, open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                new = {}
+                for h, vector in zip(hashes, vectors):
+                    if h not in new and self._db.execute(
+                        "SELECT 1 FROM vectors WHERE hash = ?", (h,)
+                    ).fetchone() is None:
+                        new[h] = vector
+                if not new:
+                    return
+                first_row = self._row_count()
+                with open(self.vectors_path, "ab") as f:
+                    f.write(np.stack(list(new.values())).astype(np.float32).tobytes())
+                self._db.executemany(
+                    "INSERT INTO vectors (hash, row) VALUES (?, ?)",
+                    [(h, first_row + i) for i, h in enumerate(new)],
+                )
+                self._db.commit()
+                self.stats["writes"] += len(new)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "entries": self._row_count()}
+
+
+def embed_with_cache(texts: Sequence[str], embedding_service, cache: Optional[EmbeddingCache]) -> np.ndarray:
+    """
+    Embeds `texts`, taking known vectors from `cache` and encoding only the rest.
+    Returns an (n, dim) float32 matrix in the order of `texts`.
+    """
+    texts = list(texts)
+    if cache is None:
+        return embedding_service.encode(texts)
+
+    hashes = [content_hash(text) for text in texts]
+    cached = cache.get_many(hashes)
+    missing: Dict[str, str] = {}
+    for h, text in zip(hashes, texts):
+        if h not in cached and h not in missing:
+            missing[h] = text
+
+    if missing:
+        new_vectors = embedding_service.encode(list(missing.values()))
+        cache.put_many(list(missing), new_vectors)
+        cached.update(zip(missing, new_vectors))
+
+    logger.info(f"Embedded {len(texts)} chunks ({len(missing)} new, {len(texts) - len(missing)} from cache)")
+    return np.stack([cached[h] for h in hashes]).astype(np.float32, copy=False)
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache(embedding_service) -> Optional[EmbeddingCache]:
+    """Returns the process-wide embedding cache, or None when caching is disabled."""
+    global _cache
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EmbeddingCache(
+                    settings.EMBEDDING_CACHE_DIR, embedding_service.model_name, embedding_service.dimension
+                )
+    return _cache
@@ -0,0 +1,176 @@
+"""
+Batched embedding service for the vector store.
+
+The SentenceTransformer model is loaded lazily, once per worker process, on the
+first encode. Concurrent ``encode`` calls from search and indexing are queued
+and a single background thread drains the queue into micro-batches: it waits up
+to ``max_wait_ms`` for more work (or until ``batch_size`` texts are pending),
+then runs one forward pass and hands each caller its slice of the result.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingService:
+    """Lazily loaded, micro-batching wrapper around a SentenceTransformer model."""
+
+    def __init__(
+        self,
+        model_name: str = settings.EMBEDDING_MODEL,
+        batch_size: int = settings.EMBEDDING_BATCH_SIZE,
+        max_wait_ms: float = settings.EMBEDDING_MAX_WAIT_MS,
+    ):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._queue: "queue.Queue[Tuple[List[str], Future, float]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "requests": 0,
+            "texts": 0,
+            "batches": 0,
+            "encode_seconds": 0.0,
+            "latency_seconds": 0.0,
+            "max_batch_texts": 0,
+        }
+
+    @property
+    def model(self):
+        """The underlying SentenceTransformer, loaded on first access."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+
+                    started = time.perf_counter()
+                    self._model = SentenceTransformer(self.model_name)
+                    logger.info(
+                        f"Loaded embedding model '{self.model_name}' in {time.perf_counter() - started:.2f}s"
+                    )
+        return self._model
+
+    @property
+    def dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Embeds `texts`, sharing a forward pass with concurrent callers. Returns (n, dim) float32."""
+        return self.submit(texts).result()
+
+    def encode_one(self, text: str) -> np.ndarray:
+        return self.encode([text])[0]
+
+    async def aencode(self, texts: Sequence[str]) -> np.ndarray:
+        """Async variant of `encode` that does not block the event loop."""
+        return await asyncio.wrap_future(self.submit(texts))
+
+    def submit(self, texts: Sequence[str]) -> Future:
+        """Queues `texts` for the next micro-batch and returns a future for their vectors."""
+        future: Future = Future()
+        texts = list(texts)
+        if not texts:
+            future.set_result(np.zeros((0, self.dimension), dtype=np.float32))
+            return future
+        self._ensure_worker()
+        self._queue.put((texts, future, time.perf_counter()))
+        return future
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            with self._worker_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(
+                        target=self._run, name="embedding-batcher", daemon=True
+                    )
+                    self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            pending = [self._queue.get()]
+            pending_texts = len(pending[0][0])
+            deadline = time.perf_counter() + self.max_wait
+            while pending_texts < self.batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                pending_texts += len(item[0])
+            self._encode_batch(pending)
+
+    def _encode_batch(self, pending: List[Tuple[List[str], Future, float]]) -> None:
+        texts = [text for request_texts, _, _ in pending for text in request_texts]
+        started = time.perf_counter()
+        try:
+            vectors = self.model.encode(
+                texts, batch_size=self.batch_size, show_progress_bar=False, convert_to_numpy=True
+            ).astype(np.float32, copy=False)
+        except Exception as e:
+            for _, future, _ in pending:
+                future.set_exception(e)
+            return
+        finished = time.perf_counter()
+
+        offset = 0
+        for request_texts, future, _ in pending:
+            future.set_result(vectors[offset:offset + len(request_texts)])
+            offset += len(request_texts)
+
+        with self._metrics_lock:
+            self._metrics["requests"] += len(pending)
+            self._metrics["texts"] += len(texts)
+            self._metrics["batches"] += 1
+            self._metrics["encode_seconds"] += finished - started
+            self._metrics["latency_seconds"] += sum(finished - queued for _, _, queued in pending)
+            self._metrics["max_batch_texts"] = max(self._metrics["max_batch_texts"], len(texts))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Throughput and latency counters since the service started."""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        requests, batches = metrics["requests"], metrics["batches"]
+        metrics.update({
+            "model_name": self.model_name,
+            "model_loaded": self._model is not None,
+            "batch_size": self.batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "queue_depth": self._queue.qsize(),
+            "avg_batch_texts": metrics["texts"] / batches if batches else 0.0,
+            "avg_requests_per_batch": requests / batches if batches else 0.0,
+            "avg_latency_ms": 1000.0 * metrics["latency_seconds"] / requests if requests else 0.0,
+            "texts_per_second": metrics["texts"] / metrics["encode_seconds"] if metrics["encode_seconds"] else 0.0,
+        })
+        return metrics
+
+
+_service: Optional[EmbeddingService] = None
+_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Returns this worker's embedding service, creating it on first use."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = EmbeddingService()
+    return _service
@@ -8,16 +8,33 @@ format detection and routes documents to the appropriate processor.
 
 import os
 import logging
-from typing import Dict, Any, List, Optional, Union
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Dict, Any, Callable, List, Optional, Union, Tuple
 from pathlib import Path
 import tempfile
 import shutil
 
 from . import ingestion, vector_store
 from .config import settings
+from .embedding_cache import embed_with_cache, get_embedding_cache
 
 logger = logging.getLogger(__name__)
 
+# Marks the end of input for a pipeline stage
+_STOP = object()
+# How often a stage blocked on a queue checks whether the batch was aborted
+_QUEUE_POLL_SECONDS = 0.1
+
+def _convert_file(file_path: str) -> Tuple[Optional[Tuple[List[str], Dict[str, Any]]], float]:
+    """Conversion stage of batch ingestion; runs in a worker process."""
+    started = time.perf_counter()
+    loaded = ingestion.load_document_chunks(file_path)
+    return loaded, time.perf_counter() - started
+
 class EnhancedRAGPipeline:
     """
     Enhanced RAG pipeline that integrates MarkItDown with traditional document processing.
@@ -119,112 +136,274 @@ class EnhancedRAGPipeline:
             logger.error(f"Failed to process URL {url}: {e}")
             return False
     
-    def process_batch(self, files: List[str], document_metadata: Dict[str, Any]) -> Dict[str, Any]:
+    def process_batch(
+        self,
+        files: List[str],
+        document_metadata: Dict[str, Any],
+        max_workers: Optional[int] = None,
+        queue_size: int = settings.INGEST_QUEUE_SIZE,
+        upsert_batch_size: int = settings.INGEST_UPSERT_BATCH_SIZE,
+    ) -> Dict[str, Any]:
         """
-        Process multiple files in batch.
+        Process multiple files in batch as a three-stage pipeline.
+        
+        Conversion and chunking run in a process pool, embedding runs on a
+        dedicated thread (sharing forward passes through the embedding service),
+        and a final thread upserts points in batches spanning several files.
+        Bounded queues between the stages apply backpressure, so a slow stage
+        throttles the ones before it instead of buffering whole documents.
+        If a stage dies, the batch stops and every file not yet indexed is
+        reported as an error.
         
         Args:
             files: List of file paths to process
             document_metadata: Base metadata to attach to all chunks
+            max_workers: Conversion processes (defaults to INGEST_MAX_WORKERS or the CPU count)
+            queue_size: Capacity of each inter-stage queue, in files
+            upsert_batch_size: Points accumulated before each upsert
             
         Returns:
-            Dictionary with batch processing results
+            Dictionary with batch processing results and per-stage timings
         """
+        started = time.perf_counter()
+        max_workers = max_workers or settings.INGEST_MAX_WORKERS or os.cpu_count() or 1
         results = {
             "total_files": len(files),
             "successful": 0,
             "failed": 0,
             "errors": [],
-            "file_results": {}
+            "file_results": {},
+            "stage_timings": {
+                "convert_seconds": 0.0,
+                "embed_seconds": 0.0,
+                "upsert_seconds": 0.0,
+                "upsert_batches": 0,
+                "wall_seconds": 0.0,
+            },
         }
-        
-        for file_path in files:
-            try:
-                # Generate unique document ID for each file
-                file_metadata = {
-                    **document_metadata,
-                    "document_id": f"{document_metadata.get('document_id', 'batch')}_{Path(file_path).stem}",
-                    "file_path": file_path
-                }
-                
-                success = self.process_document(file_path, file_metadata)
-                
-                if success:
+        timings = results["stage_timings"]
+        results_lock = threading.Lock()
+
+        def record(file_path: str, status: str, error: Optional[str] = None):
+            with results_lock:
+                file_result = results["file_results"].setdefault(file_path, {})
+                file_result["status"] = status
+                if status == "success":
                     results["successful"] += 1
-                    results["file_results"][file_path] = {"status": "success"}
-                else:
-                    results["failed"] += 1
-                    results["file_results"][file_path] = {"status": "failed"}
-                    
-            except Exception as e:
+                    return
                 results["failed"] += 1
-                error_msg = f"Error processing {file_path}: {str(e)}"
-                results["errors"].append(error_msg)
-                results["file_results"][file_path] = {"status": "error", "error": str(e)}
-                logger.error(error_msg)
-        
-        logger.info(f"Batch processing completed: {results['successful']} successful, {results['failed']} failed")
+                if error:
+                    file_result["error"] = error
+                    error_msg = f"Error processing {file_path}: {error}"
+                    results["errors"].append(error_msg)
+                    logger.error(error_msg)
+
+        converted: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        embedded: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        embedding_service = vector_store.embedding_service
+        # Set when a stage dies, so the others stop instead of blocking on its queue
+        abort = threading.Event()
+        stage_errors: List[str] = []
+
+        def put(q: "queue.Queue", item: Any) -> bool:
+            while not abort.is_set():
+                try:
+                    q.put(item, timeout=_QUEUE_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def take(q: "queue.Queue") -> Any:
+            while True:
+                try:
+                    return q.get(timeout=_QUEUE_POLL_SECONDS)
+                except queue.Empty:
+                    if abort.is_set():
+                        return _STOP
+
+        def run_stage(name: str, body: Callable[[], None]):
+            try:
+                body()
+            except BaseException as e:
+                error_msg = f"{name} stage failed: {e}"
+                logger.exception(error_msg)
+                with results_lock:
+                    stage_errors.append(error_msg)
+                    results["errors"].append(error_msg)
+                abort.set()
+
+        def embed_stage():
+            cache = get_embedding_cache(embedding_service)
+            while True:
+                item = take(converted)
+                if item is _STOP:
+                    put(embedded, _STOP)
+                    return
+                file_path, file_metadata, chunks = item
+                stage_started = time.perf_counter()
+                try:
+                    vectors = embed_with_cache(chunks, embedding_service, cache)
+                except Exception as e:
+                    record(file_path, "error", str(e))
+                    continue
+                elapsed = time.perf_counter() - stage_started
+                with results_lock:
+                    timings["embed_seconds"] += elapsed
+                    results["file_results"][file_path]["embed_seconds"] = elapsed
+                put(embedded, (file_path, file_metadata, chunks, vectors))
+
+        def upsert_stage():
+            pending_points, pending_files = [], []
+
+            def flush():
+                if not pending_points:
+                    return
+                stage_started = time.perf_counter()
+                try:
+                    vector_store.upsert_points(pending_points, wait=True)
+                    for file_path in pending_files:
+                        record(file_path, "success")
+                except Exception as e:
+                    for file_path in pending_files:
+                        record(file_path, "error", str(e))
+                with results_lock:
+                    timings["upsert_seconds"] += time.perf_counter() - stage_started
+                    timings["upsert_batches"] += 1
+                pending_points.clear()
+                pending_files.clear()
+
+            while True:
+                item = take(embedded)
+                if item is _STOP:
+                    flush()
+                    return
+                file_path, file_metadata, chunks, vectors = item
+                try:
+                    points = vector_store.build_points(file_metadata["document_id"], chunks, vectors, file_metadata)
+                except Exception as e:
+                    record(file_path, "error", str(e))
+                    continue
+                pending_points.extend(points)
+                pending_files.append(file_path)
+                if len(pending_points) >= upsert_batch_size:
+                    flush()
+
+        stage_threads = [
+            threading.Thread(target=run_stage, args=("embed", embed_stage), name="batch-embed", daemon=True),
+            threading.Thread(target=run_stage, args=("upsert", upsert_stage), name="batch-upsert", daemon=True),
+        ]
+        for thread in stage_threads:
+            thread.start()
+
+        # Daemonic workers (e.g. Celery prefork) cannot spawn child processes
+        if multiprocessing.current_process().daemon:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+        else:
+            # Spawn, not fork: the stage threads are already running and a forked
+            # child could inherit a lock one of them holds (e.g. the embedding model's)
+            executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+        try:
+            with executor:
+                pending_files = iter(files)
+                in_flight = {}
+
+                def submit_next():
+                    file_path = next(pending_files, None)
+                    if file_path is not None:
+                        in_flight[executor.submit(_convert_file, file_path)] = file_path
+
+                # Keep the pool busy without converting far ahead of the embed stage
+                for _ in range(max_workers * 2):
+                    submit_next()
+
+                while in_flight and not abort.is_set():
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        file_path = in_flight.pop(future)
+                        submit_next()
+                        try:
+                            loaded, convert_seconds = future.result()
+                        except Exception as e:
+                            record(file_path, "error", str(e))
+                            continue
+
+                        with results_lock:
+                            timings["convert_seconds"] += convert_seconds
+                            results["file_results"][file_path] = {"convert_seconds": convert_seconds}
+                        if loaded is None:
+                            # Unsupported format: skipped, as ingest_document does
+                            record(file_path, "success")
+                            continue
+
+                        chunks, conversion_metadata = loaded
+                        # Generate unique document ID for each file
+                        file_metadata = {
+                            **document_metadata,
+                            **conversion_metadata,
+                            "document_id": f"{document_metadata.get('document_id', 'batch')}_{Path(file_path).stem}",
+                            "file_path": file_path
+                        }
+                        with results_lock:
+                            results["file_results"][file_path]["chunks"] = len(chunks)
+                        if not chunks:
+                            record(file_path, "success")
+                            continue
+                        # Blocks while the embed stage is behind (backpressure)
+                        put(converted, (file_path, file_metadata, chunks))
+
+                # After an abort, conversions that have not started are dropped
+                for future in in_flight:
+                    future.cancel()
+        finally:
+            put(converted, _STOP)
+            for thread in stage_threads:
+                thread.join()
+
+        if stage_errors:
+            # Files still queued or in flight when a stage died were never indexed
+            for file_path in files:
+                if "status" not in results["file_results"].get(file_path, {}):
+                    record(file_path, "error", stage_errors[0])
+
+        timings["wall_seconds"] = time.perf_counter() - started
+        logger.info(
+            f"Batch processing completed: {results['successful']} successful, {results['failed']} failed "
+            f"in {timings['wall_seconds']:.2f}s (convert {timings['convert_seconds']:.2f}s, "
+            f"embed {timings['embed_seconds']:.2f}s, upsert {timings['upsert_seconds']:.2f}s)"
+        )
         return results
     
-    def search(self, query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        hybrid: bool = False,
+    ) -> List[Dict[str, Any]]:
         """
         Search the vector store with enhanced filtering capabilities.
         
+        Filters are pushed down to Qdrant, so a filtered search still returns
+        up to `top_k` matching results instead of whatever survived a post-filter.
+        
         Args:
             query: Search query
             top_k: Number of top results to return
             filters: Optional filters for the search
+            hybrid: Fuse keyword (BM25) relevance with the vector score
             
         Returns:
             List of search results
         """
         try:
-            # Use the existing vector store search
-            search_results = vector_store.search(query=query, top_k=top_k)
-            
-            # Apply additional filtering if specified
-            if filters:
-                search_results = self._apply_filters(search_results, filters)
-            
-            return search_results
+            return vector_store.search(query=query, top_k=top_k, filters=filters, hybrid=hybrid)
             
         except Exception as e:
             logger.error(f"Search failed: {e}")
             return []
     
-    def _apply_filters(self, results: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """
-        Apply filters to search results.
-        
-        Args:
-            results: Search results to filter
-            filters: Filters to apply
-            
-        Returns:
-            Filtered search results
-        """
-        filtered_results = []
-        
-        for result in results:
-            payload = result.get('payload', {})
-            include_result = True
-            
-            for filter_key, filter_value in filters.items():
-                if filter_key in payload:
-                    if isinstance(filter_value, list):
-                        if payload[filter_key] not in filter_value:
-                            include_result = False
-                            break
-                    else:
-                        if payload[filter_key] != filter_value:
-                            include_result = False
-                            break
-            
-            if include_result:
-                filtered_results.append(result)
-        
-        return filtered_results
-    
     def get_processing_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the RAG pipeline.
@@ -245,6 +424,7 @@ class EnhancedRAGPipeline:
                     "total_points": collection_info.points_count,
                     "vector_size": collection_info.config.params.vectors.size
                 },
+                "embedding_service": vector_store.embedding_service.get_metrics(),
                 "supported_formats": self.capabilities.get("markitdown_formats", []) + self.capabilities.get("langchain_formats", [])
             }
             
@@ -278,7 +458,9 @@ def process_document_enhanced(file_path: str, document_metadata: Dict[str, Any])
     pipeline = get_enhanced_rag_pipeline()
     return pipeline.process_document(file_path, document_metadata)
 
-def search_enhanced(query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+def search_enhanced(
+    query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None, hybrid: bool = False
+) -> List[Dict[str, Any]]:
     """Search using the enhanced RAG pipeline."""
     pipeline = get_enhanced_rag_pipeline()
-    return pipeline.search(query, top_k, filters)
+    return pipeline.search(query, top_k, filters, hybrid=hybrid)
@@ -1,10 +1,10 @@
-from langchain.document_loaders import PyPDFLoader, TextLoader, UnstructuredHTMLLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from typing import List, Dict, Any
+from langchain.document_loaders import PyPDFLoader, UnstructuredHTMLLoader
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 import os
 import logging
 
 from . import vector_store
+from .chunking import iter_chunks, iter_file_text
 
 # Try to import MarkItDown processor
 try:
@@ -49,6 +49,18 @@ def ingest_document(file_path: str, document_metadata: Dict[str, Any]):
     # Fall back to traditional LangChain loaders
     _ingest_with_langchain(file_path, document_metadata, file_extension)
 
+def split_text(text: str) -> List[str]:
+    """
+    Split plain text into chunks using the same settings as document ingestion.
+
+    Args:
+        text: Text content to split
+
+    Returns:
+        List of text chunks
+    """
+    return list(iter_chunks([text]))
+
 def _should_use_markitdown(file_extension: str) -> bool:
     """
     Determine if MarkItDown should be used for a given file extension.
@@ -74,59 +86,117 @@ def _should_use_markitdown(file_extension: str) -> bool:
     
     return file_extension in markitdown_formats
 
-def _ingest_with_langchain(file_path: str, document_metadata: Dict[str, Any], file_extension: str):
+def load_document_chunks(file_path: str) -> Optional[Tuple[List[str], Dict[str, Any]]]:
     """
-    Process document using traditional LangChain loaders.
+    Converts and chunks a document without indexing it.
+
+    Uses MarkItDown for the formats it handles best and falls back to LangChain
+    loaders. Nothing here touches the vector store or the embedding model, so it
+    is safe to run in a worker process.
+
+    Args:
+        file_path: The local path to the document file.
+
+    Returns:
+        Tuple of (text chunks, conversion metadata), or None for unsupported files.
+    """
+    file_extension = os.path.splitext(file_path)[1].lower()
+
+    if MARKITDOWN_AVAILABLE and _should_use_markitdown(file_extension):
+        try:
+            converted = MarkItDownProcessor().convert_and_chunk(file_path)
+            if converted is not None:
+                return converted
+            logger.warning(f"MarkItDown processing failed for {file_path}, falling back to LangChain")
+        except Exception as e:
+            logger.warning(f"MarkItDown processor error for {file_path}: {e}, falling back to LangChain")
+
+    return _load_with_langchain(file_path, file_extension)
+
+def _iter_langchain_text(file_path: str, file_extension: str) -> Optional[Iterator[str]]:
+    """
+    Stream a document's text using traditional LangChain loaders.
+
+    Plain-text formats are read in fixed-size blocks and PDF/HTML pages are
+    loaded lazily, so the whole document is never held in memory at once.
     
     Args:
         file_path: Path to the document
-        document_metadata: Metadata for the document
         file_extension: File extension
+        
+    Returns:
+        Iterator over text pieces, or None for unsupported files
     """
     # Select the appropriate document loader based on file extension
+    if file_extension in ['.txt', '.md']:
+        return iter_file_text(file_path)
     if file_extension == '.pdf':
         loader = PyPDFLoader(file_path)
     elif file_extension in ['.html', '.htm']:
         loader = UnstructuredHTMLLoader(file_path)
-    elif file_extension in ['.txt', '.md']:
-        loader = TextLoader(file_path)
     else:
         logger.warning(f"Unsupported file type: {file_extension}. Skipping.")
-        return
+        return None
 
-    try:
-        # Load the document content
-        documents = loader.load()
-
-        # Split the document into chunks
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len
-        )
-        chunks = text_splitter.split_documents(documents)
+    # Keep page boundaries as paragraph breaks for the splitter
+    return (document.page_content + "\n\n" for document in loader.lazy_load())
+
+def _load_with_langchain(file_path: str, file_extension: str) -> Optional[Tuple[List[str], Dict[str, Any]]]:
+    """
+    Load and chunk a document using traditional LangChain loaders.
+    
+    Args:
+        file_path: Path to the document
+        file_extension: File extension
+        
+    Returns:
+        Tuple of (text chunks, conversion metadata), or None for unsupported files
+    """
+    text = _iter_langchain_text(file_path, file_extension)
+    if text is None:
+        return None
 
-        logger.info(f"Document split into {len(chunks)} chunks.")
+    text_chunks = list(iter_chunks(text))
+    logger.info(f"Document split into {len(text_chunks)} chunks.")
 
-        # Extract text content from LangChain's Document objects
-        text_chunks = [chunk.page_content for chunk in chunks]
+    return text_chunks, {
+        "conversion_method": "langchain",
+        "original_format": file_extension,
+        "chunk_count": len(text_chunks)
+    }
+
+def _ingest_with_langchain(file_path: str, document_metadata: Dict[str, Any], file_extension: str):
+    """
+    Process document using traditional LangChain loaders.
+
+    Text is chunked as it is read and indexed in fixed-size windows, so peak
+    memory does not grow with document size.
+    
+    Args:
+        file_path: Path to the document
+        document_metadata: Metadata for the document
+        file_extension: File extension
+    """
+    try:
+        text = _iter_langchain_text(file_path, file_extension)
+        if text is None:
+            return
 
         # Add processing method metadata
         enhanced_metadata = {
             **document_metadata,
             "conversion_method": "langchain",
-            "original_format": file_extension,
-            "chunk_count": len(chunks)
+            "original_format": file_extension
         }
 
-        # Index the text chunks in the vector store
-        vector_store.index_chunks(
+        # Index the text chunks in the vector store as they are produced
+        chunk_count = vector_store.index_chunk_stream(
             document_id=document_metadata['document_id'],
-            text_chunks=text_chunks,
+            text_chunks=iter_chunks(text),
             metadata=enhanced_metadata
         )
 
-        logger.info(f"Successfully finished LangChain ingestion for document: {file_path}")
+        logger.info(f"Successfully finished LangChain ingestion for document: {file_path} ({chunk_count} chunks)")
 
     except Exception as e:
         logger.error(f"Failed to ingest document {file_path} with LangChain. Error: {e}")
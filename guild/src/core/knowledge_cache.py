@@ -0,0 +1,246 @@
+"""
+Cache for knowledge-injection web searches.
+
+`inject_knowledge` runs a live web search for the objective of every decorated
+agent helper, and a single workflow asks for the same objective over and over.
+Results are keyed on a normalized query (case, punctuation, quotes and filler
+words do not matter), held in an in-memory LRU tier with an optional SQLite
+tier, and served for a TTL. After the TTL an entry stays usable for a further
+stale window: it is returned immediately while a background refresh fetches a
+new copy. Concurrent misses for the same query share one search.
+"""
+
+import concurrent.futures
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from guild.src.core.config import settings
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from how in into is it of on or our the their this to we what with your".split()
+)
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_query(query: str) -> str:
+    """Lower-cases, strips punctuation and filler words, and collapses whitespace."""
+    words = _NON_WORD.sub(" ", query.lower()).split()
+    kept = [word for word in words if word not in _STOPWORDS]
+    return " ".join(kept or words)
+
+
+class KnowledgeCache:
+    """Two-tier (memory LRU + optional SQLite) cache of web search results."""
+
+    def __init__(
+        self,
+        max_entries: int = settings.KNOWLEDGE_CACHE_MAX_ENTRIES,
+        ttl: int = settings.KNOWLEDGE_CACHE_TTL_SECONDS,
+        stale_ttl: int = settings.KNOWLEDGE_CACHE_STALE_SECONDS,
+        max_text_chars: int = settings.KNOWLEDGE_CACHE_MAX_TEXT_CHARS,
+        sqlite_path: Optional[str] = settings.KNOWLEDGE_CACHE_SQLITE_PATH,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_text_chars = max_text_chars
+        self.sqlite_path = sqlite_path
+        # key -> (result, fetched_at)
+        self._memory: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, concurrent.futures.Future] = {}
+        self._refreshing: set = set()
+        self._db: Optional[sqlite3.Connection] = None
+        self.stats = {
+            "fresh_hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "fetches": 0,
+            "refreshes": 0,
+            "fetch_errors": 0,
+            "evictions": 0,
+        }
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS knowledge_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def lookup(self, query: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Returns (result, fresh) for `query`; result is None on a miss or when the
+        entry is past its stale window.
+        """
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, fetched_at FROM knowledge_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = (json.loads(row[0]), row[1])
+                    self._remember(key, *entry)
+
+            if entry is None:
+                return None, False
+            result, fetched_at = entry
+            age = now - fetched_at
+            if age < self.ttl:
+                return result, True
+            if age < self.ttl + self.stale_ttl:
+                return result, False
+            self._forget(key)
+            return None, False
+
+    def set(self, query: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Stores `result` for `query` with its page text capped; returns the stored copy."""
+        key = normalize_query(query)
+        stored = dict(result)
+        if isinstance(stored.get("content"), str):
+            stored["content"] = stored["content"][:self.max_text_chars]
+        fetched_at = time.time()
+        with self._lock:
+            self._remember(key, stored, fetched_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO knowledge_cache (key, value, fetched_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(stored, ensure_ascii=False), fetched_at),
+                )
+                self._db.commit()
+        return stored
+
+    def get_or_fetch(self, query: str, fetch: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Returns the cached result for `query`, calling `fetch(query)` on a miss.
+
+        Args:
+            query: The search query, as extracted from the prompt
+            fetch: Performs the live search; results without a URL are treated as
+                failures and are not cached
+
+        Returns:
+            The search result dictionary
+        """
+        result, fresh = self.lookup(query)
+        if result is not None:
+            with self._lock:
+                self.stats["fresh_hits" if fresh else "stale_hits"] += 1
+            if not fresh:
+                self._refresh_in_background(query, fetch)
+            return result
+
+        key = normalize_query(query)
+        with self._lock:
+            self.stats["misses"] += 1
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = concurrent.futures.Future()
+                self._in_flight[key] = future
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._fetch(query, fetch)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _fetch(self, query: str, fetch: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        with self._lock:
+            self.stats["fetches"] += 1
+        result = fetch(query)
+        if result and result.get("url") and result.get("content"):
+            return self.set(query, result)
+        with self._lock:
+            self.stats["fetch_errors"] += 1
+        return result
+
+    def _refresh_in_background(self, query: str, fetch: Callable[[str], Dict[str, Any]]) -> None:
+        key = normalize_query(query)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self.stats["refreshes"] += 1
+
+        def refresh():
+            try:
+                self._fetch(query, fetch)
+            except Exception:
+                with self._lock:
+                    self.stats["fetch_errors"] += 1
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="knowledge-refresh", daemon=True).start()
+
+    def _remember(self, key: str, result: Dict[str, Any], fetched_at: float) -> None:
+        # Caller holds self._lock
+        self._memory[key] = (result, fetched_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _forget(self, key: str) -> None:
+        # Caller holds self._lock
+        self._memory.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM knowledge_cache WHERE key = ?", (key,))
+            self._db.commit()
+
+    def clear(self) -> None:
+        """Drops every cached result from all tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM knowledge_cache")
+                self._db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus the current memory tier size."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["fresh_hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["fresh_hits"] + stats["stale_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+_cache: Optional[KnowledgeCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_knowledge_cache() -> Optional[KnowledgeCache]:
+    """Returns the process-wide knowledge cache, or None when caching is disabled."""
+    global _cache
+    if not settings.KNOWLEDGE_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = KnowledgeCache()
+    return _cache
@@ -0,0 +1,160 @@
+"""
+Content-addressed cache for LLM responses.
+
+Responses are keyed on a hash of (provider, model, prompt, format). Lookups hit
+an in-memory LRU tier first and fall back to an optional SQLite tier that
+survives restarts and is shared by every worker on the host. Entries expire
+after a TTL that can be tuned per agent; a TTL of 0 disables caching for that
+agent (e.g. conversational agents that must not repeat themselves).
+"""
+
+import contextvars
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from guild.src.core.config import settings
+
+# Name of the agent whose work is currently running. The orchestrator sets this
+# per task so LLM calls made deep inside agent helpers pick up the agent's TTL.
+current_agent: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_agent", default=None)
+
+
+class LlmCache:
+    """Two-tier (memory LRU + optional SQLite) cache of raw LLM response text."""
+
+    def __init__(
+        self,
+        max_entries: int = settings.LLM_CACHE_MAX_ENTRIES,
+        default_ttl: int = settings.LLM_CACHE_DEFAULT_TTL_SECONDS,
+        agent_ttls: Optional[Dict[str, int]] = None,
+        sqlite_path: Optional[str] = settings.LLM_CACHE_SQLITE_PATH,
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.agent_ttls = dict(settings.LLM_CACHE_AGENT_TTLS if agent_ttls is None else agent_ttls)
+        self.sqlite_path = sqlite_path
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(provider: str, model: Optional[str], prompt: str, format: Optional[str] = None) -> str:
+        """Stable content hash identifying one LLM request."""
+        material = json.dumps([provider, model, format, prompt], ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, agent_name: Optional[str] = None) -> int:
+        """TTL in seconds for `agent_name` (or the agent in the current context)."""
+        if not settings.LLM_CACHE_ENABLED:
+            return 0
+        agent_name = agent_name or current_agent.get()
+        if agent_name and agent_name in self.agent_ttls:
+            return self.agent_ttls[agent_name]
+        return self.default_ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached response for `key`, or None on a miss or expiry."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+                self.stats["expirations"] += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, expires_at = row
+                    if expires_at > now:
+                        self._remember(key, value, expires_at)
+                        self.stats["disk_hits"] += 1
+                        return value
+                    self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._db.commit()
+                    self.stats["expirations"] += 1
+
+            self.stats["misses"] += 1
+            return None
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        """Stores `value` under `key` in every tier for `ttl` seconds."""
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, value, expires_at)
+            self.stats["sets"] += 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, expires_at),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, value: str, expires_at: float) -> None:
+        # Caller holds self._lock
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """Drops every cached response from all tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus current tier sizes."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+_cache: Optional[LlmCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LlmCache:
+    """Returns the process-wide LLM response cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LlmCache()
+    return _cache
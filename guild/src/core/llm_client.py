@@ -1,19 +1,37 @@
-from typing import Protocol, Dict, Any
+from typing import Protocol, Dict, Any, Optional, AsyncIterator
+import threading
 import ollama
 import requests
 import json
+from guild.src.core.agent_helpers import inject_pending_knowledge
 from guild.src.core.config import settings
+from guild.src.core.llm_transport import get_llm_transport
+from guild.src.core.llm_cache import get_llm_cache
+from guild.src.core.single_flight import get_single_flight
+from guild.src.core.streaming import token_sink
 from guild.src.models.llm import Llm
 
 class LLMProvider(Protocol):
-    """A protocol for LLM providers, ensuring they have a generate_json method."""
+    """A protocol for LLM providers, ensuring they have sync and async generation methods."""
     def generate_json(self, prompt: str, model: str) -> Dict[str, Any]:
         ...
 
+    async def agenerate_json(self, prompt: str, model: str) -> Dict[str, Any]:
+        ...
+
+    async def achat(self, prompt: str, model: str, format: Optional[str] = None) -> str:
+        ...
+
+    def achat_stream(self, prompt: str, model: str, format: Optional[str] = None) -> AsyncIterator[str]:
+        ...
+
 class OllamaProvider:
     """LLM provider for a local Ollama instance."""
+    name = "ollama"
+
     def __init__(self):
         self.client = ollama.Client(host=settings.OLLAMA_HOST)
+        self.chat_url = f"{settings.OLLAMA_HOST.rstrip('/')}/api/chat"
 
     def generate_json(self, prompt: str, model: str = settings.OLLAMA_MODEL) -> Dict[str, Any]:
         print(f"Using OllamaProvider with model '{model}'...")
@@ -29,27 +47,75 @@ class OllamaProvider:
             print(f"Error communicating with Ollama: {e}")
             raise
 
+    async def achat(self, prompt: str, model: str = settings.OLLAMA_MODEL, format: Optional[str] = None) -> str:
+        """Non-blocking chat completion over the shared pooled transport."""
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": False,
+        }
+        if format:
+            payload["format"] = format
+        try:
+            response = await get_llm_transport().post_json(self.chat_url, payload)
+            return response['message']['content']
+        except Exception as e:
+            print(f"Error communicating with Ollama: {e}")
+            raise
+
+    async def agenerate_json(self, prompt: str, model: str = settings.OLLAMA_MODEL) -> Dict[str, Any]:
+        return json.loads(await self.achat(prompt, model, format='json'))
+
+    async def achat_stream(self, prompt: str, model: str = settings.OLLAMA_MODEL, format: Optional[str] = None) -> AsyncIterator[str]:
+        """Yields content deltas as Ollama produces them (newline-delimited JSON)."""
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": True,
+        }
+        if format:
+            payload["format"] = format
+        async for line in get_llm_transport().stream_lines(self.chat_url, payload):
+            chunk = json.loads(line)
+            if chunk.get("error"):
+                raise RuntimeError(f"Ollama stream error: {chunk['error']}")
+            delta = chunk.get("message", {}).get("content")
+            if delta:
+                yield delta
+            if chunk.get("done"):
+                break
+
 class TogetherAIProvider:
     """LLM provider for the Together.ai API."""
+    name = "together"
+
     def __init__(self):
         if not settings.TOGETHER_API_KEY:
             raise ValueError("TOGETHER_API_KEY is not set in the configuration.")
         self.api_key = settings.TOGETHER_API_KEY
         self.url = "https://api.together.xyz/v1/chat/completions"
+        # Keep-alive session for the synchronous path
+        self.session = requests.Session()
 
-    def generate_json(self, prompt: str, model: str = "mistralai/Mixtral-8x7B-Instruct-v0.1") -> Dict[str, Any]:
-        print(f"Using TogetherAIProvider with model '{model}'...")
-        headers = {
+    def _headers(self) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+
+    def _payload(self, prompt: str, model: str, format: Optional[str]) -> Dict[str, Any]:
         data = {
             "model": model,
             "messages": [{"role": "user", "content": prompt}],
-            "response_format": {"type": "json_object"}
         }
+        if format == "json":
+            data["response_format"] = {"type": "json_object"}
+        return data
+
+    def generate_json(self, prompt: str, model: str = "mistralai/Mixtral-8x7B-Instruct-v0.1") -> Dict[str, Any]:
+        print(f"Using TogetherAIProvider with model '{model}'...")
         try:
-            response = requests.post(self.url, headers=headers, json=data, timeout=60)
+            response = self.session.post(self.url, headers=self._headers(), json=self._payload(prompt, model, "json"), timeout=60)
             response.raise_for_status()
             response_content = response.json()['choices'][0]['message']['content']
             return json.loads(response_content)
@@ -57,38 +123,148 @@ class TogetherAIProvider:
             print(f"Error communicating with Together.ai: {e}")
             raise
 
+    async def achat(self, prompt: str, model: str = "mistralai/Mixtral-8x7B-Instruct-v0.1", format: Optional[str] = None) -> str:
+        """Non-blocking chat completion over the shared pooled transport."""
+        try:
+            response = await get_llm_transport().post_json(
+                self.url, self._payload(prompt, model, format), headers=self._headers()
+            )
+            return response['choices'][0]['message']['content']
+        except Exception as e:
+            print(f"Error communicating with Together.ai: {e}")
+            raise
+
+    async def agenerate_json(self, prompt: str, model: str = "mistralai/Mixtral-8x7B-Instruct-v0.1") -> Dict[str, Any]:
+        return json.loads(await self.achat(prompt, model, format="json"))
+
+    async def achat_stream(self, prompt: str, model: str = "mistralai/Mixtral-8x7B-Instruct-v0.1", format: Optional[str] = None) -> AsyncIterator[str]:
+        """Yields content deltas from Together's server-sent event stream."""
+        payload = self._payload(prompt, model, format)
+        payload["stream"] = True
+        async for line in get_llm_transport().stream_lines(self.url, payload, headers=self._headers()):
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            choices = json.loads(data).get("choices") or [{}]
+            delta = (choices[0].get("delta") or {}).get("content")
+            if delta:
+                yield delta
+
+_PROVIDER_CLASSES = {
+    "ollama": OllamaProvider,
+    "together": TogetherAIProvider,
+}
+_providers: Dict[str, LLMProvider] = {}
+_providers_lock = threading.Lock()
+
+def get_provider(name: str) -> LLMProvider:
+    """
+    Returns the process-wide provider instance for `name`, creating it on first use.
+    Providers are stateless apart from their pooled connections, so all clients share them.
+    """
+    provider = _providers.get(name)
+    if provider is None:
+        provider_class = _PROVIDER_CLASSES.get(name)
+        if provider_class is None:
+            raise ValueError(f"Unsupported LLM provider: {name}")
+        with _providers_lock:
+            provider = _providers.get(name)
+            if provider is None:
+                provider = _providers[name] = provider_class()
+    return provider
+
 class LlmClient:
-    """Client for interacting with LLM providers."""
+    """
+    Client for interacting with LLM providers.
+
+    Clients are cheap to construct: they resolve to the shared provider for their
+    configured backend, and all calls go through the pooled async transport.
+    Responses are served from the shared LLM cache when the same request was
+    answered before; `cache_namespace` selects the per-agent TTL and defaults to
+    the agent currently running in this context. Identical requests already in
+    flight are coalesced into a single upstream call. Inside a streaming agent
+    run (see `guild.src.core.streaming`), chat forwards partial output as it arrives.
+    Prompts sent from an `inject_knowledge` function get the fetched web context
+    injected first.
+    """
     
-    def __init__(self, llm_config: Llm):
+    def __init__(self, llm_config: Llm, cache_namespace: Optional[str] = None):
         self.llm_config = llm_config
-        if llm_config.provider == "together":
-            if not settings.TOGETHER_API_KEY:
-                raise ValueError("TOGETHER_API_KEY is not set for Together.ai provider")
-            self.provider = TogetherAIProvider()
-        elif llm_config.provider == "ollama":
-            self.provider = OllamaProvider()
-        else:
-            raise ValueError(f"Unsupported LLM provider: {llm_config.provider}")
+        self.cache_namespace = cache_namespace
+        if llm_config.provider == "together" and not settings.TOGETHER_API_KEY:
+            raise ValueError("TOGETHER_API_KEY is not set for Together.ai provider")
+        self.provider = get_provider(llm_config.provider)
+
+    @property
+    def response_format(self) -> Optional[str]:
+        # Ollama is used conversationally; other providers answer in JSON mode
+        return None if self.llm_config.provider == "ollama" else "json"
     
     async def chat(self, prompt: str) -> str:
         """Send a chat message and return the response as a string."""
+        prompt = await inject_pending_knowledge(prompt)
+        sink = token_sink.get()
+        if sink is not None:
+            # A streaming consumer wants every delta, so bypass request coalescing
+            parts = []
+            async for delta in self._stream(prompt):
+                sink(delta)
+                parts.append(delta)
+            return "".join(parts)
+
+        cache = get_llm_cache()
+        ttl = cache.ttl_for(self.cache_namespace)
+        key = cache.make_key(self.llm_config.provider, self.llm_config.model, prompt, self.response_format)
+        if ttl > 0:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        async def complete_and_store() -> str:
+            response = await self._complete(prompt)
+            if ttl > 0:
+                cache.set(key, response, ttl)
+            return response
+
+        return await get_single_flight().do(key, complete_and_store)
+
+    async def chat_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Send a chat message and yield the response incrementally as it is generated."""
+        prompt = await inject_pending_knowledge(prompt)
+        async for delta in self._stream(prompt):
+            yield delta
+
+    async def _stream(self, prompt: str) -> AsyncIterator[str]:
+        cache = get_llm_cache()
+        ttl = cache.ttl_for(self.cache_namespace)
+        key = cache.make_key(self.llm_config.provider, self.llm_config.model, prompt, self.response_format)
+        if ttl > 0:
+            cached = cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        parts = []
         try:
-            # For conversational prompts, use a simple text generation approach
-            if self.llm_config.provider == "ollama":
-                # Use Ollama's chat method directly for conversational responses
-                client = ollama.Client(host=settings.OLLAMA_HOST)
-                response = client.chat(
-                    model=self.llm_config.model,
-                    messages=[{'role': 'user', 'content': prompt}]
-                )
-                return response['message']['content']
-            else:
-                # Fallback to the existing method for other providers
-                result = self.provider.generate_json(prompt, self.llm_config.model)
-                if isinstance(result, dict):
-                    return json.dumps(result)
-                return str(result)
+            async for delta in self.provider.achat_stream(prompt, self.llm_config.model, format=self.response_format):
+                parts.append(delta)
+                yield delta
+        except Exception as e:
+            print(f"Error in LlmClient.chat_stream: {e}")
+            raise
+        if ttl > 0:
+            cache.set(key, "".join(parts), ttl)
+
+    async def _complete(self, prompt: str) -> str:
+        try:
+            if self.response_format is None:
+                return await self.provider.achat(prompt, self.llm_config.model)
+            result = await self.provider.agenerate_json(prompt, self.llm_config.model)
+            if isinstance(result, dict):
+                return json.dumps(result)
+            return str(result)
         except Exception as e:
             print(f"Error in LlmClient.chat: {e}")
             raise
@@ -100,10 +276,10 @@ def get_llm_client() -> LLMProvider:
     """
     if settings.TOGETHER_API_KEY:
         print("TOGETHER_API_KEY found. Using TogetherAIProvider.")
-        return TogetherAIProvider()
+        return get_provider("together")
 
     print("No TOGETHER_API_KEY found. Falling back to OllamaProvider.")
-    return OllamaProvider()
+    return get_provider("ollama")
 
 # A single client instance to be used by agents
 llm_client = get_llm_client()
@@ -112,10 +288,24 @@ def generate_json(prompt: str, model: str = None) -> Dict[str, Any]:
     """
     A simple wrapper to call the configured LLM client.
     Allows specifying a model, otherwise uses the provider's default.
+    Results are served from the shared LLM cache when available.
     """
+    cache = get_llm_cache()
+    ttl = cache.ttl_for()
+    key = cache.make_key(llm_client.name, model, prompt, "json")
+    if ttl > 0:
+        cached = cache.get(key)
+        if cached is not None:
+            return json.loads(cached)
+
     # The model parameter is a bit tricky with the fallback logic.
     # This implementation will use the default model for each provider.
     # A more advanced version could map generic model names to provider-specific ones.
     if model:
-        return llm_client.generate_json(prompt, model=model)
-    return llm_client.generate_json(prompt)
+        result = llm_client.generate_json(prompt, model=model)
+    else:
+        result = llm_client.generate_json(prompt)
+
+    if ttl > 0:
+        cache.set(key, json.dumps(result), ttl)
+    return result
@@ -0,0 +1,119 @@
+"""
+Shared async HTTP transport for LLM providers.
+
+Every provider talks to its backend through one process-wide transport
+instead of building a new client per call. The transport keeps a keep-alive
+connection pool and a concurrency limit per event loop, so agents running on
+the same loop reuse sockets and cannot flood the backend, while separate
+loops (e.g. one ``asyncio.run`` per Celery task) never share loop-bound state.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from guild.src.core.config import settings
+
+
+class _LoopState:
+    """Per-event-loop pooled client and concurrency gate."""
+
+    def __init__(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore):
+        self.client = client
+        self.semaphore = semaphore
+
+
+class LlmTransport:
+    """Pooled, non-blocking HTTP transport shared by all LLM providers."""
+
+    def __init__(
+        self,
+        max_concurrency: int = settings.LLM_MAX_CONCURRENCY,
+        max_connections: int = settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections: int = settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+        timeout: float = settings.LLM_REQUEST_TIMEOUT_SECONDS,
+    ):
+        self.max_concurrency = max_concurrency
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=10.0)
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "in_flight": 0, "errors": 0}
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._states.get(loop)
+            if state is None or state.client.is_closed:
+                state = _LoopState(
+                    client=httpx.AsyncClient(limits=self.limits, timeout=self.timeout),
+                    semaphore=asyncio.Semaphore(self.max_concurrency),
+                )
+                self._states[loop] = state
+            return state
+
+    async def post_json(
+        self, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """POST a JSON payload and return the decoded JSON response."""
+        state = self._state()
+        async with state.semaphore:
+            self.stats["requests"] += 1
+            self.stats["in_flight"] += 1
+            try:
+                response = await state.client.post(url, json=payload, headers=headers)
+                response.raise_for_status()
+                return response.json()
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+            finally:
+                self.stats["in_flight"] -= 1
+
+    async def stream_lines(
+        self, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[str]:
+        """POST a JSON payload and yield the response body line by line as it arrives."""
+        state = self._state()
+        async with state.semaphore:
+            self.stats["requests"] += 1
+            self.stats["in_flight"] += 1
+            try:
+                async with state.client.stream("POST", url, json=payload, headers=headers) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if line:
+                            yield line
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+            finally:
+                self.stats["in_flight"] -= 1
+
+    async def aclose(self) -> None:
+        """Close the pooled client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._states.pop(loop, None)
+        if state is not None:
+            await state.client.aclose()
+
+
+_transport: Optional[LlmTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_llm_transport() -> LlmTransport:
+    """Returns the process-wide LLM transport, creating it on first use."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = LlmTransport()
+    return _transport
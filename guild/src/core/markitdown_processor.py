@@ -14,7 +14,7 @@ Supported formats:
 
 import os
 import logging
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, Tuple
 from pathlib import Path
 import tempfile
 import shutil
@@ -28,6 +28,7 @@ except ImportError:
 
 from .config import settings
 from . import vector_store
+from .chunking import iter_chunks
 
 logger = logging.getLogger(__name__)
 
@@ -170,6 +171,37 @@ class MarkItDownProcessor:
             logger.error(f"Error converting {file_path} to Markdown: {str(e)}")
             return None
     
+    def convert_and_chunk(self, file_path: str) -> Optional[Tuple[List[str], Dict[str, Any]]]:
+        """
+        Convert a document to Markdown and split it into chunks, without indexing.
+        
+        Args:
+            file_path: Path to the document file
+            
+        Returns:
+            Tuple of (chunks, conversion metadata), or None if conversion fails
+        """
+        # Convert document to Markdown
+        markdown_content = self.convert_to_markdown(file_path)
+        
+        if not markdown_content:
+            logger.error(f"Failed to convert {file_path} to Markdown")
+            return None
+        
+        # Split the Markdown content into chunks
+        chunks = list(iter_chunks([markdown_content]))
+        
+        logger.info(f"Document split into {len(chunks)} chunks.")
+        
+        # Conversion metadata
+        conversion_metadata = {
+            "conversion_method": "markitdown",
+            "original_format": Path(file_path).suffix.lower(),
+            "markdown_length": len(markdown_content),
+            "chunk_count": len(chunks)
+        }
+        return chunks, conversion_metadata
+    
     def process_document(self, file_path: str, document_metadata: Dict[str, Any]) -> bool:
         """
         Process a document by converting it to Markdown and then embedding it.
@@ -191,35 +223,22 @@ class MarkItDownProcessor:
                 logger.error(f"Failed to convert {file_path} to Markdown")
                 return False
             
-            # Split the Markdown content into chunks
-            from langchain.text_splitter import RecursiveCharacterTextSplitter
-            
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000,
-                chunk_overlap=200,
-                length_function=len
-            )
-            
-            # Split the markdown content
-            chunks = text_splitter.split_text(markdown_content)
-            
-            logger.info(f"Document split into {len(chunks)} chunks.")
-            
             # Add conversion metadata
             enhanced_metadata = {
                 **document_metadata,
                 "conversion_method": "markitdown",
                 "original_format": Path(file_path).suffix.lower(),
-                "markdown_length": len(markdown_content),
-                "chunk_count": len(chunks)
+                "markdown_length": len(markdown_content)
             }
             
-            # Index the chunks in the vector store
-            vector_store.index_chunks(
+            # Chunk and index in fixed-size windows instead of materializing
+            # every chunk and vector for the document
+            chunk_count = vector_store.index_chunk_stream(
                 document_id=document_metadata['document_id'],
-                text_chunks=chunks,
+                text_chunks=iter_chunks([markdown_content]),
                 metadata=enhanced_metadata
             )
+            logger.info(f"Document split into {chunk_count} chunks.")
             
             logger.info(f"Successfully processed and embedded {file_path}")
             return True
@@ -259,35 +278,23 @@ class MarkItDownProcessor:
                 logger.warning(f"Empty transcript extracted from {audio_path}")
                 return False
             
-            # Split transcript into chunks
-            from langchain.text_splitter import RecursiveCharacterTextSplitter
-            
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000,
-                chunk_overlap=200,
-                length_function=len
-            )
-            
-            chunks = text_splitter.split_text(transcript)
-            
-            logger.info(f"Audio transcript split into {len(chunks)} chunks.")
-            
             # Add transcription metadata
             enhanced_metadata = {
                 **document_metadata,
                 "conversion_method": "markitdown_audio",
                 "original_format": Path(audio_path).suffix.lower(),
-                "transcript_length": len(transcript),
-                "chunk_count": len(chunks)
+                "transcript_length": len(transcript)
             }
             
-            # Index the chunks
-            vector_store.index_chunks(
+            # Chunk and index the transcript in fixed-size windows
+            chunk_count = vector_store.index_chunk_stream(
                 document_id=document_metadata['document_id'],
-                text_chunks=chunks,
+                text_chunks=iter_chunks([transcript]),
                 metadata=enhanced_metadata
             )
             
+            logger.info(f"Audio transcript split into {chunk_count} chunks.")
+            
             logger.info(f"Successfully transcribed and embedded {audio_path}")
             return True
             
@@ -326,35 +333,23 @@ class MarkItDownProcessor:
                 logger.warning(f"Empty transcript extracted from {youtube_url}")
                 return False
             
-            # Split transcript into chunks
-            from langchain.text_splitter import RecursiveCharacterTextSplitter
-            
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000,
-                chunk_overlap=200,
-                length_function=len
-            )
-            
-            chunks = text_splitter.split_text(transcript)
-            
-            logger.info(f"YouTube transcript split into {len(chunks)} chunks.")
-            
             # Add transcription metadata
             enhanced_metadata = {
                 **document_metadata,
                 "conversion_method": "markitdown_youtube",
                 "source_url": youtube_url,
-                "transcript_length": len(transcript),
-                "chunk_count": len(chunks)
+                "transcript_length": len(transcript)
             }
             
-            # Index the chunks
-            vector_store.index_chunks(
+            # Chunk and index the transcript in fixed-size windows
+            chunk_count = vector_store.index_chunk_stream(
                 document_id=document_metadata['document_id'],
-                text_chunks=chunks,
+                text_chunks=iter_chunks([transcript]),
                 metadata=enhanced_metadata
             )
             
+            logger.info(f"YouTube transcript split into {chunk_count} chunks.")
+            
             logger.info(f"Successfully transcribed and embedded YouTube video")
             return True
             
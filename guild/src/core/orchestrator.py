@@ -1,75 +1,21 @@
 import json
 import asyncio
-from typing import Dict, Any, Callable, List
+import time
+from collections import defaultdict, deque
+from typing import Dict, Any, Callable, List, Optional
 from pydantic import BaseModel
 
 # Use absolute imports for clarity and robustness
 from guild.src.models.user_input import UserInput
 from guild.src.models.llm import Llm, LlmModels
 from guild.src.core.llm_client import LlmClient
+from guild.src.core.agent_helpers import known_knowledge_queries, prefetch_knowledge
+from guild.src.core.llm_cache import current_agent
+from guild.src.core.agent_registry import LazyAgentRegistry
+from guild.src.core.config import settings
 from guild.src.models.workflow import Task
 from guild.src.utils.logging_utils import get_logger
 
-# --- Import ALL Agent Classes ---
-# Foundational
-from guild.src.agents.judge_agent import JudgeAgent
-# Executive
-from guild.src.agents.chief_of_staff_agent import ChiefOfStaffAgent
-from guild.src.agents.strategy_agent import StrategyAgent
-from guild.src.agents.strategic_sounding_board_agent import StrategicSoundingBoardAgent
-from guild.src.agents.well_being_agent import WellBeingAgent
-# Temporarily disabled most agents to fix import issues
-from guild.src.agents.accountability_coach_agent import AccountabilityCoachAgent
-# Marketing & Growth
-from guild.src.agents.content_strategist import ContentStrategist
-from guild.src.agents.seo_agent import SEOAgent
-from guild.src.agents.copywriter import Copywriter
-from guild.src.agents.paid_ads_agent import PaidAdsAgent
-from guild.src.agents.pr_outreach_agent import PROutreachAgent
-from guild.src.agents.community_manager_agent import CommunityManagerAgent
-# Sales & Revenue
-from guild.src.agents.sales_funnel_agent import SalesFunnelAgent
-from guild.src.agents.crm_agent import CRMAgent
-from guild.src.agents.outbound_sales_agent import OutboundSalesAgent
-from guild.src.agents.partnerships_agent import PartnershipsAgent
-# Operations
-from guild.src.agents.project_manager_agent import ProjectManagerAgent
-from guild.src.agents.hr_agent import HRAgent
-from guild.src.agents.training_agent import TrainingAgent
-from guild.src.agents.compliance_agent import ComplianceAgent
-from guild.src.agents.skill_development_agent import SkillDevelopmentAgent
-from guild.src.agents.outsourcing_agent import OutsourcingAgent
-# Finance
-from guild.src.agents.bookkeeping_agent import BookkeepingAgent
-from guild.src.agents.investor_relations_agent import InvestorRelationsAgent
-from guild.src.agents.pricing_agent import PricingAgent
-# Product & Customer
-from guild.src.agents.product_manager_agent import ProductManagerAgent
-from guild.src.agents.customer_support_agent import CustomerSupportAgent
-from guild.src.agents.ux_ui_tester_agent import UXUITesterAgent
-from guild.src.agents.churn_predictor_agent import ChurnPredictorAgent
-
-# Additional Agents - All dependencies installed
-from guild.src.agents.business_strategist_agent import BusinessStrategistAgent
-from guild.src.agents.scraper_agent import ScraperAgent
-from guild.src.agents.orchestrator_agent import OrchestratorAgent
-from guild.src.agents.image_generation_agent import ImageGenerationAgent
-from guild.src.agents.video_editor_agent import VideoEditorAgent
-from guild.src.agents.voice_agent import VoiceAgent
-from guild.src.agents.unified_automation_agent import UnifiedAutomationAgent
-from guild.src.agents.onboarding_agent import OnboardingAgent
-from guild.src.agents.lead_personalization_agent import LeadPersonalizationAgent
-from guild.src.agents.research_scraper_agent import ResearchScraperAgent
-from guild.src.agents.telephony_voice_agent import TelephonyVoiceAgent
-from guild.src.agents.wellbeing_workload_agent import WellbeingWorkloadAgent
-from guild.src.agents.crm_automation_agent import CRMAutomationAgent
-from guild.src.agents.hiring_hr_agent import HiringHRAgent
-from guild.src.agents.accounting_agent import AccountingAgent
-
-# Vision & Learning
-from guild.src.agents.visual_agent import VisualAgent
-from guild.src.agents.vision_enhanced_training_agent import VisionEnhancedTrainingAgent
-
 logger = get_logger(__name__)
 
 # Simple workflow model for orchestrator (not database model)
@@ -79,65 +25,66 @@ class SimpleWorkflow(BaseModel):
     tasks: List[Task]
 
 # --- The Master Agent Registry ---
-AGENT_REGISTRY = {
+# Agents are imported on first lookup; see guild.src.core.agent_registry
+AGENT_REGISTRY = LazyAgentRegistry({
     # Foundational
-    "JudgeAgent": JudgeAgent,
+    "JudgeAgent": "guild.src.agents.judge_agent:JudgeAgent",
     # Executive
-    "ChiefOfStaffAgent": ChiefOfStaffAgent,
-    "StrategyAgent": StrategyAgent,
-    "StrategicSoundingBoardAgent": StrategicSoundingBoardAgent,
-    "WellBeingAgent": WellBeingAgent,
-    "AccountabilityCoachAgent": AccountabilityCoachAgent,
+    "ChiefOfStaffAgent": "guild.src.agents.chief_of_staff_agent:ChiefOfStaffAgent",
+    "StrategyAgent": "guild.src.agents.strategy_agent:StrategyAgent",
+    "StrategicSoundingBoardAgent": "guild.src.agents.strategic_sounding_board_agent:StrategicSoundingBoardAgent",
+    "WellBeingAgent": "guild.src.agents.well_being_agent:WellBeingAgent",
+    "AccountabilityCoachAgent": "guild.src.agents.accountability_coach_agent:AccountabilityCoachAgent",
     # Marketing & Growth
-    "ContentStrategist": ContentStrategist,
-    "SEOAgent": SEOAgent,
-    "Copywriter": Copywriter,
-    "PaidAdsAgent": PaidAdsAgent,
-    "PROutreachAgent": PROutreachAgent,
-    "CommunityManagerAgent": CommunityManagerAgent,
+    "ContentStrategist": "guild.src.agents.content_strategist:ContentStrategist",
+    "SEOAgent": "guild.src.agents.seo_agent:SEOAgent",
+    "Copywriter": "guild.src.agents.copywriter:Copywriter",
+    "PaidAdsAgent": "guild.src.agents.paid_ads_agent:PaidAdsAgent",
+    "PROutreachAgent": "guild.src.agents.pr_outreach_agent:PROutreachAgent",
+    "CommunityManagerAgent": "guild.src.agents.community_manager_agent:CommunityManagerAgent",
     # Sales & Revenue
-    "SalesFunnelAgent": SalesFunnelAgent,
-    "CRMAgent": CRMAgent,
-    "OutboundSalesAgent": OutboundSalesAgent,
-    "PartnershipsAgent": PartnershipsAgent,
+    "SalesFunnelAgent": "guild.src.agents.sales_funnel_agent:SalesFunnelAgent",
+    "CRMAgent": "guild.src.agents.crm_agent:CRMAgent",
+    "OutboundSalesAgent": "guild.src.agents.outbound_sales_agent:OutboundSalesAgent",
+    "PartnershipsAgent": "guild.src.agents.partnerships_agent:PartnershipsAgent",
     # Operations
-    "ProjectManagerAgent": ProjectManagerAgent,
-    "HRAgent": HRAgent,
-    "TrainingAgent": TrainingAgent,
-    "ComplianceAgent": ComplianceAgent,
-    "SkillDevelopmentAgent": SkillDevelopmentAgent,
-    "OutsourcingAgent": OutsourcingAgent,
+    "ProjectManagerAgent": "guild.src.agents.project_manager_agent:ProjectManagerAgent",
+    "HRAgent": "guild.src.agents.hr_agent:HRAgent",
+    "TrainingAgent": "guild.src.agents.training_agent:TrainingAgent",
+    "ComplianceAgent": "guild.src.agents.compliance_agent:ComplianceAgent",
+    "SkillDevelopmentAgent": "guild.src.agents.skill_development_agent:SkillDevelopmentAgent",
+    "OutsourcingAgent": "guild.src.agents.outsourcing_agent:OutsourcingAgent",
     # Finance
-    "BookkeepingAgent": BookkeepingAgent,
-    "InvestorRelationsAgent": InvestorRelationsAgent,
-    "PricingAgent": PricingAgent,
+    "BookkeepingAgent": "guild.src.agents.bookkeeping_agent:BookkeepingAgent",
+    "InvestorRelationsAgent": "guild.src.agents.investor_relations_agent:InvestorRelationsAgent",
+    "PricingAgent": "guild.src.agents.pricing_agent:PricingAgent",
     # Product & Customer
-    "ProductManagerAgent": ProductManagerAgent,
-    "CustomerSupportAgent": CustomerSupportAgent,
-    "UXUITesterAgent": UXUITesterAgent,
-    "ChurnPredictorAgent": ChurnPredictorAgent,
+    "ProductManagerAgent": "guild.src.agents.product_manager_agent:ProductManagerAgent",
+    "CustomerSupportAgent": "guild.src.agents.customer_support_agent:CustomerSupportAgent",
+    "UXUITesterAgent": "guild.src.agents.ux_ui_tester_agent:UXUITesterAgent",
+    "ChurnPredictorAgent": "guild.src.agents.churn_predictor_agent:ChurnPredictorAgent",
     
     # Additional Agents - All enabled
-    "BusinessStrategistAgent": BusinessStrategistAgent,
-    "ScraperAgent": ScraperAgent,
-    "OrchestratorAgent": OrchestratorAgent,
-    "ImageGenerationAgent": ImageGenerationAgent,
-    "VideoEditorAgent": VideoEditorAgent,
-    "VoiceAgent": VoiceAgent,
-    "UnifiedAutomationAgent": UnifiedAutomationAgent,
-    "OnboardingAgent": OnboardingAgent,
-    "LeadPersonalizationAgent": LeadPersonalizationAgent,
-    "ResearchScraperAgent": ResearchScraperAgent,
-    "TelephonyVoiceAgent": TelephonyVoiceAgent,
-    "WellbeingWorkloadAgent": WellbeingWorkloadAgent,
-    "CRMAutomationAgent": CRMAutomationAgent,
-    "HiringHRAgent": HiringHRAgent,
-    "AccountingAgent": AccountingAgent,
+    "BusinessStrategistAgent": "guild.src.agents.business_strategist_agent:BusinessStrategistAgent",
+    "ScraperAgent": "guild.src.agents.scraper_agent:ScraperAgent",
+    "OrchestratorAgent": "guild.src.agents.orchestrator_agent:OrchestratorAgent",
+    "ImageGenerationAgent": "guild.src.agents.image_generation_agent:ImageGenerationAgent",
+    "VideoEditorAgent": "guild.src.agents.video_editor_agent:VideoEditorAgent",
+    "VoiceAgent": "guild.src.agents.voice_agent:VoiceAgent",
+    "UnifiedAutomationAgent": "guild.src.agents.unified_automation_agent:UnifiedAutomationAgent",
+    "OnboardingAgent": "guild.src.agents.onboarding_agent:OnboardingAgent",
+    "LeadPersonalizationAgent": "guild.src.agents.lead_personalization_agent:LeadPersonalizationAgent",
+    "ResearchScraperAgent": "guild.src.agents.research_scraper_agent:ResearchScraperAgent",
+    "TelephonyVoiceAgent": "guild.src.agents.telephony_voice_agent:TelephonyVoiceAgent",
+    "WellbeingWorkloadAgent": "guild.src.agents.wellbeing_workload_agent:WellbeingWorkloadAgent",
+    "CRMAutomationAgent": "guild.src.agents.crm_automation_agent:CRMAutomationAgent",
+    "HiringHRAgent": "guild.src.agents.hiring_hr_agent:HiringHRAgent",
+    "AccountingAgent": "guild.src.agents.accounting_agent:AccountingAgent",
     
     # Vision & Learning
-    "VisualAgent": VisualAgent,
-    "VisionEnhancedTrainingAgent": VisionEnhancedTrainingAgent,
-}
+    "VisualAgent": "guild.src.agents.visual_agent:VisualAgent",
+    "VisionEnhancedTrainingAgent": "guild.src.agents.vision_enhanced_training_agent:VisionEnhancedTrainingAgent",
+})
 
 # --- The Master Orchestrator Prompt ---
 DAG_GENERATION_PROMPT = """
@@ -214,6 +161,8 @@ class Orchestrator:
         self.available_agents = list(AGENT_REGISTRY.keys())
         self.system_status = "ready"
         self.active_tasks = []
+        # Timing of the most recent execute_workflow run
+        self.last_run_stats: Dict[str, Any] = {}
 
     async def generate_workflow(self) -> SimpleWorkflow:
 
@@ -235,35 +184,142 @@ class Orchestrator:
             tasks = [Task(**task_data) for task_data in workflow_data.get("tasks", [])]
             workflow = SimpleWorkflow(user_input=self.user_input, tasks=tasks)
             logger.info(f"Successfully generated workflow with {len(tasks)} tasks.")
+            self._prefetch_knowledge(workflow)
             return workflow
         except (json.JSONDecodeError, TypeError) as e:
             logger.error(f"Failed to decode or process LLM response into JSON. Error: {e}. Response: {response_str}")
             raise ValueError("Could not generate a valid workflow from the LLM response.")
 
-    async def execute_workflow(self, workflow: SimpleWorkflow, on_step_complete: Callable) -> Dict[str, Any]:
+    async def execute_workflow(
+        self,
+        workflow: SimpleWorkflow,
+        on_step_complete: Callable,
+        max_concurrency: Optional[int] = None,
+        agent_concurrency: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Runs every task of the workflow, respecting dependencies.
+
+        Tasks are scheduled from a ready queue: each task starts as soon as its
+        last dependency finishes, subject to a global concurrency cap and
+        optional per-agent caps. Timing for the run, including the critical
+        path, is logged and kept in `self.last_run_stats`.
+
+        `on_step_complete` is called with each task's parsed output.
+        """
         logger.info(f"Starting execution of workflow for objective: {workflow.user_input.objective}")
         execution_context: Dict[str, Any] = {}
-
-        completed_tasks = set()
-        while len(completed_tasks) < len(workflow.tasks):
-            tasks_to_run = [
-                task for task in workflow.tasks
-                if task.task_id not in completed_tasks and all(dep in completed_tasks for dep in task.dependencies)
-            ]
-            if not tasks_to_run and len(completed_tasks) < len(workflow.tasks):
-                raise RuntimeError("Workflow has a cycle or unresolved dependencies.")
-            results = await asyncio.gather(
-                *(self._execute_task(task, execution_context, on_step_complete) for task in tasks_to_run)
-            )
-            for task, result in zip(tasks_to_run, results):
-                execution_context[task.task_id] = result
-                completed_tasks.add(task.task_id)
-
-        logger.info("Workflow execution finished.")
+        # Reuses the searches generate_workflow started, for workflows built elsewhere too
+        self._prefetch_knowledge(workflow)
+
+        tasks = {task.task_id: task for task in workflow.tasks}
+        in_degree = {task_id: len(task.dependencies) for task_id, task in tasks.items()}
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        for task_id, task in tasks.items():
+            for dep in task.dependencies:
+                if dep not in tasks:
+                    raise RuntimeError(f"Task {task_id} depends on unknown task {dep}.")
+                dependents[dep].append(task_id)
+
+        global_slots = asyncio.Semaphore(max_concurrency or settings.WORKFLOW_MAX_CONCURRENCY)
+        agent_limits = agent_concurrency if agent_concurrency is not None else settings.WORKFLOW_AGENT_CONCURRENCY
+        agent_slots = {agent: asyncio.Semaphore(limit) for agent, limit in agent_limits.items()}
+        timings: Dict[str, Dict[str, float]] = {}
+        started = time.perf_counter()
+
+        async def run_task(task: Task) -> Any:
+            slot = agent_slots.get(task.agent)
+            if slot is not None:
+                await slot.acquire()
+            try:
+                async with global_slots:
+                    task_started = time.perf_counter()
+                    result = await self._execute_task(task, execution_context, on_step_complete)
+                    timings[task.task_id] = {"start": task_started - started, "end": time.perf_counter() - started}
+                    return result
+            finally:
+                if slot is not None:
+                    slot.release()
+
+        ready = deque(task_id for task_id, degree in in_degree.items() if degree == 0)
+        running: Dict[asyncio.Task, str] = {}
+        try:
+            while ready or running:
+                while ready:
+                    task_id = ready.popleft()
+                    running[asyncio.create_task(run_task(tasks[task_id]))] = task_id
+                if not running:
+                    break
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    task_id = running.pop(future)
+                    execution_context[task_id] = future.result()
+                    for dependent in dependents[task_id]:
+                        in_degree[dependent] -= 1
+                        if in_degree[dependent] == 0:
+                            ready.append(dependent)
+        finally:
+            for future in running:
+                future.cancel()
+
+        if len(execution_context) < len(tasks):
+            raise RuntimeError("Workflow has a cycle or unresolved dependencies.")
+
+        self.last_run_stats = self._timing_stats(tasks, timings, time.perf_counter() - started)
+        logger.info(
+            f"Workflow execution finished in {self.last_run_stats['total_seconds']:.2f}s; "
+            f"critical path {' -> '.join(self.last_run_stats['critical_path'])} "
+            f"took {self.last_run_stats['critical_path_seconds']:.2f}s of task time."
+        )
         return execution_context
 
+    @staticmethod
+    def _prefetch_knowledge(workflow: SimpleWorkflow) -> None:
+        """
+        Starts the knowledge searches the workflow's agents will inject, while their dependencies run.
+
+        The queries are the ones each agent's injected prompts searched for
+        before; fresh results are served by the knowledge cache without a search.
+        """
+        if not settings.KNOWLEDGE_PREFETCH_ENABLED:
+            return
+        agents = dict.fromkeys(task.agent for task in workflow.tasks)
+        started = prefetch_knowledge(query for agent in agents for query in known_knowledge_queries(agent))
+        if started:
+            logger.info(f"Prefetching knowledge for {len(started)} queries.")
+
+    @staticmethod
+    def _timing_stats(tasks: Dict[str, Task], timings: Dict[str, Dict[str, float]], total: float) -> Dict[str, Any]:
+        """Per-task timings and the critical path, the dependency chain with the most task time."""
+        durations = {task_id: timing["end"] - timing["start"] for task_id, timing in timings.items()}
+        path_seconds: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+
+        # Tasks finish after all their dependencies, so end time is a topological order
+        for task_id in sorted(timings, key=lambda t: timings[t]["end"]):
+            heaviest = max(tasks[task_id].dependencies, key=lambda dep: path_seconds[dep], default=None)
+            previous[task_id] = heaviest
+            path_seconds[task_id] = durations[task_id] + (path_seconds[heaviest] if heaviest else 0.0)
+
+        critical_path: List[str] = []
+        node = max(path_seconds, key=path_seconds.get, default=None)
+        while node is not None:
+            critical_path.append(node)
+            node = previous[node]
+        critical_path.reverse()
+
+        return {
+            "total_seconds": total,
+            "task_seconds": sum(durations.values()),
+            "critical_path": critical_path,
+            "critical_path_seconds": path_seconds[critical_path[-1]] if critical_path else 0.0,
+            "tasks": timings,
+        }
+
     async def _execute_task(self, task: Task, context: Dict[str, Any], on_step_complete: Callable) -> Any:
         logger.info(f"Executing task: {task.task_id} with agent: {task.agent}")
+        # Scope LLM cache TTLs to this agent; each gathered task runs in its own context
+        current_agent.set(task.agent)
 
         agent_class = AGENT_REGISTRY.get(task.agent)
         if not agent_class:
@@ -298,11 +354,16 @@ class Orchestrator:
              agent = agent_class(self.user_input)
 
 
-        result_str = await agent.run()
-        try:
-            output_data = json.loads(result_str)
-        except json.JSONDecodeError:
-            output_data = {"result": result_str}
+        result = await agent.run()
+
+        # Agents return either a dict or a JSON string
+        if isinstance(result, dict):
+            output_data = result
+        else:
+            try:
+                output_data = json.loads(result)
+            except (json.JSONDecodeError, TypeError):
+                output_data = {"result": result}
 
         logger.info(f"Task {task.task_id} completed successfully.")
         on_step_complete(
@@ -12,11 +12,15 @@ from .advanced_scraper import (
     get_advanced_scraper,
     scrape_leads_advanced
 )
+from .crawl_service import CrawlJob, CrawlService, get_crawl_service
 
 __all__ = [
     'AdvancedScraper',
     'LeadEnrichmentPipeline', 
     'GenericLeadSpider',
     'get_advanced_scraper',
-    'scrape_leads_advanced'
+    'scrape_leads_advanced',
+    'CrawlJob',
+    'CrawlService',
+    'get_crawl_service'
 ]
@@ -7,22 +7,21 @@ provides data enrichment capabilities.
 """
 
 import os
-import json
 import logging
-import tempfile
 from typing import Dict, Any, List, Optional, Union
 from pathlib import Path
 import pandas as pd
-from bs4 import BeautifulSoup
 import phonenumbers
 from email_validator import validate_email, EmailNotValidError
 from faker import Faker
 
+from guild.src.core.config import settings
+from guild.src.core.scraping.crawl_service import get_crawl_service
+from guild.src.core.scraping.selector_plan import SelectorPlan
+
 # Scrapy imports
 try:
     import scrapy
-    from scrapy.crawler import CrawlerProcess
-    from scrapy.utils.project import get_project_settings
     from scrapy.http import Request
     SCRAPY_AVAILABLE = True
 except ImportError:
@@ -154,6 +153,8 @@ class GenericLeadSpider(scrapy.Spider):
         self.target_selectors = target_selectors or {}
         self.icp_criteria = icp_criteria or {}
         self.enrichment_pipeline = LeadEnrichmentPipeline()
+        # Merged default + custom selectors, compiled once for every page this spider parses
+        self.selector_plan = SelectorPlan(self.target_selectors)
         
         # Custom settings for this spider
         self.custom_settings = {
@@ -196,81 +197,12 @@ class GenericLeadSpider(scrapy.Spider):
             logger.error(f"Error parsing {response.url}: {e}")
     
     def _extract_leads(self, response) -> List[Dict[str, Any]]:
-        """Extract lead data from response using configured selectors."""
-        leads = []
-        
-        # Default selectors for common lead data
-        default_selectors = {
-            'name': 'h1, h2, h3, .name, .title, [class*="name"]',
-            'title': '.title, .position, .job-title, [class*="title"]',
-            'company': '.company, .organization, [class*="company"]',
-            'email': 'a[href^="mailto:"], .email, [class*="email"]',
-            'phone': 'a[href^="tel:"], .phone, [class*="phone"]',
-            'location': '.location, .address, [class*="location"]',
-            'description': '.description, .bio, .summary, [class*="description"]'
-        }
-        
-        # Use custom selectors if provided, otherwise use defaults
-        selectors = {**default_selectors, **self.target_selectors}
-        
-        # Find lead containers (individual lead entries)
-        lead_containers = response.css('.lead, .person, .contact, .profile, .result').getall()
-        
-        if not lead_containers:
-            # If no specific containers, treat the whole page as one lead
-            lead_containers = [response.text]
-        
-        for container_html in lead_containers:
-            lead_data = {}
-            
-            if isinstance(container_html, str):
-                # Parse HTML container
-                soup = BeautifulSoup(container_html, 'html.parser')
-                
-                for field, selector in selectors.items():
-                    elements = soup.select(selector)
-                    if elements:
-                        # Get text content from first matching element
-                        lead_data[field] = elements[0].get_text(strip=True)
-                        
-                        # For email/phone, try to get href attribute
-                        if field in ['email', 'phone'] and elements[0].name == 'a':
-                            href = elements[0].get('href', '')
-                            if field == 'email' and href.startswith('mailto:'):
-                                lead_data[field] = href.replace('mailto:', '')
-                            elif field == 'phone' and href.startswith('tel:'):
-                                lead_data[field] = href.replace('tel:', '')
-            else:
-                # Use Scrapy selectors for response objects
-                for field, selector in selectors.items():
-                    elements = container_html.css(selector)
-                    if elements:
-                        lead_data[field] = elements.get()
-            
-            # Add source URL
-            lead_data['source_url'] = response.url
-            
-            if lead_data:  # Only add if we found some data
-                leads.append(lead_data)
-        
-        return leads
+        """Extract lead data from response using the spider's compiled selector plan."""
+        return self.selector_plan.extract(response.selector.root, response.url)
     
     def _get_next_page(self, response) -> Optional[str]:
         """Get the next page URL for pagination."""
-        next_selectors = [
-            'a[rel="next"]',
-            '.next',
-            '.pagination .next',
-            'a:contains("Next")',
-            'a:contains(">")'
-        ]
-        
-        for selector in next_selectors:
-            next_link = response.css(selector).get()
-            if next_link:
-                return next_link
-        
-        return None
+        return self.selector_plan.next_page(response.selector.root)
     
     def _meets_icp(self, lead: Dict[str, Any]) -> bool:
         """
@@ -313,7 +245,6 @@ class AdvancedScraper:
             raise ImportError("Scrapy is required for advanced scraping. Install with: pip install scrapy")
         
         self.enrichment_pipeline = LeadEnrichmentPipeline()
-        self.temp_dir = None
     
     def scrape_leads(self, 
                     urls: List[str], 
@@ -333,46 +264,19 @@ class AdvancedScraper:
             Dictionary with scraping results
         """
         try:
-            # Create temporary directory for Scrapy output
-            self.temp_dir = tempfile.mkdtemp(prefix="guild_scraper_")
-            
-            # Set up Scrapy settings
-            settings = get_project_settings()
-            settings.update({
-                'ROBOTSTXT_OBEY': True,
-                'DOWNLOAD_DELAY': 2,
-                'RANDOMIZE_DOWNLOAD_DELAY': True,
-                'USER_AGENT': 'Guild-AI Scraper (+https://guild-ai.com/bot)',
-                'FEEDS': {
-                    os.path.join(self.temp_dir, 'leads.json'): {
-                        'format': 'json', 
-                        'overwrite': True
-                    }
-                }
-            })
-            
-            # Run the spider
-            process = CrawlerProcess(settings)
-            process.crawl(
-                GenericLeadSpider,
-                start_urls=urls,
+            # Items stream back in memory from the process-wide crawl service; the
+            # reactor is started once, so repeated calls in one process work
+            job = get_crawl_service().submit(
+                urls,
                 target_selectors=target_selectors,
                 icp_criteria=icp_criteria
             )
-            process.start()
-            
-            # Read the results
-            results_file = os.path.join(self.temp_dir, 'leads.json')
-            leads = []
-            
-            if os.path.exists(results_file):
-                with open(results_file, 'r') as f:
-                    for line in f:
-                        if line.strip():
-                            leads.append(json.loads(line))
-            
-            # Clean up
-            self._cleanup()
+            try:
+                leads = job.result(timeout=settings.CRAWL_JOB_TIMEOUT_SECONDS)
+            except TimeoutError:
+                # Otherwise the crawl keeps running and holds a job slot
+                job.cancel()
+                raise
             
             return {
                 'status': 'success',
@@ -383,7 +287,6 @@ class AdvancedScraper:
             
         except Exception as e:
             logger.error(f"Error in advanced scraping: {e}")
-            self._cleanup()
             return {
                 'status': 'error',
                 'error': str(e),
@@ -391,13 +294,6 @@ class AdvancedScraper:
                 'leads': []
             }
     
-    def _cleanup(self):
-        """Clean up temporary files."""
-        if self.temp_dir and os.path.exists(self.temp_dir):
-            import shutil
-            shutil.rmtree(self.temp_dir)
-            self.temp_dir = None
-    
     def enrich_leads(self, leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Enrich a list of leads with validation and additional data.
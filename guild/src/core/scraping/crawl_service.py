@@ -0,0 +1,345 @@
+"""
+Long-lived Scrapy crawl service.
+
+The Twisted reactor can only be started once per process, so running each crawl
+through its own `CrawlerProcess` fails on the second call and pays the full
+startup cost every time. The crawl service starts the reactor once, in a daemon
+thread, and runs crawl jobs on a shared `CrawlerRunner`. Jobs are queued from
+any thread; scraped items are collected in memory through the `item_scraped`
+signal (no feed files) and can be consumed as they arrive or all at once.
+"""
+
+import atexit
+import itertools
+import logging
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from guild.src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class CrawlJob:
+    """
+    Handle for one queued crawl. Items stream into `items` (and `iter_items`)
+    as the spider yields them; `result()` waits for the crawl to finish and
+    `cancel()` stops it early.
+    """
+
+    def __init__(self, job_id: int, spider_cls: type, urls: List[str], spider_kwargs: Dict[str, Any]):
+        self.job_id = job_id
+        self.spider_cls = spider_cls
+        self.urls = urls
+        self.spider_kwargs = spider_kwargs
+        self.items: List[Dict[str, Any]] = []
+        self.error: Optional[BaseException] = None
+        self.status = "queued"
+        self.queued_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._stream: "queue.Queue[Any]" = queue.Queue()
+        self._done = threading.Event()
+        self._cancelled = False
+        # Set by CrawlService.submit
+        self._service: Optional["CrawlService"] = None
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def _add_item(self, item: Dict[str, Any]) -> None:
+        # Called on the reactor thread
+        self.items.append(item)
+        self._stream.put(item)
+
+    def _finish(self, error: Optional[BaseException] = None) -> None:
+        # Called on the reactor thread
+        self.error = error
+        if self._cancelled:
+            self.status = "cancelled"
+        else:
+            self.status = "failed" if error else "completed"
+        self.finished_at = time.time()
+        self._stream.put(_DONE)
+        self._done.set()
+
+    def iter_items(self, timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """Yields items as they are scraped until the crawl finishes."""
+        while True:
+            item = self._stream.get(timeout=timeout)
+            if item is _DONE:
+                return
+            yield item
+
+    def result(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Waits for the crawl to finish.
+
+        Args:
+            timeout: Seconds to wait; None waits indefinitely
+
+        Returns:
+            Every item scraped by the job
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"Crawl job {self.job_id} did not finish within {timeout}s")
+        if self.error is not None:
+            raise self.error
+        return self.items
+
+    def cancel(self) -> bool:
+        """
+        Stops the crawl, or drops it from the queue if it has not started, so it
+        stops holding one of the service's job slots. Items scraped so far are kept.
+
+        Returns:
+            False if the job had already finished
+        """
+        if self.done:
+            return False
+        self._cancelled = True
+        if self._service is not None:
+            self._service._call(self._service._cancel, self)
+        return True
+
+
+class CrawlService:
+    """
+    Runs crawl jobs on a single reactor thread.
+
+    Up to `max_concurrent_jobs` jobs crawl at once; the rest wait in a FIFO
+    queue. Every job's crawler gets the shared Scrapy settings, including
+    per-domain concurrency and AutoThrottle.
+    """
+
+    def __init__(self, scrapy_settings: Optional[Dict[str, Any]] = None, max_concurrent_jobs: int = 4):
+        self.scrapy_settings = dict(scrapy_settings or {})
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self._job_ids = itertools.count(1)
+        self._pending: Deque[CrawlJob] = deque()
+        self._running: Dict[int, Any] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._start_lock = threading.Lock()
+        self._startup_error: Optional[BaseException] = None
+        self._stopped = False
+        self._reactor = None
+        self._runner = None
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "items": 0}
+
+    # ------------------------------------------------------------------
+    # Reactor thread
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Starts the reactor thread if it is not running yet; safe to call repeatedly."""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self._stopped:
+                # reactor.run would raise ReactorNotRestartable
+                raise RuntimeError("Crawl service was stopped; the Twisted reactor cannot be restarted")
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run_reactor, name="crawl-service", daemon=True)
+            self._thread.start()
+        self._ready.wait()
+        if self._startup_error is not None:
+            raise self._startup_error
+
+    def _run_reactor(self) -> None:
+        try:
+            from scrapy.crawler import CrawlerRunner
+            from scrapy.settings import Settings
+            from scrapy.utils.project import get_project_settings
+            from scrapy.utils.reactor import install_reactor
+
+            crawler_settings: Settings = get_project_settings()
+            crawler_settings.update(self.scrapy_settings)
+
+            # Install the reactor Scrapy is configured for, on this thread, so an
+            # asyncio reactor gets its own loop instead of the caller's
+            reactor_path = crawler_settings.get("TWISTED_REACTOR")
+            if "twisted.internet.reactor" not in sys.modules and reactor_path:
+                install_reactor(reactor_path, crawler_settings.get("ASYNCIO_EVENT_LOOP"))
+            from twisted.internet import reactor
+
+            # If another component installed a different reactor first, use it as is
+            installed = f"{type(reactor).__module__}.{type(reactor).__name__}"
+            crawler_settings.set("TWISTED_REACTOR", installed, priority="cmdline")
+
+            self._reactor = reactor
+            self._runner = CrawlerRunner(crawler_settings)
+        except BaseException as e:
+            self._startup_error = e
+            self._ready.set()
+            return
+
+        reactor.callWhenRunning(self._ready.set)
+        logger.info("Crawl service reactor started")
+        try:
+            reactor.run(installSignalHandlers=False)
+        except BaseException as e:
+            # e.g. ReactorNotRestartable when something else already ran and stopped it
+            logger.error(f"Crawl service reactor failed: {e}")
+            self._startup_error = e
+        finally:
+            # Never leave start() waiting on a reactor that is not running
+            self._ready.set()
+
+    def _call(self, fn, *args) -> None:
+        self.start()
+        self._reactor.callFromThread(fn, *args)
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    def submit(self, urls: List[str], spider_cls: Optional[type] = None, **spider_kwargs) -> CrawlJob:
+        """
+        Queues a crawl of `urls`; returns immediately.
+
+        Args:
+            urls: Start URLs for the spider
+            spider_cls: Spider class to run; defaults to GenericLeadSpider
+            **spider_kwargs: Passed to the spider (e.g. icp_criteria, target_selectors)
+
+        Returns:
+            A CrawlJob handle
+        """
+        if spider_cls is None:
+            from guild.src.core.scraping.advanced_scraper import GenericLeadSpider
+            spider_cls = GenericLeadSpider
+        job = CrawlJob(next(self._job_ids), spider_cls, list(urls), dict(spider_kwargs))
+        job._service = self
+        self._stats["submitted"] += 1
+        self._call(self._enqueue, job)
+        return job
+
+    def _enqueue(self, job: CrawlJob) -> None:
+        # Reactor thread only
+        self._pending.append(job)
+        self._start_pending()
+
+    def _start_pending(self) -> None:
+        # Reactor thread only
+        while self._pending and len(self._running) < self.max_concurrent_jobs:
+            job = self._pending.popleft()
+            try:
+                self._start_job(job)
+            except Exception as e:
+                logger.error(f"Crawl job {job.job_id} could not start: {e}")
+                self._complete(job, e)
+
+    def _cancel(self, job: CrawlJob) -> None:
+        # Reactor thread only
+        if job in self._pending:
+            self._pending.remove(job)
+            self._complete(job, None)
+            return
+        crawler = self._running.get(job.job_id)
+        if crawler is not None and crawler.engine is not None and crawler.spider is not None:
+            # The crawl deferred then fires and _complete releases the slot
+            crawler.engine.close_spider(crawler.spider, "cancelled")
+
+    def _start_job(self, job: CrawlJob) -> None:
+        from scrapy import signals
+
+        crawler = self._runner.create_crawler(job.spider_cls)
+
+        def on_item(item, response, spider):
+            job._add_item(dict(item))
+
+        crawler.signals.connect(on_item, signal=signals.item_scraped, weak=False)
+        job.status = "running"
+        job.started_at = time.time()
+        self._running[job.job_id] = crawler
+
+        deferred = self._runner.crawl(crawler, start_urls=job.urls, **job.spider_kwargs)
+        deferred.addCallbacks(
+            lambda _: self._complete(job, None),
+            lambda failure: self._complete(job, failure.value),
+        )
+
+    def _complete(self, job: CrawlJob, error: Optional[BaseException]) -> None:
+        # Reactor thread only
+        self._running.pop(job.job_id, None)
+        if job._cancelled:
+            self._stats["cancelled"] += 1
+        else:
+            self._stats["failed" if error else "completed"] += 1
+        self._stats["items"] += len(job.items)
+        job._finish(error)
+        logger.info(f"Crawl job {job.job_id} {job.status} with {len(job.items)} items")
+        self._start_pending()
+
+    def crawl(self, urls: List[str], timeout: Optional[float] = None, **spider_kwargs) -> List[Dict[str, Any]]:
+        """Submits a crawl and blocks until it finishes; returns the scraped items."""
+        return self.submit(urls, **spider_kwargs).result(timeout)
+
+    # ------------------------------------------------------------------
+    # Shutdown and stats
+    # ------------------------------------------------------------------
+
+    def stop(self) -> None:
+        """Stops running crawls and the reactor. The reactor cannot be restarted afterwards."""
+        if self._reactor is None or not self._reactor.running:
+            return
+        self._stopped = True
+
+        def shutdown():
+            deferred = self._runner.stop()
+            deferred.addBoth(lambda _: self._reactor.stop())
+
+        self._reactor.callFromThread(shutdown)
+        if self._thread:
+            self._thread.join(timeout=10)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running_jobs": len(self._running),
+            "queued_jobs": len(self._pending),
+            "reactor_running": bool(self._reactor is not None and self._reactor.running),
+            **self._stats,
+        }
+
+
+def default_scrapy_settings() -> Dict[str, Any]:
+    """Scrapy settings shared by every crawl job, from the application settings."""
+    return {
+        'ROBOTSTXT_OBEY': True,
+        'DOWNLOAD_DELAY': settings.CRAWL_DOWNLOAD_DELAY,
+        'RANDOMIZE_DOWNLOAD_DELAY': True,
+        'USER_AGENT': 'Guild-AI Scraper (+https://guild-ai.com/bot)',
+        'CONCURRENT_REQUESTS': settings.CRAWL_CONCURRENT_REQUESTS,
+        'CONCURRENT_REQUESTS_PER_DOMAIN': settings.CRAWL_CONCURRENT_REQUESTS_PER_DOMAIN,
+        'AUTOTHROTTLE_ENABLED': settings.CRAWL_AUTOTHROTTLE_ENABLED,
+        'AUTOTHROTTLE_START_DELAY': settings.CRAWL_AUTOTHROTTLE_START_DELAY,
+        'AUTOTHROTTLE_MAX_DELAY': settings.CRAWL_AUTOTHROTTLE_MAX_DELAY,
+        'AUTOTHROTTLE_TARGET_CONCURRENCY': settings.CRAWL_AUTOTHROTTLE_TARGET_CONCURRENCY,
+        'LOG_LEVEL': 'INFO',
+    }
+
+
+_service: Optional[CrawlService] = None
+_service_lock = threading.Lock()
+
+
+def get_crawl_service() -> CrawlService:
+    """Returns the process-wide crawl service, creating it on first use."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = CrawlService(
+                    scrapy_settings=default_scrapy_settings(),
+                    max_concurrent_jobs=settings.CRAWL_MAX_CONCURRENT_JOBS,
+                )
+                atexit.register(_service.stop)
+    return _service
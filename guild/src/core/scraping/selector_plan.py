@@ -0,0 +1,151 @@
+"""
+Compiled selector plans for lead extraction.
+
+GenericLeadSpider used to serialize every lead container back to HTML and
+re-parse it with BeautifulSoup's pure-Python parser before running seven CSS
+queries on it, so each page was parsed twice and every selector was translated
+again for every container. A SelectorPlan translates the spider's CSS selectors
+to XPath and compiles them with lxml once, when the spider is created; extraction
+then runs the compiled expressions directly on the lxml tree Scrapy already built
+for the response.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from lxml import etree
+from parsel.csstranslator import HTMLTranslator
+
+# Default selectors for common lead data
+DEFAULT_LEAD_SELECTORS = {
+    'name': 'h1, h2, h3, .name, .title, [class*="name"]',
+    'title': '.title, .position, .job-title, [class*="title"]',
+    'company': '.company, .organization, [class*="company"]',
+    'email': 'a[href^="mailto:"], .email, [class*="email"]',
+    'phone': 'a[href^="tel:"], .phone, [class*="phone"]',
+    'location': '.location, .address, [class*="location"]',
+    'description': '.description, .bio, .summary, [class*="description"]'
+}
+
+# Individual lead entries on a listing page
+DEFAULT_CONTAINER_SELECTOR = '.lead, .person, .contact, .profile, .result'
+
+DEFAULT_NEXT_PAGE_SELECTORS = [
+    'a[rel="next"]',
+    '.next',
+    '.pagination .next',
+    'a:contains("Next")',
+    'a:contains(">")'
+]
+
+# For email/phone fields, a matching link's href is used instead of its text
+HREF_PREFIXES = {'email': 'mailto:', 'phone': 'tel:'}
+
+# Text inside these elements is not visible page content
+_NON_TEXT_TAGS = frozenset({'script', 'style', 'template', 'noscript'})
+
+_translator = HTMLTranslator()
+_DESCENDANT_HREF = etree.XPath('descendant::a/@href')
+
+
+def compile_css(selector: str, from_self: bool = True) -> etree.XPath:
+    """
+    Translates a CSS selector to a compiled lxml XPath expression.
+
+    Args:
+        selector: CSS selector, optionally a comma-separated group
+        from_self: Whether the context element itself may match, as with
+            BeautifulSoup's select() on a parsed fragment
+
+    Returns:
+        The compiled expression; results are in document order
+    """
+    prefix = 'descendant-or-self::' if from_self else 'descendant::'
+    return etree.XPath(_translator.css_to_xpath(selector, prefix=prefix))
+
+
+def element_text(element: Any) -> str:
+    """Visible text of `element` with each text node stripped, like get_text(strip=True)."""
+    pieces: List[str] = []
+    _collect_text(element, pieces)
+    return ''.join(piece.strip() for piece in pieces if piece.strip())
+
+
+def _collect_text(node: Any, pieces: List[str]) -> None:
+    # Comments and processing instructions have a non-string tag
+    if not isinstance(node.tag, str) or node.tag in _NON_TEXT_TAGS:
+        return
+    if node.text:
+        pieces.append(node.text)
+    for child in node:
+        _collect_text(child, pieces)
+        if child.tail:
+            pieces.append(child.tail)
+
+
+class SelectorPlan:
+    """Compiled container, field and pagination selectors for one spider."""
+
+    def __init__(
+        self,
+        field_selectors: Optional[Dict[str, str]] = None,
+        container_selector: str = DEFAULT_CONTAINER_SELECTOR,
+        next_page_selectors: Optional[List[str]] = None,
+    ):
+        # Use custom selectors if provided, otherwise use defaults
+        self.field_selectors = {**DEFAULT_LEAD_SELECTORS, **(field_selectors or {})}
+        self.container_selector = container_selector
+        self.next_page_selectors = list(next_page_selectors or DEFAULT_NEXT_PAGE_SELECTORS)
+
+        self._containers = compile_css(container_selector, from_self=False)
+        self._fields: List[Tuple[str, etree.XPath, Optional[str]]] = [
+            (field, compile_css(selector), HREF_PREFIXES.get(field))
+            for field, selector in self.field_selectors.items()
+        ]
+        self._next_pages = [compile_css(selector, from_self=False) for selector in self.next_page_selectors]
+
+    def extract(self, root: Any, source_url: str) -> List[Dict[str, Any]]:
+        """
+        Extracts one lead per container; the whole page is one lead when there
+        are no containers.
+
+        Args:
+            root: lxml root element of the page (e.g. `response.selector.root`)
+            source_url: URL recorded on every lead
+
+        Returns:
+            List of lead dictionaries
+        """
+        containers = self._containers(root) or [root]
+        leads = []
+        for container in containers:
+            lead_data = self.extract_fields(container)
+            # Add source URL
+            lead_data['source_url'] = source_url
+            leads.append(lead_data)
+        return leads
+
+    def extract_fields(self, container: Any) -> Dict[str, Any]:
+        """Field values from the first element matching each field's selector."""
+        lead_data: Dict[str, Any] = {}
+        for field, xpath, href_prefix in self._fields:
+            elements = xpath(container)
+            if not elements:
+                continue
+            element = elements[0]
+            # Get text content from first matching element
+            lead_data[field] = element_text(element)
+            if href_prefix and element.tag == 'a':
+                href = element.get('href', '')
+                if href.startswith(href_prefix):
+                    lead_data[field] = href[len(href_prefix):]
+        return lead_data
+
+    def next_page(self, root: Any) -> Optional[str]:
+        """The href of the first pagination link found, if any."""
+        for xpath in self._next_pages:
+            for element in xpath(root):
+                # e.g. <li class="next"><a href="...">
+                href = element.get('href') or next(iter(_DESCENDANT_HREF(element)), None)
+                if href:
+                    return str(href)
+        return None
@@ -0,0 +1,49 @@
+"""
+Token streaming for agent runs.
+
+Agents call ``LlmClient.chat`` deep inside their helpers, so streaming is wired
+through a context variable rather than through every agent signature: while a
+token sink is set, ``LlmClient.chat`` streams from the provider and forwards
+each delta to the sink before returning the full text as usual.
+"""
+
+import asyncio
+import contextvars
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+# Receives partial LLM output for the agent run in the current context
+token_sink: contextvars.ContextVar[Optional[Callable[[str], None]]] = contextvars.ContextVar("token_sink", default=None)
+
+_DONE = object()
+
+
+async def stream_agent_run(run: Callable[..., Awaitable[Any]], *args, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Streaming variant of an agent's ``run()``.
+
+    Yields ``{"type": "token", "delta": str}`` events while the agent is working
+    and a final ``{"type": "result", "output": ...}`` event with the value
+    ``run()`` returned. Exceptions raised by the agent propagate to the caller.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def runner() -> Any:
+        # The task runs in a copy of the caller's context, so the sink is
+        # visible only to this agent run.
+        token_sink.set(queue.put_nowait)
+        try:
+            return await run(*args, **kwargs)
+        finally:
+            queue.put_nowait(_DONE)
+
+    task = asyncio.create_task(runner())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            yield {"type": "token", "delta": item}
+        yield {"type": "result", "output": task.result()}
+    finally:
+        if not task.done():
+            task.cancel()
@@ -12,7 +12,9 @@ except ImportError:
 from guild.src.core import vector_store
 from guild.src.core.enhanced_rag_pipeline import get_enhanced_rag_pipeline
 
-def rag_search(query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+def rag_search(
+    query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None, hybrid: bool = False
+) -> List[Dict[str, Any]]:
     """
     Performs a RAG search using the enhanced RAG pipeline with MarkItDown integration.
     
@@ -20,6 +22,7 @@ def rag_search(query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = N
         query: Search query.
         top_k: Number of top results to return.
         filters: Optional filters for the search results.
+        hybrid: Combine keyword and vector relevance.
     
     Returns:
         List of search results with source provenance.
@@ -27,7 +30,7 @@ def rag_search(query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = N
     try:
         # Use the enhanced RAG pipeline for better search capabilities
         pipeline = get_enhanced_rag_pipeline()
-        search_hits = pipeline.search(query=query, top_k=top_k, filters=filters)
+        search_hits = pipeline.search(query=query, top_k=top_k, filters=filters, hybrid=hybrid)
         
         # Format the results into the application's expected format
         results = []
@@ -1,22 +1,67 @@
 import qdrant_client
-from sentence_transformers import SentenceTransformer
-from typing import List, Dict, Any
+from collections import Counter
+from typing import List, Dict, Any, Iterable, Optional
+import logging
+import math
+import re
+import threading
 import uuid
 
+from .config import settings
+from .embedding_service import get_embedding_service
+from .embedding_cache import content_hash, embed_with_cache, get_embedding_cache
+
 # --- Qdrant Client and Model Setup ---
 
 # This could be configured via guild.src.core.config.py as well
 QDRANT_HOST = "qdrant"
 QDRANT_PORT = 6333
 COLLECTION_NAME = "guild_docs"
-EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+EMBEDDING_MODEL = settings.EMBEDDING_MODEL
+
+# Payload fields that searches filter on; each gets a keyword index
+INDEXED_PAYLOAD_FIELDS = ["document_id", "provider", "data_room_id", "original_format"]
+
+logger = logging.getLogger(__name__)
+
+# The embedding model is loaded lazily by the shared, micro-batching service
+embedding_service = get_embedding_service()
 
-# Initialize the embedding model once
-embedding_model = SentenceTransformer(EMBEDDING_MODEL)
+# Set once this process has made sure the payload indexes exist
+_payload_indexes_ready = False
+_payload_indexes_lock = threading.Lock()
 
 def get_qdrant_client():
-    """Returns an instance of the Qdrant client."""
-    return qdrant_client.QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+    """
+    Returns an instance of the Qdrant client.
+
+    The first call in a process that finds the collection also creates its
+    payload indexes, so filtered and hybrid search are indexed without
+    relying on initialize_vector_store having been run.
+    """
+    client = qdrant_client.QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+    _ensure_payload_indexes_once(client)
+    return client
+
+def _ensure_payload_indexes_once(client) -> None:
+    global _payload_indexes_ready
+    if _payload_indexes_ready:
+        return
+    with _payload_indexes_lock:
+        if _payload_indexes_ready:
+            return
+        try:
+            client.get_collection(collection_name=COLLECTION_NAME)
+        except Exception:
+            # No collection yet; initialize_vector_store creates the indexes with it
+            return
+        try:
+            ensure_payload_indexes(client)
+        except Exception as e:
+            # Retried on the next client; searches still work, just unindexed
+            logger.warning(f"Could not create payload indexes on '{COLLECTION_NAME}': {e}")
+            return
+        _payload_indexes_ready = True
 
 def initialize_vector_store():
     """
@@ -31,12 +76,39 @@ def initialize_vector_store():
         client.recreate_collection(
             collection_name=COLLECTION_NAME,
             vectors_config=qdrant_client.models.VectorParams(
-                size=embedding_model.get_sentence_embedding_dimension(),
+                size=embedding_service.dimension,
                 distance=qdrant_client.models.Distance.COSINE,
             ),
         )
         print(f"Collection '{COLLECTION_NAME}' created successfully.")
 
+    ensure_payload_indexes(client)
+
+def ensure_payload_indexes(client=None):
+    """
+    Creates the payload indexes used by filtered and hybrid search.
+
+    Keyword indexes on the filterable fields let Qdrant apply filters during the
+    vector search instead of after it; the full-text index on chunk_text serves
+    keyword candidates for hybrid search. Creating an existing index is a no-op.
+    """
+    client = client or qdrant_client.QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+    for field_name in INDEXED_PAYLOAD_FIELDS:
+        client.create_payload_index(
+            collection_name=COLLECTION_NAME,
+            field_name=field_name,
+            field_schema=qdrant_client.models.PayloadSchemaType.KEYWORD,
+        )
+    client.create_payload_index(
+        collection_name=COLLECTION_NAME,
+        field_name="chunk_text",
+        field_schema=qdrant_client.models.TextIndexParams(
+            type=qdrant_client.models.TextIndexType.TEXT,
+            tokenizer=qdrant_client.models.TokenizerType.WORD,
+            lowercase=True,
+        ),
+    )
+
 
 # --- Indexing Logic ---
 
@@ -55,54 +127,320 @@ def index_chunks(document_id: str, text_chunks: List[str], metadata: Dict[str, A
         print(f"No text chunks to index for document {document_id}.")
         return
 
-    # Create embeddings for each chunk
-    vectors = embedding_model.encode(text_chunks, show_progress_bar=False)
+    # Create embeddings for each chunk, reusing vectors for unchanged chunk content
+    vectors = embed_with_cache(text_chunks, embedding_service, get_embedding_cache(embedding_service))
 
     # Prepare points for Qdrant
+    points = build_points(document_id, text_chunks, vectors, metadata)
+
+    # Upsert points into the collection
+    client.upsert(
+        collection_name=COLLECTION_NAME,
+        points=points,
+        wait=True
+    )
+    print(f"Indexed {len(points)} chunks for document {document_id}.")
+
+def index_chunk_stream(
+    document_id: str,
+    text_chunks: Iterable[str],
+    metadata: Dict[str, Any],
+    window_size: int = settings.INGEST_STREAM_WINDOW,
+) -> int:
+    """
+    Embeds and upserts chunks from an iterator in fixed-size windows.
+
+    Only one window of chunks and vectors is held at a time, so memory stays
+    flat regardless of document size. The final chunk count is written to every
+    point of the document once the stream is exhausted.
+
+    Args:
+        document_id: A unique identifier for the source document.
+        text_chunks: Chunks in document order, typically from chunking.iter_chunks.
+        metadata: A dictionary of metadata to store with the vectors.
+        window_size: Chunks embedded and upserted per request.
+
+    Returns:
+        The number of chunks indexed.
+    """
+    client = get_qdrant_client()
+    cache = get_embedding_cache(embedding_service)
+    total = 0
+    window: List[str] = []
+
+    def flush():
+        nonlocal total
+        if not window:
+            return
+        vectors = embed_with_cache(window, embedding_service, cache)
+        client.upsert(
+            collection_name=COLLECTION_NAME,
+            points=build_points(document_id, window, vectors, metadata),
+            wait=True
+        )
+        total += len(window)
+        window.clear()
+
+    for chunk in text_chunks:
+        window.append(chunk)
+        if len(window) >= window_size:
+            flush()
+    flush()
+
+    if total:
+        client.set_payload(
+            collection_name=COLLECTION_NAME,
+            payload={"chunk_count": total},
+            points=document_filter(document_id),
+            wait=True
+        )
+    print(f"Indexed {total} chunks for document {document_id}.")
+    return total
+
+def build_points(document_id: str, text_chunks: List[str], vectors, metadata: Dict[str, Any]) -> List[qdrant_client.models.PointStruct]:
+    """
+    Builds Qdrant points for a document's chunks and their vectors.
+
+    Point IDs derive from the chunk content, so re-indexing a document overwrites
+    its points in place instead of duplicating them.
+    """
     points = []
-    for i, chunk in enumerate(chunks):
+    for i, chunk in enumerate(text_chunks):
+        chunk_hash = content_hash(chunk)
         points.append(qdrant_client.models.PointStruct(
-            id=str(uuid.uuid4()),
+            id=chunk_point_id(document_id, chunk_hash),
             vector=vectors[i].tolist(),
             payload={
                 "document_id": document_id,
                 "chunk_text": chunk,
+                "chunk_hash": chunk_hash,
                 **metadata
             }
         ))
+    return points
 
-    # Upsert points into the collection
-    client.upsert(
+def upsert_points(points: List[qdrant_client.models.PointStruct], wait: bool = True):
+    """Upserts prepared points (possibly from several documents) in one request."""
+    if points:
+        get_qdrant_client().upsert(collection_name=COLLECTION_NAME, points=points, wait=wait)
+
+
+# --- Incremental Indexing ---
+
+def document_filter(document_id: str) -> qdrant_client.models.Filter:
+    """Payload filter matching every point of one document."""
+    return qdrant_client.models.Filter(must=[
+        qdrant_client.models.FieldCondition(
+            key="document_id", match=qdrant_client.models.MatchValue(value=document_id)
+        )
+    ])
+
+def chunk_point_id(document_id: str, chunk_hash: str) -> str:
+    """Deterministic point ID, so an unchanged chunk always maps to the same point."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{document_id}:{chunk_hash}"))
+
+def delete_document(document_id: str):
+    """Removes every indexed chunk of a document from Qdrant."""
+    client = get_qdrant_client()
+    client.delete(
         collection_name=COLLECTION_NAME,
-        points=points,
+        points_selector=qdrant_client.models.FilterSelector(filter=document_filter(document_id)),
         wait=True
     )
-    print(f"Indexed {len(points)} chunks for document {document_id}.")
+    print(f"Deleted all chunks for document {document_id}.")
+
+def get_document_chunk_hashes(document_id: str) -> List[str]:
+    """Reads the chunk hashes currently stored for a document (used when no manifest exists)."""
+    client = get_qdrant_client()
+    hashes = []
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=COLLECTION_NAME,
+            scroll_filter=document_filter(document_id),
+            limit=256,
+            offset=offset,
+            with_payload=["chunk_hash"],
+            with_vectors=False,
+        )
+        hashes.extend(p.payload["chunk_hash"] for p in points if p.payload and p.payload.get("chunk_hash"))
+        if offset is None:
+            return hashes
+
+def upsert_document_chunks(
+    document_id: str,
+    text_chunks: List[str],
+    metadata: Dict[str, Any],
+    previous_hashes: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Brings a document's indexed chunks in line with `text_chunks`, touching only the delta.
+
+    Chunks whose content hash was already indexed are left in place (their
+    document-level metadata is refreshed), new chunks are embedded and upserted,
+    and chunks that disappeared are deleted.
+
+    Args:
+        document_id: A unique identifier for the source document.
+        text_chunks: The document's current chunks.
+        metadata: A dictionary of metadata to store with the vectors.
+        previous_hashes: Chunk hashes indexed last time (from a manifest). Read
+                         from Qdrant when not given.
+
+    Returns:
+        The document's chunk hashes (its new manifest) and upserted/deleted/unchanged counts.
+    """
+    client = get_qdrant_client()
+
+    current = {}
+    for chunk in text_chunks:
+        current.setdefault(content_hash(chunk), chunk)
+    previous = set(get_document_chunk_hashes(document_id) if previous_hashes is None else previous_hashes)
+
+    new_hashes = [h for h in current if h not in previous]
+    stale_hashes = [h for h in previous if h not in current]
+
+    if new_hashes:
+        new_chunks = [current[h] for h in new_hashes]
+        vectors = embed_with_cache(new_chunks, embedding_service, get_embedding_cache(embedding_service))
+        client.upsert(
+            collection_name=COLLECTION_NAME,
+            points=[
+                qdrant_client.models.PointStruct(
+                    id=chunk_point_id(document_id, h),
+                    vector=vectors[i].tolist(),
+                    payload={
+                        "document_id": document_id,
+                        "chunk_text": current[h],
+                        "chunk_hash": h,
+                        **metadata
+                    }
+                )
+                for i, h in enumerate(new_hashes)
+            ],
+            wait=True
+        )
+
+    if stale_hashes:
+        client.delete(
+            collection_name=COLLECTION_NAME,
+            points_selector=qdrant_client.models.PointIdsList(
+                points=[chunk_point_id(document_id, h) for h in stale_hashes]
+            ),
+            wait=True
+        )
+
+    unchanged = len(current) - len(new_hashes)
+    if unchanged and metadata:
+        client.set_payload(
+            collection_name=COLLECTION_NAME,
+            payload=metadata,
+            points=document_filter(document_id),
+            wait=True
+        )
+
+    print(f"Synced document {document_id}: {len(new_hashes)} upserted, {len(stale_hashes)} deleted, {unchanged} unchanged.")
+    return {
+        "chunk_hashes": list(current),
+        "upserted": len(new_hashes),
+        "deleted": len(stale_hashes),
+        "unchanged": unchanged,
+    }
+
+
+# --- Search Logic ---
+
+def build_payload_filter(filters: Optional[Dict[str, Any]]) -> Optional[qdrant_client.models.Filter]:
+    """
+    Translates `{field: value}` filters into a Qdrant payload filter.
 
+    A list value matches any of its elements; every field must match.
+    """
+    if not filters:
+        return None
+    conditions = []
+    for field_name, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            match = qdrant_client.models.MatchAny(any=list(value))
+        else:
+            match = qdrant_client.models.MatchValue(value=value)
+        conditions.append(qdrant_client.models.FieldCondition(key=field_name, match=match))
+    return qdrant_client.models.Filter(must=conditions)
+
+def _tokenize(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())
 
-# --- Search Logic (to be implemented next) ---
+def _bm25_scores(query_terms: List[str], documents: List[str], k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """BM25 of each document against the query, with IDF taken over `documents`."""
+    tokenized = [_tokenize(doc) for doc in documents]
+    if not tokenized:
+        return []
+    avg_length = sum(len(tokens) for tokens in tokenized) / len(tokenized) or 1.0
+    document_frequency = Counter(term for tokens in tokenized for term in set(tokens))
+    n = len(tokenized)
+    scores = []
+    for tokens in tokenized:
+        frequencies = Counter(tokens)
+        score = 0.0
+        for term in set(query_terms):
+            tf = frequencies.get(term)
+            if not tf:
+                continue
+            idf = math.log(1 + (n - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+            score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(tokens) / avg_length))
+        scores.append(score)
+    return scores
 
-def search(query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+def _normalize(scores: List[float]) -> List[float]:
+    low, high = min(scores, default=0.0), max(scores, default=0.0)
+    if high == low:
+        return [1.0 if high > 0 else 0.0 for _ in scores]
+    return [(score - low) / (high - low) for score in scores]
+
+def search(
+    query: str,
+    top_k: int = 5,
+    filters: Optional[Dict[str, Any]] = None,
+    hybrid: bool = False,
+    alpha: float = settings.HYBRID_SEARCH_ALPHA,
+) -> List[Dict[str, Any]]:
     """
     Performs a similarity search in the vector store for a given query.
 
+    Filters are applied by Qdrant during the search, so a filtered query still
+    returns up to `top_k` matching results. In hybrid mode, a larger candidate
+    pool from dense search and from the chunk_text full-text index is re-ranked
+    by `alpha * dense + (1 - alpha) * bm25`, both min-max normalized.
+
+    The keyword leg is a full-text match, which Qdrant does not rank: when more
+    chunks contain a query term than the candidate pool holds, an arbitrary
+    subset of them is fetched. BM25 ranks the fused pool, not the collection, so
+    hybrid mode can only promote keyword matches that made it into the pool.
+
     Args:
         query: The search query string.
         top_k: The number of top results to return.
+        filters: Optional `{payload_field: value or [values]}` filters.
+        hybrid: Fuse keyword (BM25) relevance with the dense score.
+        alpha: Weight of the dense score in hybrid mode.
 
     Returns:
-        A list of search results, each containing the payload and score.
+        A list of search results, each containing the point id, payload and score.
     """
     client = get_qdrant_client()
+    payload_filter = build_payload_filter(filters)
 
     # Create an embedding for the query
-    query_vector = embedding_model.encode(query).tolist()
+    query_vector = embedding_service.encode_one(query).tolist()
+
+    limit = top_k * settings.HYBRID_SEARCH_CANDIDATE_MULTIPLIER if hybrid else top_k
 
     # Perform the search
     search_results = client.search(
         collection_name=COLLECTION_NAME,
         query_vector=query_vector,
-        limit=top_k,
+        query_filter=payload_filter,
+        limit=limit,
         with_payload=True,  # Include the payload in the results
     )
 
@@ -110,8 +448,53 @@ def search(query: str, top_k: int = 5) -> List[Dict[str, Any]]:
     results = []
     for hit in search_results:
         results.append({
+            "id": str(hit.id),
             "score": hit.score,
             "payload": hit.payload,
         })
 
-    return results
+    if not hybrid:
+        return results
+
+    query_terms = _tokenize(query)
+    if not query_terms:
+        return results[:top_k]
+
+    # Keyword candidates the dense search may have missed. Scroll returns matches
+    # in point-ID order, not by relevance, so this is capped at the pool size.
+    keyword_filter = qdrant_client.models.Filter(
+        must=payload_filter.must if payload_filter else None,
+        should=[
+            qdrant_client.models.FieldCondition(
+                key="chunk_text", match=qdrant_client.models.MatchText(text=term)
+            )
+            for term in dict.fromkeys(query_terms)
+        ],
+    )
+    keyword_points, _ = client.scroll(
+        collection_name=COLLECTION_NAME,
+        scroll_filter=keyword_filter,
+        limit=limit,
+        with_payload=True,
+        with_vectors=True,
+    )
+    seen = {result["id"] for result in results}
+    query_norm = math.sqrt(sum(x * x for x in query_vector)) or 1.0
+    for point in keyword_points:
+        if str(point.id) in seen:
+            continue
+        # The collection uses cosine distance, so the dense score is recomputable from the stored vector
+        vector = point.vector or []
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        score = sum(a * b for a, b in zip(query_vector, vector)) / (query_norm * norm)
+        results.append({"id": str(point.id), "score": score, "payload": point.payload})
+
+    dense = _normalize([result["score"] for result in results])
+    keyword = _normalize(_bm25_scores(query_terms, [(result["payload"] or {}).get("chunk_text", "") for result in results]))
+    for result, dense_score, keyword_score in zip(results, dense, keyword):
+        result["dense_score"] = result["score"]
+        result["keyword_score"] = keyword_score
+        result["score"] = alpha * dense_score + (1 - alpha) * keyword_score
+
+    results.sort(key=lambda result: result["score"], reverse=True)
+    return results[:top_k]
@@ -0,0 +1,464 @@
+"""
+Execution Store
+
+Storage for workflow executions. Without a backend every execution stays in
+memory, as a plain dict would keep it. With a SQLite or JSONL backend, active
+and recently finished executions stay in an in-memory ring buffer, finished
+executions beyond its capacity are spilled to the backend, and records are
+evicted by age and count. Large output values
+(bytes, long strings such as screenshots or page dumps) are written once to a
+content-addressed blob directory and replaced by a reference.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from dataclasses import asdict, fields
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from .workflow_canvas import WorkflowExecution
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+
+class BlobStore:
+    """Content-addressed files for large execution outputs."""
+
+    def __init__(self, directory: str, threshold_bytes: int = 64 * 1024):
+        self.directory = os.path.expanduser(directory)
+        self.threshold_bytes = threshold_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return digest
+
+    def get(self, ref: Dict[str, Any]) -> Any:
+        """Load the value behind a blob reference."""
+        with open(self._path(ref["$blob"]), "rb") as f:
+            data = f.read()
+        return data.decode("utf-8") if ref.get("kind") == "str" else data
+
+    def externalize(self, value: Any) -> Any:
+        """
+        Replace large bytes/str values inside `value` with blob references.
+        Existing references are left alone, so externalizing twice is a no-op.
+        """
+        if isinstance(value, (bytes, bytearray)):
+            return self._ref(bytes(value), "bytes")
+        if isinstance(value, str) and len(value) >= self.threshold_bytes:
+            return self._ref(value.encode("utf-8"), "str")
+        if is_blob_ref(value):
+            return value
+        if isinstance(value, dict):
+            return {key: self.externalize(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.externalize(item) for item in value]
+        return value
+
+    def resolve(self, value: Any) -> Any:
+        """Inverse of `externalize`: load every blob reference inside `value`."""
+        if is_blob_ref(value):
+            return self.get(value)
+        if isinstance(value, dict):
+            return {key: self.resolve(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(item) for item in value]
+        return value
+
+    def _ref(self, data: bytes, kind: str) -> Dict[str, Any]:
+        return {"$blob": self.put(data), "kind": kind, "size": len(data)}
+
+
+def is_blob_ref(value: Any) -> bool:
+    return isinstance(value, dict) and isinstance(value.get("$blob"), str) and "kind" in value
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, (bytes, bytearray)):
+        # Only reached without a blob store; keep the record JSON-safe
+        logger.warning(f"Dropping {len(value)} bytes from a stored execution; configure a BlobStore to keep them")
+        return {"$bytes_omitted": len(value)}
+    return str(value)
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1 and "$dt" in obj:
+        return datetime.fromisoformat(obj["$dt"])
+    return obj
+
+
+def serialize_execution(execution: WorkflowExecution) -> str:
+    return json.dumps(asdict(execution), default=_encode)
+
+
+def deserialize_execution(data: str) -> WorkflowExecution:
+    record = json.loads(data, object_hook=_decode)
+    known = {f.name for f in fields(WorkflowExecution)}
+    return WorkflowExecution(**{key: value for key, value in record.items() if key in known})
+
+
+def _end_timestamp(execution: WorkflowExecution) -> float:
+    return (execution.end_time or execution.start_time or datetime.now()).timestamp()
+
+
+class SQLiteExecutionBackend:
+    """Finished executions in a SQLite table."""
+
+    def __init__(self, path: str):
+        path = os.path.expanduser(path)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS executions ("
+            "execution_id TEXT PRIMARY KEY, workflow_id TEXT, status TEXT, ended_at REAL, data TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS executions_ended_at ON executions (ended_at)")
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    def put(self, execution: WorkflowExecution):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO executions (execution_id, workflow_id, status, ended_at, data) VALUES (?, ?, ?, ?, ?)",
+                (execution.execution_id, execution.workflow_id, execution.status,
+                 _end_timestamp(execution), serialize_execution(execution)),
+            )
+            self._db.commit()
+
+    def get(self, execution_id: str) -> Optional[WorkflowExecution]:
+        with self._lock:
+            row = self._db.execute("SELECT data FROM executions WHERE execution_id = ?", (execution_id,)).fetchone()
+        return deserialize_execution(row[0]) if row else None
+
+    def contains(self, execution_id: str) -> bool:
+        with self._lock:
+            row = self._db.execute("SELECT 1 FROM executions WHERE execution_id = ?", (execution_id,)).fetchone()
+        return row is not None
+
+    def delete(self, execution_id: str) -> bool:
+        with self._lock:
+            deleted = self._db.execute("DELETE FROM executions WHERE execution_id = ?", (execution_id,)).rowcount
+            self._db.commit()
+        return bool(deleted)
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT execution_id FROM executions ORDER BY ended_at")]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM executions").fetchone()[0]
+
+    def evict(self, older_than: Optional[float] = None, max_entries: Optional[int] = None) -> int:
+        """Delete records that ended before `older_than` and all but the newest `max_entries`."""
+        with self._lock:
+            removed = 0
+            if older_than is not None:
+                removed += self._db.execute("DELETE FROM executions WHERE ended_at < ?", (older_than,)).rowcount
+            if max_entries is not None:
+                removed += self._db.execute(
+                    "DELETE FROM executions WHERE execution_id NOT IN "
+                    "(SELECT execution_id FROM executions ORDER BY ended_at DESC LIMIT ?)",
+                    (max_entries,),
+                ).rowcount
+            self._db.commit()
+        return removed
+
+
+class JsonlExecutionBackend:
+    """
+    Finished executions appended to a JSONL file.
+
+    An in-memory offset index serves lookups; deletions are appended as
+    tombstones and the file is rewritten once dead lines outnumber live ones.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        # execution_id -> (byte offset, ended_at)
+        self._index: Dict[str, tuple] = {}
+        self._dead_lines = 0
+        self._load_index()
+
+    def _load_index(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                entry = json.loads(line)
+                if entry["execution_id"] in self._index:
+                    self._dead_lines += 1
+                if entry.get("deleted"):
+                    self._index.pop(entry["execution_id"], None)
+                    self._dead_lines += 1
+                else:
+                    self._index[entry["execution_id"]] = (offset, entry["ended_at"])
+                offset += len(line)
+
+    def _append(self, entry: Dict[str, Any]) -> int:
+        with open(self.path, "ab") as f:
+            offset = f.tell()
+            f.write(json.dumps(entry).encode("utf-8") + b"\n")
+        return offset
+
+    def put(self, execution: WorkflowExecution):
+        with self._lock:
+            if execution.execution_id in self._index:
+                self._dead_lines += 1
+            ended_at = _end_timestamp(execution)
+            offset = self._append({
+                "execution_id": execution.execution_id,
+                "ended_at": ended_at,
+                "data": serialize_execution(execution),
+            })
+            self._index[execution.execution_id] = (offset, ended_at)
+
+    def get(self, execution_id: str) -> Optional[WorkflowExecution]:
+        with self._lock:
+            location = self._index.get(execution_id)
+            if location is None:
+                return None
+            with open(self.path, "rb") as f:
+                f.seek(location[0])
+                entry = json.loads(f.readline())
+        return deserialize_execution(entry["data"])
+
+    def contains(self, execution_id: str) -> bool:
+        with self._lock:
+            return execution_id in self._index
+
+    def delete(self, execution_id: str) -> bool:
+        with self._lock:
+            return self._delete_locked(execution_id)
+
+    def _delete_locked(self, execution_id: str) -> bool:
+        if self._index.pop(execution_id, None) is None:
+            return False
+        self._append({"execution_id": execution_id, "deleted": True})
+        self._dead_lines += 2
+        return True
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            return sorted(self._index, key=lambda execution_id: self._index[execution_id][1])
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def evict(self, older_than: Optional[float] = None, max_entries: Optional[int] = None) -> int:
+        """Delete records that ended before `older_than` and all but the newest `max_entries`."""
+        with self._lock:
+            by_age = sorted(self._index, key=lambda execution_id: self._index[execution_id][1])
+            doomed = [execution_id for execution_id in by_age if older_than is not None and self._index[execution_id][1] < older_than]
+            if max_entries is not None and len(by_age) - len(doomed) > max_entries:
+                survivors = by_age[len(doomed):]
+                doomed += survivors[:len(survivors) - max_entries]
+            for execution_id in doomed:
+                self._delete_locked(execution_id)
+            if self._dead_lines > max(len(self._index), 64):
+                self._rewrite_locked()
+        return len(doomed)
+
+    def _rewrite_locked(self):
+        """Rewrite the file with only live records."""
+        tmp_path = f"{self.path}.tmp"
+        index = {}
+        with open(self.path, "rb") as src, open(tmp_path, "wb") as dst:
+            for execution_id, (offset, ended_at) in self._index.items():
+                src.seek(offset)
+                index[execution_id] = (dst.tell(), ended_at)
+                dst.write(src.readline())
+        os.replace(tmp_path, self.path)
+        self._index = index
+        self._dead_lines = 0
+
+
+class ExecutionStore(MutableMapping):
+    """
+    Dict-like store of workflow executions.
+
+    Memory is bounded only when a backend is configured: without one nothing is
+    spilled or evicted automatically, and `compact()` is the only way to drop
+    old executions.
+
+    Args:
+        max_hot: Executions kept in memory; the oldest finished ones beyond this are spilled
+        backend: Optional SQLiteExecutionBackend/JsonlExecutionBackend for spilled executions
+        blob_store: Optional BlobStore for large output values of finished executions
+        max_age_hours: Finished executions older than this are evicted
+        max_spilled: Maximum executions kept by the backend
+        compact_interval_seconds: Minimum time between automatic age-based compactions
+    """
+
+    def __init__(
+        self,
+        max_hot: int = 256,
+        backend=None,
+        blob_store: Optional[BlobStore] = None,
+        max_age_hours: Optional[float] = 24,
+        max_spilled: Optional[int] = 10000,
+        compact_interval_seconds: float = 60.0,
+    ):
+        self.max_hot = max_hot
+        self.backend = backend
+        self.blob_store = blob_store
+        self.max_age_hours = max_age_hours
+        self.max_spilled = max_spilled
+        self.compact_interval_seconds = compact_interval_seconds
+        self._hot: "OrderedDict[str, WorkflowExecution]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._last_compaction = time.monotonic()
+        self.stats = {"spilled": 0, "evicted": 0, "loaded": 0}
+        if backend is not None and blob_store is None:
+            logger.warning("ExecutionStore has a backend but no blob store; bytes outputs will be dropped when spilled")
+
+    def __getitem__(self, execution_id: str) -> WorkflowExecution:
+        with self._lock:
+            execution = self._hot.get(execution_id)
+        if execution is not None:
+            return execution
+        if self.backend is not None:
+            execution = self.backend.get(execution_id)
+            if execution is not None:
+                self.stats["loaded"] += 1
+                return execution
+        raise KeyError(execution_id)
+
+    def __setitem__(self, execution_id: str, execution: WorkflowExecution):
+        # Capacity is enforced in finish(): only finished executions can be
+        # spilled, and spilling does I/O the caller may not want inline
+        with self._lock:
+            self._hot[execution_id] = execution
+            self._hot.move_to_end(execution_id)
+
+    def __delitem__(self, execution_id: str):
+        with self._lock:
+            found = self._hot.pop(execution_id, None) is not None
+        if self.backend is not None and self.backend.delete(execution_id):
+            found = True
+        if not found:
+            raise KeyError(execution_id)
+
+    def __contains__(self, execution_id: object) -> bool:
+        with self._lock:
+            if execution_id in self._hot:
+                return True
+        return self.backend is not None and self.backend.contains(execution_id)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            hot_ids = list(self._hot)
+        spilled = [execution_id for execution_id in self.backend.ids() if execution_id not in self._hot] if self.backend else []
+        return iter(spilled + hot_ids)
+
+    def __len__(self) -> int:
+        with self._lock:
+            hot = len(self._hot)
+        return hot + (len(self.backend) if self.backend is not None else 0)
+
+    def hot_ids(self) -> List[str]:
+        """IDs of the executions currently held in memory."""
+        with self._lock:
+            return list(self._hot)
+
+    def finish(self, execution_id: str):
+        """
+        Compact a finished execution: move large outputs to the blob store, then
+        enforce the memory bound and run age-based eviction if it is due. May
+        block on backend I/O, so async callers should run it in a thread.
+        """
+        with self._lock:
+            execution = self._hot.get(execution_id)
+        if execution is not None and self.blob_store is not None:
+            execution.outputs = self.blob_store.externalize(execution.outputs)
+            execution.execution_log = self.blob_store.externalize(execution.execution_log)
+        if self.backend is None:
+            return
+        self._enforce_capacity()
+        if time.monotonic() - self._last_compaction >= self.compact_interval_seconds:
+            self.compact()
+
+    def _enforce_capacity(self):
+        while True:
+            with self._lock:
+                if len(self._hot) <= self.max_hot:
+                    return
+                # Oldest finished execution; active ones are never spilled
+                victim = next(
+                    (execution for execution in self._hot.values() if execution.status in TERMINAL_STATUSES),
+                    None,
+                )
+                if victim is None:
+                    return
+                del self._hot[victim.execution_id]
+            self._spill(victim)
+
+    def _spill(self, execution: WorkflowExecution):
+        if self.blob_store is not None:
+            execution.outputs = self.blob_store.externalize(execution.outputs)
+            execution.execution_log = self.blob_store.externalize(execution.execution_log)
+        try:
+            self.backend.put(execution)
+            self.stats["spilled"] += 1
+            if self.max_spilled is not None and len(self.backend) > self.max_spilled:
+                self.stats["evicted"] += self.backend.evict(max_entries=self.max_spilled)
+        except Exception as e:
+            logger.error(f"Failed to spill execution {execution.execution_id}: {e}")
+            self.stats["evicted"] += 1
+
+    def compact(self, max_age_hours: Optional[float] = None) -> int:
+        """Evict finished executions older than `max_age_hours` (default: the store's setting)."""
+        self._last_compaction = time.monotonic()
+        max_age_hours = self.max_age_hours if max_age_hours is None else max_age_hours
+        cutoff = time.time() - max_age_hours * 3600 if max_age_hours is not None else None
+        removed = 0
+        if cutoff is not None:
+            with self._lock:
+                expired = [
+                    execution_id for execution_id, execution in self._hot.items()
+                    if execution.status in TERMINAL_STATUSES and execution.end_time
+                    and execution.end_time.timestamp() < cutoff
+                ]
+                for execution_id in expired:
+                    del self._hot[execution_id]
+            removed += len(expired)
+        if self.backend is not None:
+            removed += self.backend.evict(older_than=cutoff, max_entries=self.max_spilled)
+        self.stats["evicted"] += removed
+        if removed:
+            logger.info(f"Evicted {removed} old workflow executions")
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hot = len(self._hot)
+        return {
+            **self.stats,
+            "hot": hot,
+            "spilled_stored": len(self.backend) if self.backend is not None else 0,
+        }
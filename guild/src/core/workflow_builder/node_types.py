@@ -10,8 +10,11 @@ This module defines the different types of nodes that can be used in workflows:
 
 import uuid
 import asyncio
+import hashlib
+import json
 import logging
-from typing import Dict, List, Any, Optional, Union
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Union
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 
@@ -97,6 +100,10 @@ class AgentNode(BaseNode):
                     def __init__(self, config):
                         self.config = config
                     
+                    def reset(self):
+                        # Stateless between runs
+                        pass
+                    
                     async def run(self, context):
                         try:
                             result = generate_ad_copy(
@@ -122,6 +129,10 @@ class AgentNode(BaseNode):
                         self.agent_type = agent_type
                         self.config = config
                     
+                    def reset(self):
+                        # Stateless between runs
+                        pass
+                    
                     async def run(self, context):
                         return {"success": True, "agent_type": self.agent_type, "message": f"Generic agent {self.agent_type} executed"}
                 
@@ -132,6 +143,21 @@ class AgentNode(BaseNode):
             logger.error(f"Failed to initialize agent {self.agent_type}: {e}")
             self.error = f"Agent initialization failed: {e}"
     
+    @property
+    def reusable(self) -> bool:
+        """
+        Whether the node may be pooled: only agents that define `reset()` can
+        have their per-run state cleared, so any other agent is rebuilt for
+        every execution.
+        """
+        return self.agent is not None and callable(getattr(self.agent, "reset", None))
+    
+    def reset(self):
+        """Reset node state between executions, keeping the initialized agent."""
+        super().reset()
+        if self.reusable:
+            self.agent.reset()
+    
     async def execute(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Execute the AI agent."""
         if not self.agent:
@@ -499,3 +525,89 @@ def create_node(node_type: str, **kwargs) -> BaseNode:
         return OutputNode(node_id, name, kwargs.get("output_type"))
     else:
         raise ValueError(f"Unknown node type: {node_type}")
+
+
+class NodePool:
+    """
+    Pool of warm node instances for reuse across workflow executions.
+    
+    Nodes are keyed by (node_type, scope, hash of their config), so an idle
+    instance is only handed out for an identical node definition in the same
+    scope (the engine uses the workflow ID) and keeps its agent or visual tool.
+    Nodes are reset when returned; agent nodes whose agent cannot be reset are
+    never pooled. Each instance is used by one execution at a time.
+    """
+    
+    def __init__(self, max_idle_per_key: int = 4):
+        self.max_idle_per_key = max_idle_per_key
+        self._idle: Dict[Tuple[str, str, str], List[BaseNode]] = {}
+        self._keys: Dict[int, Tuple[str, str, str]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"created": 0, "reused": 0, "returned": 0, "discarded": 0}
+    
+    @staticmethod
+    def pool_key(node_type: str, config: Dict[str, Any], scope: str = "") -> Tuple[str, str, str]:
+        """Key of a node definition: its type, its scope and a hash of its configuration."""
+        encoded = json.dumps(config, sort_keys=True, default=str)
+        return node_type, scope, hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    
+    def acquire(self, node_type: str, node_id: str, name: str, scope: str = "", **config) -> BaseNode:
+        """Take an idle node matching the definition within `scope`, or create one."""
+        key = self.pool_key(node_type, config, scope)
+        with self._lock:
+            idle = self._idle.get(key)
+            node = idle.pop() if idle else None
+            self.stats["reused" if node else "created"] += 1
+        
+        if node is None:
+            node = create_node(node_type=node_type, node_id=node_id, name=name, **config)
+        else:
+            node.node_id = node_id
+            node.name = name
+        
+        with self._lock:
+            self._keys[id(node)] = key
+        return node
+    
+    def release(self, node: BaseNode):
+        """Reset a node and keep it for reuse, unless it is broken or the pool is full."""
+        with self._lock:
+            key = self._keys.pop(id(node), None)
+        if key is None:
+            return
+        
+        if isinstance(node, AgentNode) and not node.reusable:
+            with self._lock:
+                self.stats["discarded"] += 1
+            return
+        
+        try:
+            node.reset()
+        except Exception as e:
+            logger.warning(f"Discarding node {node.name} that failed to reset: {e}")
+            with self._lock:
+                self.stats["discarded"] += 1
+            return
+        
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_key:
+                idle.append(node)
+                self.stats["returned"] += 1
+            else:
+                self.stats["discarded"] += 1
+    
+    def discard(self, node: BaseNode):
+        """Forget a node that must not be reused, e.g. one whose execution raised."""
+        with self._lock:
+            if self._keys.pop(id(node), None) is not None:
+                self.stats["discarded"] += 1
+    
+    def clear(self):
+        """Drop all idle nodes."""
+        with self._lock:
+            self._idle.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "idle": sum(len(nodes) for nodes in self._idle.values()), "keys": len(self._idle)}
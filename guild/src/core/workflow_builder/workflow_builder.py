@@ -30,9 +30,14 @@ class VisualWorkflowBuilder:
     - Monitoring execution progress
     """
     
-    def __init__(self):
-        """Initialize the workflow builder."""
-        self.canvas = WorkflowCanvas()
+    def __init__(self, execution_store=None):
+        """
+        Initialize the workflow builder.
+        
+        Args:
+            execution_store: Optional ExecutionStore for execution history (e.g. with a SQLite backend)
+        """
+        self.canvas = WorkflowCanvas(execution_store)
         self.execution_engine = WorkflowExecutionEngine(self.canvas)
         
         # Available node templates
@@ -1140,6 +1145,18 @@ class VisualWorkflowBuilder:
         """
         return self.execution_engine.wait_for_completion(execution_id, timeout)
     
+    def subscribe_execution(self, execution_id: str):
+        """
+        Stream status updates of a workflow execution.
+        
+        Args:
+            execution_id: ID of the execution
+            
+        Returns:
+            Async iterator of execution statuses, ending when the execution finishes
+        """
+        return self.execution_engine.subscribe(execution_id)
+    
     def get_workflow(self, workflow_id: str) -> Optional[Dict[str, Any]]:
         """Get workflow by ID."""
         return self.canvas.get_workflow(workflow_id)
@@ -5,6 +5,7 @@ This module provides the canvas for building and managing visual workflows
 that combine AI agents with visual automation skills.
 """
 
+import os
 import uuid
 import asyncio
 import logging
@@ -12,6 +13,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field
 
+from guild.src.core.config import settings
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,6 +62,8 @@ class WorkflowExecution:
     inputs: Dict[str, Any] = field(default_factory=dict)
     outputs: Dict[str, Any] = field(default_factory=dict)
     error: Optional[str] = None
+    # One entry per started node: node_id, start_time, end_time, duration_seconds, status
+    node_timeline: List[Dict[str, Any]] = field(default_factory=list)
 
 
 class WorkflowCanvas:
@@ -67,12 +72,39 @@ class WorkflowCanvas:
     This is the heart of the visual workflow building system.
     """
     
-    def __init__(self):
-        """Initialize the workflow canvas."""
+    def __init__(self, execution_store=None):
+        """
+        Initialize the workflow canvas.
+        
+        Args:
+            execution_store: Store for workflow executions; defaults to one configured
+                from settings (SQLite-backed with a blob directory for large outputs if
+                WORKFLOW_EXECUTION_STORE_PATH is set, otherwise in-memory and unbounded)
+        """
+        # Imported here because the store module depends on WorkflowExecution
+        from .execution_store import BlobStore, ExecutionStore, SQLiteExecutionBackend
+        
+        if execution_store is None:
+            store_path = settings.WORKFLOW_EXECUTION_STORE_PATH
+            if store_path:
+                blob_dir = settings.WORKFLOW_EXECUTION_BLOB_DIR or os.path.join(
+                    os.path.dirname(os.path.expanduser(store_path)), "execution_blobs"
+                )
+                execution_store = ExecutionStore(
+                    max_hot=settings.WORKFLOW_EXECUTION_MAX_HOT,
+                    backend=SQLiteExecutionBackend(store_path),
+                    blob_store=BlobStore(blob_dir),
+                    max_age_hours=settings.WORKFLOW_EXECUTION_MAX_AGE_HOURS,
+                )
+            else:
+                execution_store = ExecutionStore()
+        
         self.workflows: Dict[str, Dict[str, Any]] = {}
-        self.executions: Dict[str, WorkflowExecution] = {}
+        self.executions: ExecutionStore = execution_store
         self.node_registry: Dict[str, Any] = {}
         self.connection_registry: Dict[str, WorkflowConnection] = {}
+        # Connection indexes per workflow, kept in sync by the add/remove methods
+        self.graph_indexes: Dict[str, Dict[str, Any]] = {}
         
         logger.info("WorkflowCanvas initialized successfully")
     
@@ -100,6 +132,7 @@ class WorkflowCanvas:
             "version": "1.0.0",
             "status": "draft"  # draft, active, archived
         }
+        self.graph_indexes[workflow_id] = self._empty_graph_index()
         
         logger.info(f"Created workflow: {name} (ID: {workflow_id})")
         return workflow_id
@@ -125,8 +158,11 @@ class WorkflowCanvas:
             return False
         
         # Add node to workflow
+        graph = self.graph_indexes[workflow_id]
         self.workflows[workflow_id]["nodes"][node.node_id] = node
         self.workflows[workflow_id]["modified_at"] = datetime.now()
+        graph["outgoing"].setdefault(node.node_id, {})
+        graph["incoming"].setdefault(node.node_id, {})
         
         # Register node globally
         self.node_registry[node.node_id] = node
@@ -162,10 +198,19 @@ class WorkflowCanvas:
             del self.node_registry[node_id]
         
         # Remove connections involving this node
-        workflow["connections"] = [
-            conn for conn in workflow["connections"]
-            if conn.source_node_id != node_id and conn.target_node_id != node_id
+        graph = self.graph_indexes[workflow_id]
+        removed = [
+            *graph["outgoing"].pop(node_id, {}).values(),
+            *graph["incoming"].pop(node_id, {}).values()
         ]
+        for conn in removed:
+            self._unindex_connection(graph, conn)
+        removed_ids = {conn.connection_id for conn in removed}
+        if removed_ids:
+            workflow["connections"] = [
+                conn for conn in workflow["connections"]
+                if conn.connection_id not in removed_ids
+            ]
         
         logger.info(f"Removed node {node_id} from workflow {workflow_id}")
         return True
@@ -187,13 +232,17 @@ class WorkflowCanvas:
         workflow = self.workflows[workflow_id]
         
         # Validate connection
-        if not self._validate_connection(connection, workflow):
+        graph = self.graph_indexes[workflow_id]
+        if not self._validate_connection(connection, workflow, graph):
             logger.error(f"Invalid connection: {connection.source_node_id} -> {connection.target_node_id}")
             return False
         
         # Add connection
         workflow["connections"].append(connection)
         workflow["modified_at"] = datetime.now()
+        graph["outgoing"][connection.source_node_id][connection.connection_id] = connection
+        graph["incoming"][connection.target_node_id][connection.connection_id] = connection
+        graph["connection_keys"].add(self._connection_key(connection))
         
         # Register connection globally
         self.connection_registry[connection.connection_id] = connection
@@ -218,6 +267,9 @@ class WorkflowCanvas:
         workflow = self.workflows[workflow_id]
         
         # Remove connection
+        for conn in workflow["connections"]:
+            if conn.connection_id == connection_id:
+                self._unindex_connection(self.graph_indexes[workflow_id], conn)
         workflow["connections"] = [
             conn for conn in workflow["connections"]
             if conn.connection_id != connection_id
@@ -249,6 +301,43 @@ class WorkflowCanvas:
         
         return self.workflows[workflow_id]["connections"]
     
+    def get_node_dependencies(self, workflow_id: str, node_id: str) -> List[str]:
+        """Get the source nodes of all connections into a node, one entry per connection."""
+        incoming = self.graph_indexes[workflow_id]["incoming"].get(node_id, {})
+        return [conn.source_node_id for conn in incoming.values()]
+    
+    def get_node_dependents(self, workflow_id: str, node_id: str) -> List[str]:
+        """Get the target nodes of all connections out of a node, one entry per connection."""
+        outgoing = self.graph_indexes[workflow_id]["outgoing"].get(node_id, {})
+        return [conn.target_node_id for conn in outgoing.values()]
+    
+    def get_node_in_degree(self, workflow_id: str, node_id: str) -> int:
+        """Number of connections into a node."""
+        return len(self.graph_indexes[workflow_id]["incoming"].get(node_id, {}))
+    
+    @staticmethod
+    def _empty_graph_index() -> Dict[str, Any]:
+        """
+        Connection indexes for one workflow.
+        
+        "outgoing" and "incoming" map node_id -> {connection_id: connection};
+        "connection_keys" holds (source, target, source_port, target_port) of
+        every connection for constant-time duplicate checks.
+        """
+        return {"outgoing": {}, "incoming": {}, "connection_keys": set()}
+    
+    @staticmethod
+    def _connection_key(connection: WorkflowConnection) -> Tuple[str, str, str, str]:
+        return (connection.source_node_id, connection.target_node_id,
+                connection.source_port, connection.target_port)
+    
+    def _unindex_connection(self, graph: Dict[str, Any], connection: WorkflowConnection):
+        """Drop a connection from a workflow's indexes and the global registry."""
+        graph["outgoing"].get(connection.source_node_id, {}).pop(connection.connection_id, None)
+        graph["incoming"].get(connection.target_node_id, {}).pop(connection.connection_id, None)
+        graph["connection_keys"].discard(self._connection_key(connection))
+        self.connection_registry.pop(connection.connection_id, None)
+    
     def validate_workflow(self, workflow_id: str) -> Dict[str, Any]:
         """
         Validate a workflow for execution.
@@ -270,11 +359,12 @@ class WorkflowCanvas:
         warnings = []
         
         # Check for cycles
-        if self._has_cycles(nodes, connections):
+        graph = self.graph_indexes[workflow_id]
+        if self._has_cycles(nodes, graph["outgoing"]):
             errors.append("Workflow contains cycles")
         
         # Check for disconnected nodes
-        disconnected = self._find_disconnected_nodes(nodes, connections)
+        disconnected = self._find_disconnected_nodes(nodes, graph["outgoing"], graph["incoming"])
         if disconnected:
             warnings.append(f"Disconnected nodes: {', '.join(disconnected)}")
         
@@ -306,7 +396,8 @@ class WorkflowCanvas:
         
         return True
     
-    def _validate_connection(self, connection: WorkflowConnection, workflow: Dict[str, Any]) -> bool:
+    def _validate_connection(self, connection: WorkflowConnection, workflow: Dict[str, Any],
+                             graph: Dict[str, Any]) -> bool:
         """Validate a workflow connection."""
         nodes = workflow["nodes"]
         
@@ -322,54 +413,49 @@ class WorkflowCanvas:
             return False
         
         # Check for duplicate connections
-        existing_connections = workflow["connections"]
-        for existing in existing_connections:
-            if (existing.source_node_id == connection.source_node_id and
-                existing.target_node_id == connection.target_node_id and
-                existing.source_port == connection.source_port and
-                existing.target_port == connection.target_port):
-                return False
+        if self._connection_key(connection) in graph["connection_keys"]:
+            return False
         
         return True
     
-    def _has_cycles(self, nodes: Dict[str, WorkflowNode], connections: List[WorkflowConnection]) -> bool:
-        """Check if workflow has cycles using DFS."""
+    def _has_cycles(self, nodes: Dict[str, WorkflowNode], outgoing: Dict[str, Dict[str, WorkflowConnection]]) -> bool:
+        """Check if workflow has cycles using an iterative DFS over the outgoing index."""
         visited = set()
         rec_stack = set()
         
-        def dfs(node_id):
-            visited.add(node_id)
-            rec_stack.add(node_id)
-            
-            # Find all outgoing connections
-            for conn in connections:
-                if conn.source_node_id == node_id:
-                    neighbor = conn.target_node_id
-                    if neighbor not in visited:
-                        if dfs(neighbor):
-                            return True
-                    elif neighbor in rec_stack:
-                        return True
+        for root in nodes:
+            if root in visited:
+                continue
+            visited.add(root)
+            rec_stack.add(root)
+            stack = [(root, iter(outgoing.get(root, {}).values()))]
             
-            rec_stack.remove(node_id)
-            return False
-        
-        for node_id in nodes:
-            if node_id not in visited:
-                if dfs(node_id):
+            while stack:
+                node_id, edges = stack[-1]
+                conn = next(edges, None)
+                if conn is None:
+                    stack.pop()
+                    rec_stack.discard(node_id)
+                    continue
+                
+                neighbor = conn.target_node_id
+                if neighbor in rec_stack:
                     return True
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    rec_stack.add(neighbor)
+                    stack.append((neighbor, iter(outgoing.get(neighbor, {}).values())))
         
         return False
     
-    def _find_disconnected_nodes(self, nodes: Dict[str, WorkflowNode], connections: List[WorkflowConnection]) -> List[str]:
+    def _find_disconnected_nodes(self, nodes: Dict[str, WorkflowNode],
+                                 outgoing: Dict[str, Dict[str, WorkflowConnection]],
+                                 incoming: Dict[str, Dict[str, WorkflowConnection]]) -> List[str]:
         """Find nodes that have no connections."""
-        connected_nodes = set()
-        
-        for conn in connections:
-            connected_nodes.add(conn.source_node_id)
-            connected_nodes.add(conn.target_node_id)
-        
-        return [node_id for node_id in nodes if node_id not in connected_nodes]
+        return [
+            node_id for node_id in nodes
+            if not outgoing.get(node_id) and not incoming.get(node_id)
+        ]
     
     def _check_missing_dependencies(self, nodes: Dict[str, WorkflowNode], connections: List[WorkflowConnection]) -> List[str]:
         """Check for missing dependencies."""
@@ -458,6 +544,7 @@ class WorkflowCanvas:
             "version": workflow_data.get("version", "1.0.0"),
             "status": "draft"
         }
+        self.graph_indexes[workflow_id] = self._empty_graph_index()
         
         # Import nodes
         for node_data in workflow_data["nodes"].values():
@@ -8,23 +8,28 @@ It handles execution flow, dependency management, and real-time monitoring.
 import asyncio
 import uuid
 import logging
-from typing import Dict, List, Any, Optional, Set
+from collections import deque
+from typing import AsyncIterator, Callable, Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 
 from .workflow_canvas import WorkflowCanvas, WorkflowExecution
+from .execution_store import ExecutionStore
 # Conditional import for node types to avoid vision dependency issues
 try:
-    from .node_types import BaseNode, create_node
+    from .node_types import BaseNode, NodePool, create_node
     NODE_TYPES_AVAILABLE = True
 except ImportError:
     BaseNode = None
+    NodePool = None
     create_node = None
     NODE_TYPES_AVAILABLE = False
     print("Warning: Node types not available - workflow engine functionality limited")
 
 logger = logging.getLogger(__name__)
 
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
 
 @dataclass
 class ExecutionContext:
@@ -44,11 +49,25 @@ class WorkflowExecutionEngine:
     Handles execution flow, dependency resolution, and error handling.
     """
     
-    def __init__(self, canvas: WorkflowCanvas):
-        """Initialize the execution engine with a workflow canvas."""
+    def __init__(self, canvas: WorkflowCanvas, max_parallel_nodes: int = 4, max_idle_nodes_per_key: int = 4):
+        """
+        Initialize the execution engine with a workflow canvas.
+        
+        Args:
+            canvas: Canvas holding the workflows to execute
+            max_parallel_nodes: Maximum number of independent nodes run at once per execution
+            max_idle_nodes_per_key: Warm instances kept per distinct node definition
+        """
         self.canvas = canvas
+        self.max_parallel_nodes = max(1, max_parallel_nodes)
+        # Warm node (and agent) instances reused across executions
+        self.node_pool = NodePool(max_idle_nodes_per_key) if NODE_TYPES_AVAILABLE else None
         self.active_executions: Dict[str, asyncio.Task] = {}
         self.execution_callbacks: Dict[str, List[callable]] = {}
+        # Set (and replaced) on every change of an execution; waiters block on it instead of polling
+        self._change_events: Dict[str, asyncio.Event] = {}
+        # Queues of the async subscribers of each execution
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
         
         logger.info("WorkflowExecutionEngine initialized successfully")
     
@@ -92,12 +111,20 @@ class WorkflowExecutionEngine:
         return execution_id
     
     async def _execute_workflow_task(self, execution_id: str, inputs: Dict[str, Any]):
-        """Background task that executes the workflow."""
+        """
+        Background task that executes the workflow.
+        
+        Nodes are launched as soon as all of their upstream nodes have finished,
+        so independent branches run concurrently (up to max_parallel_nodes).
+        While paused no new nodes are started; the first failing node stops
+        the execution and cancels the nodes still running.
+        """
         execution = self.canvas.executions[execution_id]
-        workflow = self.canvas.workflows[execution.execution_id]
+        workflow = self.canvas.workflows[execution.workflow_id]
+        running: Dict[asyncio.Task, str] = {}
         
         try:
-            execution.status = "running"
+            self._set_status(execution, "running")
             
             # Create execution context
             context = ExecutionContext(
@@ -109,54 +136,105 @@ class WorkflowExecutionEngine:
                 start_time=datetime.now()
             )
             
-            # Get execution order (topological sort)
-            execution_order = self._get_execution_order(workflow)
+            # Fails fast on cycles before any node runs
+            self._get_execution_order(workflow)
+            adjacency, in_degree = self._build_graph(workflow)
+            ready = deque(node_id for node_id, degree in in_degree.items() if degree == 0)
             
-            # Execute nodes in order
-            for node_id in execution_order:
+            while ready or running:
                 if execution.status == "paused":
                     await self._wait_for_resume(execution_id)
                 
                 if execution.status == "cancelled":
                     break
                 
-                execution.current_node = node_id
-                node_result = await self._execute_node(node_id, context, workflow)
+                while ready and len(running) < self.max_parallel_nodes:
+                    node_id = ready.popleft()
+                    execution.current_node = node_id
+                    running[asyncio.create_task(self._run_timed_node(node_id, context, workflow, execution))] = node_id
                 
-                # Update context with node output
-                context.node_outputs[node_id] = node_result
-                context.execution_log.append({
-                    "node_id": node_id,
-                    "timestamp": datetime.now(),
-                    "result": node_result
-                })
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    node_id = running.pop(finished)
+                    node_result = finished.result()
+                    
+                    # Update context with node output
+                    context.node_outputs[node_id] = node_result
+                    context.execution_log.append({
+                        "node_id": node_id,
+                        "timestamp": datetime.now(),
+                        "result": node_result
+                    })
+                    
+                    # Check for node failure
+                    if not node_result.get("success") and execution.status != "failed":
+                        execution.error = f"Node {node_id} failed: {node_result.get('error')}"
+                        execution.end_time = datetime.now()
+                        self._set_status(execution, "failed")
+                    
+                    for neighbor in adjacency[node_id]:
+                        in_degree[neighbor] -= 1
+                        if in_degree[neighbor] == 0:
+                            ready.append(neighbor)
                 
-                # Check for node failure
-                if not node_result.get("success"):
-                    execution.status = "failed"
-                    execution.error = f"Node {node_id} failed: {node_result.get('error')}"
+                if execution.status == "failed":
                     break
             
             # Finalize execution
             if execution.status == "running":
-                execution.status = "completed"
                 execution.outputs = context.node_outputs
                 execution.end_time = datetime.now()
+                self._set_status(execution, "completed")
                 logger.info(f"Workflow execution {execution_id} completed successfully")
             
         except Exception as e:
-            execution.status = "failed"
             execution.error = str(e)
             execution.end_time = datetime.now()
+            self._set_status(execution, "failed")
             logger.error(f"Workflow execution {execution_id} failed: {e}")
         
         finally:
+            # Stop sibling branches after a failure or cancellation
+            for pending in running:
+                pending.cancel()
+            
             # Clean up
             if execution_id in self.active_executions:
                 del self.active_executions[execution_id]
             
             # Notify callbacks
             await self._notify_callbacks(execution_id, execution.status)
+            
+            # Let the store compact the finished execution, off the event loop
+            if isinstance(self.canvas.executions, ExecutionStore):
+                await asyncio.to_thread(self.canvas.executions.finish, execution_id)
+    
+    async def _run_timed_node(self, node_id: str, context: ExecutionContext, workflow: Dict[str, Any],
+                              execution: WorkflowExecution) -> Dict[str, Any]:
+        """Execute a node and record its start and end on the execution timeline."""
+        entry = {
+            "node_id": node_id,
+            "start_time": datetime.now(),
+            "end_time": None,
+            "duration_seconds": None,
+            "status": "running"
+        }
+        execution.node_timeline.append(entry)
+        self._publish(execution.execution_id)
+        try:
+            result = await self._execute_node(node_id, context, workflow)
+            entry["status"] = "completed" if result.get("success") else "failed"
+            return result
+        except asyncio.CancelledError:
+            entry["status"] = "cancelled"
+            raise
+        finally:
+            entry["end_time"] = datetime.now()
+            entry["duration_seconds"] = (entry["end_time"] - entry["start_time"]).total_seconds()
+            node_data = workflow["nodes"][node_id]
+            node_data.last_executed = entry["start_time"]
+            node_data.actual_duration = int(entry["duration_seconds"])
+            self._publish(execution.execution_id)
     
     async def _execute_node(self, node_id: str, context: ExecutionContext, workflow: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a single workflow node."""
@@ -164,14 +242,21 @@ class WorkflowExecutionEngine:
         node_type = node_data.node_type
         
         try:
-            # Create node instance
-            node = create_node(
+            # Take a warm node instance for this definition, creating it if needed.
+            # Instances are only shared between executions of the same workflow.
+            node = self.node_pool.acquire(
                 node_type=node_type,
                 node_id=node_id,
                 name=node_data.name,
+                scope=workflow["workflow_id"],
                 **node_data.config
             )
-            
+        except Exception as e:
+            logger.error(f"Failed to execute node {node_id}: {e}")
+            return {"success": False, "error": str(e)}
+        
+        released = False
+        try:
             # Prepare node context
             node_context = self._prepare_node_context(node_id, context, workflow)
             
@@ -184,11 +269,17 @@ class WorkflowExecutionEngine:
             if node.error:
                 node_data.error = node.error
             
+            self.node_pool.release(node)
+            released = True
             return result
             
         except Exception as e:
             logger.error(f"Failed to execute node {node_id}: {e}")
             return {"success": False, "error": str(e)}
+        finally:
+            # Nodes that raised or were cancelled mid-run are not returned to the pool
+            if not released:
+                self.node_pool.discard(node)
     
     def _prepare_node_context(self, node_id: str, context: ExecutionContext, workflow: Dict[str, Any]) -> Dict[str, Any]:
         """Prepare context for a specific node execution."""
@@ -208,40 +299,28 @@ class WorkflowExecutionEngine:
     
     def _get_node_dependencies(self, node_id: str, workflow: Dict[str, Any]) -> List[str]:
         """Get list of nodes that this node depends on."""
-        connections = workflow["connections"]
-        dependencies = []
-        
-        for conn in connections:
-            if conn.target_node_id == node_id:
-                dependencies.append(conn.source_node_id)
-        
-        return dependencies
+        return self.canvas.get_node_dependencies(workflow["workflow_id"], node_id)
+    
+    def _build_graph(self, workflow: Dict[str, Any]) -> Tuple[Dict[str, List[str]], Dict[str, int]]:
+        """Build the adjacency list and in-degree count of the workflow's nodes."""
+        workflow_id = workflow["workflow_id"]
+        adjacency = {node_id: self.canvas.get_node_dependents(workflow_id, node_id) for node_id in workflow["nodes"]}
+        in_degree = {node_id: self.canvas.get_node_in_degree(workflow_id, node_id) for node_id in workflow["nodes"]}
+        return adjacency, in_degree
     
     def _get_execution_order(self, workflow: Dict[str, Any]) -> List[str]:
         """
         Get topological order of nodes for execution.
         Uses Kahn's algorithm for topological sorting.
         """
-        nodes = workflow["nodes"]
-        connections = workflow["connections"]
-        
-        # Build adjacency list and in-degree count
-        adjacency = {node_id: [] for node_id in nodes}
-        in_degree = {node_id: 0 for node_id in nodes}
-        
-        for conn in connections:
-            source = conn.source_node_id
-            target = conn.target_node_id
-            if source in nodes and target in nodes:
-                adjacency[source].append(target)
-                in_degree[target] += 1
+        adjacency, in_degree = self._build_graph(workflow)
         
         # Kahn's algorithm
-        queue = [node_id for node_id, degree in in_degree.items() if degree == 0]
+        queue = deque(node_id for node_id, degree in in_degree.items() if degree == 0)
         execution_order = []
         
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             execution_order.append(current)
             
             for neighbor in adjacency[current]:
@@ -250,15 +329,52 @@ class WorkflowExecutionEngine:
                     queue.append(neighbor)
         
         # Check for cycles
-        if len(execution_order) != len(nodes):
+        if len(execution_order) != len(workflow["nodes"]):
             raise ValueError("Workflow contains cycles and cannot be executed")
         
         return execution_order
     
     async def _wait_for_resume(self, execution_id: str):
-        """Wait for a paused execution to be resumed."""
-        while self.canvas.executions[execution_id].status == "paused":
-            await asyncio.sleep(0.1)
+        """Wait for a paused execution to be resumed (or cancelled)."""
+        await self._wait_for_status(execution_id, lambda status: status != "paused")
+    
+    def _set_status(self, execution: WorkflowExecution, status: str):
+        """Change an execution's status and wake everyone waiting on it."""
+        execution.status = status
+        self._publish(execution.execution_id)
+    
+    def _publish(self, execution_id: str):
+        """Wake waiters and push the current status to subscribers of an execution."""
+        event = self._change_events.pop(execution_id, None)
+        if event is not None:
+            event.set()
+        subscribers = self._subscribers.get(execution_id)
+        if subscribers:
+            status = self.get_execution_status(execution_id)
+            for queue in subscribers:
+                queue.put_nowait(status)
+    
+    async def _wait_for_status(self, execution_id: str, predicate: Callable[[str], bool],
+                               timeout: float = None) -> Optional[WorkflowExecution]:
+        """
+        Block until the execution's status satisfies `predicate`.
+        
+        Returns the execution, or None if it does not exist. Raises
+        asyncio.TimeoutError if `timeout` seconds pass first.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout else None
+        
+        while True:
+            execution = self.canvas.executions.get(execution_id)
+            if execution is None or predicate(execution.status):
+                return execution
+            
+            event = self._change_events.setdefault(execution_id, asyncio.Event())
+            remaining = deadline - loop.time() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                raise asyncio.TimeoutError()
+            await asyncio.wait_for(event.wait(), remaining)
     
     async def _notify_callbacks(self, execution_id: str, status: str):
         """Notify registered callbacks about execution status changes."""
@@ -276,7 +392,7 @@ class WorkflowExecutionEngine:
         
         execution = self.canvas.executions[execution_id]
         if execution.status == "running":
-            execution.status = "paused"
+            self._set_status(execution, "paused")
             logger.info(f"Paused workflow execution: {execution_id}")
             return True
         
@@ -289,7 +405,7 @@ class WorkflowExecutionEngine:
         
         execution = self.canvas.executions[execution_id]
         if execution.status == "paused":
-            execution.status = "running"
+            self._set_status(execution, "running")
             logger.info(f"Resumed workflow execution: {execution_id}")
             return True
         
@@ -302,8 +418,8 @@ class WorkflowExecutionEngine:
         
         execution = self.canvas.executions[execution_id]
         if execution.status in ["running", "paused"]:
-            execution.status = "cancelled"
             execution.end_time = datetime.now()
+            self._set_status(execution, "cancelled")
             
             # Cancel background task if running
             if execution_id in self.active_executions:
@@ -331,6 +447,8 @@ class WorkflowExecutionEngine:
             "start_time": execution.start_time,
             "end_time": execution.end_time,
             "current_node": execution.current_node,
+            "running_nodes": [entry["node_id"] for entry in execution.node_timeline if entry["end_time"] is None],
+            "timeline": execution.node_timeline,
             "error": execution.error,
             "progress": self._calculate_progress(execution, workflow)
         }
@@ -379,21 +497,45 @@ class WorkflowExecutionEngine:
         Returns:
             Final execution status
         """
-        start_time = asyncio.get_event_loop().time()
+        try:
+            execution = await self._wait_for_status(
+                execution_id, lambda status: status in TERMINAL_STATUSES, timeout
+            )
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"Execution {execution_id} did not complete within {timeout} seconds")
         
-        while execution_id in self.canvas.executions:
-            execution = self.canvas.executions[execution_id]
-            
-            if execution.status in ["completed", "failed", "cancelled"]:
-                return self.get_execution_status(execution_id)
-            
-            # Check timeout
-            if timeout and (asyncio.get_event_loop().time() - start_time) > timeout:
-                raise asyncio.TimeoutError(f"Execution {execution_id} did not complete within {timeout} seconds")
-            
-            await asyncio.sleep(0.1)
+        if execution is None:
+            return {"error": "Execution not found"}
+        return self.get_execution_status(execution_id)
+    
+    async def subscribe(self, execution_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream status updates for an execution.
+        
+        Yields the current status immediately, then a fresh status every time
+        the execution changes state or a node starts or finishes. The stream
+        ends after a completed, failed or cancelled status.
+        
+        Args:
+            execution_id: ID of the execution to follow
+        """
+        if execution_id not in self.canvas.executions:
+            return
         
-        return {"error": "Execution not found"}
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(execution_id, []).append(queue)
+        try:
+            status = self.get_execution_status(execution_id)
+            yield status
+            while status["status"] not in TERMINAL_STATUSES:
+                status = await queue.get()
+                yield status
+        finally:
+            subscribers = self._subscribers.get(execution_id, [])
+            if queue in subscribers:
+                subscribers.remove(queue)
+            if not subscribers:
+                self._subscribers.pop(execution_id, None)
     
     def get_all_executions(self) -> List[Dict[str, Any]]:
         """Get status of all workflow executions."""
@@ -404,6 +546,10 @@ class WorkflowExecutionEngine:
     
     def cleanup_completed_executions(self, max_age_hours: int = 24):
         """Clean up old completed executions."""
+        if isinstance(self.canvas.executions, ExecutionStore):
+            self.canvas.executions.compact(max_age_hours)
+            return
+        
         cutoff_time = datetime.now().timestamp() - (max_age_hours * 3600)
         
         executions_to_remove = []
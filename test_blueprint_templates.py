@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test Script for Compiled Blueprint Templates
+
+Checks that compiled step templates render like the YAML they came from, and
+that blueprints referencing variables that can never resolve are rejected when
+they are loaded instead of mid-execution.
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add the guild package to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'guild'))
+
+from guild.src.core.blueprint_engine import Blueprint, BlueprintEngine, BlueprintStep
+from guild.src.core.blueprint_templates import (
+    DictTemplate,
+    Literal,
+    Single,
+    TemplateError,
+    Text,
+    compile_template,
+)
+
+CONTEXT = {
+    'steps': {'research': {'output': {'leads': ['a', 'b'], 'count': 2}, 'status': 'completed'}},
+    'config': {'company': 'Guild'},
+    'loop': {'item': {'email': 'x@example.com'}, 'index': 0, 'total': 1},
+}
+
+
+def make_blueprint(steps):
+    return Blueprint(id="test", name="Test", description="", trigger={"type": "manual"}, steps=steps)
+
+
+def test_compile_and_render():
+    print("🧩 Testing template compilation and rendering...")
+    single = compile_template("{{ steps.research.output.leads }}")
+    assert isinstance(single, Single)
+    assert single.render(CONTEXT) == ['a', 'b']
+
+    text = compile_template("Found {{ steps.research.output.count }} leads for {{config.company}}")
+    assert isinstance(text, Text)
+    assert text.render(CONTEXT) == "Found 2 leads for Guild"
+
+    nested = compile_template({
+        'to': "{{ loop.item.email }}",
+        'tags': ["static", "{{ config.company }}"],
+        'retries': 3,
+    })
+    assert isinstance(nested, DictTemplate)
+    assert nested.render(CONTEXT) == {'to': 'x@example.com', 'tags': ['static', 'Guild'], 'retries': 3}
+    assert sorted(v.source for v in nested.variables()) == ['config.company', 'loop.item.email']
+
+    # Unknown values render as the original placeholder
+    assert compile_template("{{ config.missing }}").render(CONTEXT) == "{{ config.missing }}"
+    assert compile_template("x={{ config.missing }}").render(CONTEXT) == "x={{ config.missing }}"
+    print("✅ Templates render like their source")
+
+
+def test_output_aliases_are_rewritten():
+    print("🧩 Testing step output aliases...")
+    template = compile_template("{{ steps.found_leads.output.count }}", {'found_leads': 'research'})
+    assert [v.source for v in template.variables()] == ['steps.research.output.count']
+    assert template.render(CONTEXT) == 2
+    print("✅ Output names resolve to the producing step")
+
+
+def test_literal_containers_are_copied():
+    print("🧩 Testing that literal inputs are not shared between renders...")
+    template = compile_template({'skill': 'excel', 'columns': ['date', 'amount']})
+    assert isinstance(template, Literal)
+    first = template.render(CONTEXT)
+    first['columns'].append('mutated')
+    first['extra'] = True
+    assert template.render(CONTEXT) == {'skill': 'excel', 'columns': ['date', 'amount']}
+    assert compile_template("plain text").render(CONTEXT) == "plain text"
+    print("✅ Each render gets its own copy")
+
+
+def test_unresolvable_variables_fail_at_load():
+    print("🧩 Testing load-time TemplateError...")
+    cases = [
+        [BlueprintStep("a", "scraper_agent", "{{ unknown.value }}", "a_out")],
+        [BlueprintStep("a", "scraper_agent", "{{ steps.nope.output }}", "a_out")],
+        [BlueprintStep("a", "scraper_agent", "{{ loop.item }}", "a_out")],
+        [
+            BlueprintStep("a", "scraper_agent", "{{ steps.b.output }}", "a_out", depends_on=[]),
+            BlueprintStep("b", "scraper_agent", "go", "b_out"),
+        ],
+    ]
+    for steps in cases:
+        try:
+            BlueprintEngine.compile_blueprint(make_blueprint(steps))
+        except TemplateError:
+            continue
+        raise AssertionError(f"No TemplateError for {steps[0].input}")
+
+    valid = BlueprintEngine.compile_blueprint(make_blueprint([
+        BlueprintStep("a", "scraper_agent", "go", "a_out"),
+        BlueprintStep("b", "email_agent", {"body": "{{ steps.a_out.output }}"}, "b_out",
+                      loop="{{ steps.a.output }}"),
+    ]))
+    assert valid.step_graph == {"a": [], "b": ["a"]}
+    print("✅ Bad variables are rejected before execution")
+
+
+def test_load_blueprint_rejects_bad_file():
+    print("🧩 Testing load_blueprint with an unresolvable variable...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "broken.yml"
+        path.write_text(
+            "id: broken\nname: Broken\ndescription: x\nsteps:\n"
+            "  - name: only\n    agent: scraper_agent\n    input: \"{{ steps.ghost.output }}\"\n    output: out\n",
+            encoding="utf-8",
+        )
+        assert BlueprintEngine.load_blueprint(path) is None
+    print("✅ Broken blueprint is not loaded")
+
+
+def test_shipped_blueprints_compile():
+    print("🧩 Testing the shipped blueprints...")
+    blueprint_dir = Path(__file__).parent / "guild" / "src" / "blueprints"
+    files = sorted(blueprint_dir.glob("*.yml"))
+    assert files
+    for path in files:
+        assert BlueprintEngine.load_blueprint(path) is not None, path.name
+    print(f"✅ {len(files)} blueprints compile")
+
+
+if __name__ == "__main__":
+    tests = [
+        test_compile_and_render,
+        test_output_aliases_are_rewritten,
+        test_literal_containers_are_copied,
+        test_unresolvable_variables_fail_at_load,
+        test_load_blueprint_rejects_bad_file,
+        test_shipped_blueprints_compile,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 Blueprint template tests passed!")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test Script for Streaming Chunking
+
+Checks that iter_chunks yields the same chunks however the text is split into
+pieces, so streamed file blocks and PDF pages chunk exactly like the whole
+text, and that chunks respect the size limit and cover all of the text.
+"""
+
+import sys
+import os
+import random
+import tempfile
+
+# Add the guild package to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'guild'))
+
+from guild.src.core.chunking import iter_chunks, iter_file_text
+
+
+def sample_text(seed: int = 7, paragraphs: int = 60) -> str:
+    rng = random.Random(seed)
+    words = ["revenue", "growth", "customer", "pipeline", "Q3", "forecast", "churn", "margin", "a", "the"]
+    text = []
+    for _ in range(paragraphs):
+        lines = []
+        for _ in range(rng.randint(1, 4)):
+            lines.append(" ".join(rng.choice(words) for _ in range(rng.randint(3, 60))))
+        text.append("\n".join(lines))
+    # One long run without separators forces hard cuts
+    text.append("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(2500)))
+    return "\n\n".join(text)
+
+
+def split_randomly(text: str, seed: int, max_piece: int):
+    rng = random.Random(seed)
+    position = 0
+    while position < len(text):
+        size = rng.randint(1, max_piece)
+        yield text[position:position + size]
+        position += size
+
+
+def test_chunks_do_not_depend_on_piece_boundaries():
+    print("✂️ Testing chunk equivalence across piece boundaries...")
+    text = sample_text()
+    for chunk_size, overlap in [(1000, 200), (300, 0), (120, 50)]:
+        expected = list(iter_chunks([text], chunk_size, overlap))
+        assert len(expected) > 1
+        assert list(iter_chunks(iter(text), chunk_size, overlap)) == expected
+        for seed, max_piece in [(1, 10), (2, chunk_size), (3, 5 * chunk_size), (4, 64 * 1024)]:
+            pieces = list(split_randomly(text, seed, max_piece)) + [""]
+            assert list(iter_chunks(pieces, chunk_size, overlap)) == expected, (chunk_size, overlap, seed)
+    print("✅ Same chunks for every split")
+
+
+def test_chunks_respect_size_and_cover_text():
+    print("✂️ Testing chunk sizes and coverage...")
+    text = sample_text(seed=11)
+    chunks = list(iter_chunks([text], 500, 100))
+    assert all(0 < len(chunk) <= 500 for chunk in chunks)
+
+    # Chunks are slices of the input, in order, with no uncovered gap between them
+    previous_start, covered_until = -1, 0
+    for chunk in chunks:
+        found = text.find(chunk, previous_start + 1)
+        assert found != -1, "chunk is not a slice of the input"
+        assert not text[covered_until:found].strip(), "text skipped between chunks"
+        previous_start, covered_until = found, max(covered_until, found + len(chunk))
+    assert not text[covered_until:].strip()
+    print("✅ Chunks fit the limit and cover the text")
+
+
+def test_short_and_empty_input():
+    print("✂️ Testing short and empty input...")
+    assert list(iter_chunks([])) == []
+    assert list(iter_chunks(["", "   ", "\n"])) == []
+    assert list(iter_chunks(["  hello ", "world  "])) == ["hello world"]
+    print("✅ Short input handled")
+
+
+def test_file_blocks_match_whole_text():
+    print("✂️ Testing file streaming...")
+    text = sample_text(seed=5)
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+        f.write(text)
+        path = f.name
+    try:
+        expected = list(iter_chunks([text]))
+        assert list(iter_chunks(iter_file_text(path, block_size=333))) == expected
+        assert list(iter_chunks(iter_file_text(path))) == expected
+    finally:
+        os.unlink(path)
+    print("✅ File blocks chunk like the whole text")
+
+
+if __name__ == "__main__":
+    tests = [
+        test_chunks_do_not_depend_on_piece_boundaries,
+        test_chunks_respect_size_and_cover_text,
+        test_short_and_empty_input,
+        test_file_blocks_match_whole_text,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 Chunking tests passed!")
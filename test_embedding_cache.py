@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test Script for the Embedding Cache
+
+Checks that vectors written to the memory-mapped cache come back unchanged,
+including from a fresh cache instance on the same directory, and that
+embed_with_cache only encodes chunks it has never seen.
+"""
+
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add the guild package to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'guild'))
+
+from guild.src.core.embedding_cache import EmbeddingCache, content_hash, embed_with_cache
+
+DIMENSION = 8
+
+
+class CountingEmbeddingService:
+    """Deterministic stand-in for the embedding model that records what it encodes."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        return np.stack([
+            np.random.default_rng(int(content_hash(text)[:8], 16)).random(DIMENSION, dtype=np.float32)
+            for text in texts
+        ])
+
+
+def test_memmap_round_trip():
+    print("💾 Testing embedding cache round trip...")
+    with tempfile.TemporaryDirectory() as directory:
+        cache = EmbeddingCache(directory, "test/model", DIMENSION)
+        first = np.arange(2 * DIMENSION, dtype=np.float32).reshape(2, DIMENSION)
+        cache.put_many(["a", "b"], first)
+        # Grows the file after the first memmap view was taken
+        assert set(cache.get_many(["a"])) == {"a"}
+        second = -np.ones((1, DIMENSION), dtype=np.float32)
+        cache.put_many(["c", "a"], np.vstack([second, first[:1] + 100]))
+
+        found = cache.get_many(["a", "b", "c", "missing"])
+        assert set(found) == {"a", "b", "c"}
+        np.testing.assert_array_equal(found["a"], first[0])
+        np.testing.assert_array_equal(found["b"], first[1])
+        np.testing.assert_array_equal(found["c"], second[0])
+        assert cache.get_stats()["entries"] == 3
+
+        reopened = EmbeddingCache(directory, "test/model", DIMENSION)
+        reloaded = reopened.get_many(["a", "b", "c"])
+        for key in ("a", "b", "c"):
+            np.testing.assert_array_equal(reloaded[key], found[key])
+            assert reloaded[key].dtype == np.float32
+
+        other_model = EmbeddingCache(directory, "other-model", DIMENSION)
+        assert other_model.get_many(["a"]) == {}
+    print("✅ Vectors survive a reopen and stay per model")
+
+
+def test_embed_with_cache_only_encodes_new_chunks():
+    print("💾 Testing embed_with_cache...")
+    with tempfile.TemporaryDirectory() as directory:
+        cache = EmbeddingCache(directory, "test-model", DIMENSION)
+        service = CountingEmbeddingService()
+
+        first = embed_with_cache(["alpha", "beta", "alpha"], service, cache)
+        assert service.encoded == ["alpha", "beta"]
+        assert first.shape == (3, DIMENSION)
+        np.testing.assert_array_equal(first[0], first[2])
+
+        service.encoded.clear()
+        second = embed_with_cache(["beta", "gamma", "alpha"], service, cache)
+        assert service.encoded == ["gamma"]
+        np.testing.assert_array_equal(second[0], first[1])
+        np.testing.assert_array_equal(second[2], first[0])
+        np.testing.assert_array_equal(second[1], CountingEmbeddingService().encode(["gamma"])[0])
+    print("✅ Only unseen chunks were encoded")
+
+
+if __name__ == "__main__":
+    tests = [test_memmap_round_trip, test_embed_with_cache_only_encodes_new_chunks]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 Embedding cache tests passed!")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test Script for the Workflow Execution Store
+
+Checks that executions spilled to the SQLite backend keep their large and
+binary outputs in the blob store, and that compacting an execution more than
+once never nests blob references.
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# Add the guild package to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'guild'))
+
+from guild.src.core.config import settings
+from guild.src.core.workflow_builder.execution_store import (
+    BlobStore,
+    ExecutionStore,
+    SQLiteExecutionBackend,
+    is_blob_ref,
+)
+from guild.src.core.workflow_builder.workflow_canvas import WorkflowCanvas, WorkflowExecution
+
+SCREENSHOT = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 4
+
+
+def finished_execution(execution_id: str, outputs) -> WorkflowExecution:
+    return WorkflowExecution(
+        execution_id=execution_id,
+        workflow_id="wf",
+        status="completed",
+        start_time=datetime.now(),
+        end_time=datetime.now(),
+        outputs=outputs,
+        execution_log=[{"node_id": "n1", "result": outputs}],
+    )
+
+
+def add_finished(store: ExecutionStore, execution: WorkflowExecution):
+    store[execution.execution_id] = execution
+    store.finish(execution.execution_id)
+
+
+def test_default_store_keeps_spilled_bytes():
+    print("🗄️ Testing bytes outputs of a spilled execution...")
+    saved = (settings.WORKFLOW_EXECUTION_STORE_PATH, settings.WORKFLOW_EXECUTION_MAX_HOT,
+             settings.WORKFLOW_EXECUTION_BLOB_DIR)
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            settings.WORKFLOW_EXECUTION_STORE_PATH = os.path.join(directory, "executions.sqlite")
+            settings.WORKFLOW_EXECUTION_MAX_HOT = 1
+            settings.WORKFLOW_EXECUTION_BLOB_DIR = None
+            store = WorkflowCanvas().executions
+        finally:
+            (settings.WORKFLOW_EXECUTION_STORE_PATH, settings.WORKFLOW_EXECUTION_MAX_HOT,
+             settings.WORKFLOW_EXECUTION_BLOB_DIR) = saved
+
+        assert store.blob_store is not None
+        add_finished(store, finished_execution("first", {"screenshot": SCREENSHOT, "title": "Invoice"}))
+        add_finished(store, finished_execution("second", {"title": "Next"}))
+        assert store.hot_ids() == ["second"]
+        assert store.get_stats()["spilled"] == 1
+
+        reloaded = store["first"]
+        assert is_blob_ref(reloaded.outputs["screenshot"])
+        outputs = store.blob_store.resolve(reloaded.outputs)
+        assert outputs == {"screenshot": SCREENSHOT, "title": "Invoice"}
+        assert store.blob_store.resolve(reloaded.execution_log)[0]["result"]["screenshot"] == SCREENSHOT
+    print("✅ Screenshot bytes survive the spill")
+
+
+def test_repeated_externalize_does_not_nest_refs():
+    print("🗄️ Testing that compaction is idempotent...")
+    with tempfile.TemporaryDirectory() as directory:
+        blobs = BlobStore(os.path.join(directory, "blobs"), threshold_bytes=8)
+        store = ExecutionStore(
+            max_hot=1,
+            backend=SQLiteExecutionBackend(os.path.join(directory, "executions.sqlite")),
+            blob_store=blobs,
+        )
+        page = "x" * 100
+        # finish() externalizes, then the spill walks the same outputs again
+        add_finished(store, finished_execution("first", {"page": page, "raw": SCREENSHOT}))
+        add_finished(store, finished_execution("second", {}))
+
+        reloaded = store["first"]
+        for value in reloaded.outputs.values():
+            assert is_blob_ref(value)
+            assert isinstance(value["$blob"], str)
+        assert blobs.externalize(reloaded.outputs) == reloaded.outputs
+        assert blobs.resolve(reloaded.outputs) == {"page": page, "raw": SCREENSHOT}
+    print("✅ References are never externalized twice")
+
+
+if __name__ == "__main__":
+    tests = [test_default_store_keeps_spilled_bytes, test_repeated_externalize_does_not_nest_refs]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 Execution store tests passed!")
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Test Script for Knowledge Injection
+
+Checks that the web search behind an injected prompt runs while the decorated
+function does its other work, that a search prefetched for a workflow is
+reused by the prompt that needs it, and that prompts sent outside decorated
+functions are left alone.
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# Add the guild package to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'guild'))
+
+from guild.src.core import agent_helpers
+from guild.src.core.agent_helpers import (
+    extract_search_query,
+    inject_knowledge,
+    known_knowledge_queries,
+    prefetch_knowledge,
+)
+from guild.src.core.knowledge_cache import get_knowledge_cache
+from guild.src.core.llm_cache import current_agent
+from guild.src.core.llm_client import LlmClient
+from guild.src.models.llm import Llm
+
+SEARCH_SECONDS = 0.3
+
+
+class SlowSearch:
+    """Stands in for the web search behind fetch_knowledge: takes SEARCH_SECONDS and records the queries."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, search_query):
+        # Through the knowledge cache, like fetch_knowledge
+        return get_knowledge_cache().get_or_fetch(search_query, self.search_web)
+
+    def search_web(self, query):
+        self.queries.append(query)
+        time.sleep(SEARCH_SECONDS)
+        return {"url": "https://example.com", "content": f"Context for {query}"}
+
+
+class RecordingProvider:
+    def __init__(self):
+        self.prompts = []
+
+    async def achat(self, prompt, model, format=None):
+        self.prompts.append(prompt)
+        return "ok"
+
+
+def make_client():
+    client = LlmClient(Llm(provider="ollama", model="test-model"), cache_namespace="OnboardingAgent")
+    client.provider = RecordingProvider()
+    return client
+
+
+def with_search(test):
+    def run():
+        get_knowledge_cache().clear()
+        search = SlowSearch()
+        saved = agent_helpers.fetch_knowledge
+        agent_helpers.fetch_knowledge = search
+        try:
+            test(search)
+        finally:
+            agent_helpers.fetch_knowledge = saved
+    run.__name__ = test.__name__
+    return run
+
+
+@with_search
+def test_search_overlaps_prompt_work(search):
+    print("🔎 Testing that the search overlaps the function's own work...")
+    client = make_client()
+
+    @inject_knowledge
+    async def draft(audience, prompt):
+        # Stands in for the argument and context work done before the prompt is sent
+        await asyncio.sleep(SEARCH_SECONDS)
+        return await client.chat(f"{prompt}\nAudience: {audience}")
+
+    prompt = "Client's Objective: overlap test launch plan"
+    started = time.perf_counter()
+    assert asyncio.run(draft("founders", prompt=prompt)) == "ok"
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.6 * SEARCH_SECONDS, elapsed
+    assert search.queries == ["overlap test launch plan"]
+    sent = client.provider.prompts[0]
+    assert "Context for overlap test launch plan" in sent
+    assert sent.index("--- ORIGINAL PROMPT START ---") < sent.index(prompt) < sent.index("Audience: founders")
+    print(f"✅ Search and prompt work took {elapsed:.2f}s together")
+
+
+@with_search
+def test_prefetched_query_is_reused(search):
+    print("🔎 Testing that a prefetched search is reused...")
+    client = make_client()
+
+    def build_prompt(objective):
+        return f"# Planning\n**Marketing Objective:** {objective}\n"
+
+    @inject_knowledge
+    async def generate_plan(objective):
+        return await client.chat(build_prompt(objective))
+
+    async def run_workflow():
+        # What the orchestrator does right after the DAG is generated
+        searches = prefetch_knowledge([extract_search_query(build_prompt("prefetch test"))])
+        assert len(searches) == 1
+        # A dependency runs for as long as the search takes
+        await asyncio.sleep(SEARCH_SECONDS)
+        token = current_agent.set("MarketingAgent")
+        try:
+            return await generate_plan("prefetch test")
+        finally:
+            current_agent.reset(token)
+
+    started = time.perf_counter()
+    assert asyncio.run(run_workflow()) == "ok"
+    elapsed = time.perf_counter() - started
+
+    assert search.queries == ["** prefetch test"]
+    assert elapsed < 1.6 * SEARCH_SECONDS, elapsed
+    assert "Context for ** prefetch test" in client.provider.prompts[0]
+    # The next workflow prefetches what this agent searched for
+    assert known_knowledge_queries("MarketingAgent") == ["** prefetch test"]
+    print("✅ One search served the prefetch and the prompt")
+
+
+@with_search
+def test_prompts_outside_decorated_functions_are_unchanged(search):
+    print("🔎 Testing prompts sent without the decorator...")
+    client = make_client()
+    assert asyncio.run(client.chat("Plain objective: nothing to inject")) == "ok"
+    assert client.provider.prompts == ["Plain objective: nothing to inject"]
+    assert search.queries == []
+    print("✅ No search without the decorator")
+
+
+if __name__ == "__main__":
+    tests = [
+        test_search_overlaps_prompt_work,
+        test_prefetched_query_is_reused,
+        test_prompts_outside_decorated_functions_are_unchanged,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 Knowledge injection tests passed!")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test Script for Lead Extraction
+
+Checks that the compiled SelectorPlan returns exactly the leads the previous
+extraction did (it re-parsed every container with BeautifulSoup) on the saved
+pages in test_documents/lead_pages. Run directly to also benchmark both:
+
+    python test_lead_extraction.py [repeats]
+"""
+
+import sys
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+# Add the guild package to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'guild'))
+
+from bs4 import BeautifulSoup
+from parsel import Selector
+
+from guild.src.core.scraping.selector_plan import (
+    DEFAULT_CONTAINER_SELECTOR,
+    DEFAULT_LEAD_SELECTORS,
+    SelectorPlan,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "test_documents" / "lead_pages"
+
+
+def legacy_extract(html: str, url: str, target_selectors: Dict[str, str] = None) -> List[Dict[str, Any]]:
+    """GenericLeadSpider._extract_leads as it was before selector plans."""
+    selectors = {**DEFAULT_LEAD_SELECTORS, **(target_selectors or {})}
+    lead_containers = Selector(text=html).css(DEFAULT_CONTAINER_SELECTOR).getall() or [html]
+
+    leads = []
+    for container_html in lead_containers:
+        lead_data = {}
+        soup = BeautifulSoup(container_html, 'html.parser')
+        for field, selector in selectors.items():
+            elements = soup.select(selector)
+            if elements:
+                lead_data[field] = elements[0].get_text(strip=True)
+                if field in ['email', 'phone'] and elements[0].name == 'a':
+                    href = elements[0].get('href', '')
+                    if field == 'email' and href.startswith('mailto:'):
+                        lead_data[field] = href.replace('mailto:', '')
+                    elif field == 'phone' and href.startswith('tel:'):
+                        lead_data[field] = href.replace('tel:', '')
+        lead_data['source_url'] = url
+        leads.append(lead_data)
+    return leads
+
+
+def compiled_extract(html: str, url: str, plan: SelectorPlan) -> List[Dict[str, Any]]:
+    """Extraction as the spider now does it, including building the response selector."""
+    return plan.extract(Selector(text=html).root, url)
+
+
+def fixture_pages() -> List[Path]:
+    return sorted(FIXTURES_DIR.glob("*.html"))
+
+
+def test_compiled_extraction_matches_legacy():
+    print("🔍 Testing compiled lead extraction against the legacy extractor")
+    pages = fixture_pages()
+    assert pages, f"No fixture pages found in {FIXTURES_DIR}"
+
+    plan = SelectorPlan()
+    for path in pages:
+        html = path.read_text(encoding="utf-8")
+        url = f"https://example.com/{path.stem}"
+        expected = legacy_extract(html, url)
+        actual = compiled_extract(html, url, plan)
+        assert actual == expected, f"{path.name}: compiled extraction differs from legacy"
+        print(f"✅ {path.name}: {len(actual)} leads match")
+
+
+def best_of(fn: Callable[[], Any], repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def benchmark(repeats: int = 5) -> None:
+    plan = SelectorPlan()
+    print(f"\n{'fixture':<32} {'leads':>6} {'legacy s':>9} {'compiled s':>11} {'speedup':>8}")
+    for path in fixture_pages():
+        html = path.read_text(encoding="utf-8")
+        url = f"https://example.com/{path.stem}"
+        leads = compiled_extract(html, url, plan)
+        legacy_seconds = best_of(lambda: legacy_extract(html, url), repeats)
+        compiled_seconds = best_of(lambda: compiled_extract(html, url, plan), repeats)
+        print(
+            f"{path.name:<32} {len(leads):>6} {legacy_seconds:>9.4f} {compiled_seconds:>11.4f} "
+            f"{legacy_seconds / compiled_seconds:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    try:
+        test_compiled_extraction_matches_legacy()
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        sys.exit(1)
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test Script for Single-Flight Request Coalescing
+
+Checks that concurrent identical calls share one in-flight call, that
+different keys and later calls run again, and that errors and cancellation
+behave as documented.
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the guild package to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'guild'))
+
+from guild.src.core.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_call():
+    print("🔁 Testing coalescing of concurrent identical calls...")
+    group = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append("fetch")
+        await asyncio.sleep(0.05)
+        return {"answer": 42}
+
+    async def main():
+        results = await asyncio.gather(*(group.do("same", fetch) for _ in range(5)))
+        assert group.in_flight() == 0
+        return results
+
+    results = asyncio.run(main())
+    assert calls == ["fetch"]
+    assert all(result == {"answer": 42} for result in results)
+    assert group.stats == {"leaders": 1, "followers": 4}
+    print("✅ Five callers, one call")
+
+
+def test_distinct_and_sequential_calls_are_not_coalesced():
+    print("🔁 Testing that different keys and later calls run separately...")
+    group = SingleFlight()
+    calls = []
+
+    async def fetch(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    async def main():
+        first = await asyncio.gather(group.do("a", lambda: fetch("a")), group.do("b", lambda: fetch("b")))
+        second = await group.do("a", lambda: fetch("a"))
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first == ["a", "b"]
+    assert second == "a"
+    assert sorted(calls) == ["a", "a", "b"]
+    print("✅ Distinct keys and sequential calls each ran")
+
+
+def test_errors_reach_every_waiter():
+    print("🔁 Testing error propagation to every waiter...")
+    group = SingleFlight()
+    calls = []
+
+    async def fail():
+        calls.append("fail")
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(*(group.do("key", fail) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert calls == ["fail"]
+    assert all(isinstance(result, ValueError) for result in results)
+    print("✅ Every waiter saw the error")
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    print("🔁 Testing that cancelling one caller leaves the shared call running...")
+    group = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        leader = asyncio.create_task(group.do("key", fetch))
+        follower = asyncio.create_task(group.do("key", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        result = await follower
+        assert leader.cancelled()
+        return result
+
+    assert asyncio.run(main()) == "done"
+    print("✅ Follower still got the result")
+
+
+if __name__ == "__main__":
+    tests = [
+        test_concurrent_calls_share_one_call,
+        test_distinct_and_sequential_calls_are_not_coalesced,
+        test_errors_reach_every_waiter,
+        test_cancelled_caller_does_not_cancel_others,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 Single-flight tests passed!")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Test Script for the Workflow Canvas Indexes
+
+Checks that the per-workflow connection indexes stay identical to what the
+connection list implies after any sequence of node and connection edits.
+"""
+
+import sys
+import os
+import random
+
+# Add the guild package to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'guild'))
+
+from guild.src.core.workflow_builder.workflow_canvas import (
+    WorkflowCanvas,
+    WorkflowConnection,
+    WorkflowNode,
+)
+
+
+def make_canvas(node_count: int = 6):
+    canvas = WorkflowCanvas()
+    workflow_id = canvas.create_workflow("Index test")
+    for i in range(node_count):
+        assert canvas.add_node(workflow_id, WorkflowNode(f"n{i}", "agent", f"Node {i}", ""))
+    return canvas, workflow_id
+
+
+def connect(canvas, workflow_id, connection_id, source, target, source_port="output"):
+    return canvas.add_connection(
+        workflow_id, WorkflowConnection(connection_id, source, target, source_port=source_port)
+    )
+
+
+def assert_index_consistent(canvas: WorkflowCanvas, workflow_id: str):
+    """Rebuilds the indexes from the connection list and compares them with the maintained ones."""
+    workflow = canvas.workflows[workflow_id]
+    graph = canvas.graph_indexes[workflow_id]
+    connections = workflow["connections"]
+
+    assert set(graph["outgoing"]) == set(workflow["nodes"])
+    assert set(graph["incoming"]) == set(workflow["nodes"])
+    for node_id in workflow["nodes"]:
+        expected_out = {c.connection_id for c in connections if c.source_node_id == node_id}
+        expected_in = {c.connection_id for c in connections if c.target_node_id == node_id}
+        assert set(graph["outgoing"][node_id]) == expected_out, node_id
+        assert set(graph["incoming"][node_id]) == expected_in, node_id
+        assert sorted(canvas.get_node_dependents(workflow_id, node_id)) == sorted(
+            c.target_node_id for c in connections if c.source_node_id == node_id
+        )
+        assert sorted(canvas.get_node_dependencies(workflow_id, node_id)) == sorted(
+            c.source_node_id for c in connections if c.target_node_id == node_id
+        )
+        assert canvas.get_node_in_degree(workflow_id, node_id) == len(expected_in)
+
+    assert graph["connection_keys"] == {canvas._connection_key(c) for c in connections}
+    for conn in connections:
+        assert canvas.connection_registry[conn.connection_id] is conn
+
+
+def test_add_and_remove_connections():
+    print("🧭 Testing indexes after adding and removing connections...")
+    canvas, workflow_id = make_canvas()
+    assert connect(canvas, workflow_id, "c1", "n0", "n1")
+    assert connect(canvas, workflow_id, "c2", "n1", "n2")
+    assert connect(canvas, workflow_id, "c3", "n0", "n2")
+    assert_index_consistent(canvas, workflow_id)
+
+    # Duplicate and self connections are rejected without touching the indexes
+    assert not connect(canvas, workflow_id, "dup", "n0", "n1")
+    assert not connect(canvas, workflow_id, "self", "n3", "n3")
+    assert not connect(canvas, workflow_id, "ghost", "n0", "missing")
+    assert_index_consistent(canvas, workflow_id)
+
+    assert canvas.remove_connection(workflow_id, "c1")
+    assert "c1" not in canvas.connection_registry
+    assert_index_consistent(canvas, workflow_id)
+
+    # The same edge can be added again once removed
+    assert connect(canvas, workflow_id, "c1b", "n0", "n1")
+    assert_index_consistent(canvas, workflow_id)
+    print("✅ Indexes follow connection edits")
+
+
+def test_remove_node_drops_its_connections():
+    print("🧭 Testing indexes after removing a node...")
+    canvas, workflow_id = make_canvas()
+    connect(canvas, workflow_id, "c1", "n0", "n1")
+    connect(canvas, workflow_id, "c2", "n1", "n2")
+    connect(canvas, workflow_id, "c3", "n3", "n1")
+    connect(canvas, workflow_id, "c4", "n0", "n2")
+
+    assert canvas.remove_node(workflow_id, "n1")
+    assert [c.connection_id for c in canvas.get_workflow_connections(workflow_id)] == ["c4"]
+    assert not {"c1", "c2", "c3"} & set(canvas.connection_registry)
+    assert_index_consistent(canvas, workflow_id)
+    print("✅ Node removal cleans up its connections")
+
+
+def test_random_edit_sequence():
+    print("🧭 Testing indexes over a random edit sequence...")
+    rng = random.Random(14)
+    canvas, workflow_id = make_canvas(8)
+    next_id = 0
+    for _ in range(400):
+        nodes = list(canvas.workflows[workflow_id]["nodes"])
+        connections = canvas.get_workflow_connections(workflow_id)
+        action = rng.random()
+        if action < 0.55 and len(nodes) > 1:
+            source, target = rng.sample(nodes, 2)
+            connect(canvas, workflow_id, f"c{next_id}", source, target, rng.choice(["output", "result"]))
+            next_id += 1
+        elif action < 0.85 and connections:
+            canvas.remove_connection(workflow_id, rng.choice(connections).connection_id)
+        elif action < 0.93 and nodes:
+            canvas.remove_node(workflow_id, rng.choice(nodes))
+        else:
+            node_id = f"n{next_id}"
+            next_id += 1
+            canvas.add_node(workflow_id, WorkflowNode(node_id, "logic", node_id, ""))
+        assert_index_consistent(canvas, workflow_id)
+    print("✅ Indexes stayed consistent")
+
+
+def test_cycle_detection_uses_current_connections():
+    print("🧭 Testing cycle detection after edits...")
+    canvas, workflow_id = make_canvas(3)
+    connect(canvas, workflow_id, "c1", "n0", "n1")
+    connect(canvas, workflow_id, "c2", "n1", "n2")
+    connect(canvas, workflow_id, "c3", "n2", "n0")
+    assert "Workflow contains cycles" in canvas.validate_workflow(workflow_id)["errors"]
+
+    canvas.remove_connection(workflow_id, "c3")
+    assert "Workflow contains cycles" not in canvas.validate_workflow(workflow_id)["errors"]
+    print("✅ Cycle detection sees removed connections")
+
+
+def test_import_rebuilds_indexes():
+    print("🧭 Testing indexes of an imported workflow...")
+    canvas, workflow_id = make_canvas(4)
+    connect(canvas, workflow_id, "c1", "n0", "n1")
+    connect(canvas, workflow_id, "c2", "n1", "n3")
+    exported = canvas.export_workflow(workflow_id)
+    exported["workflow_id"] = "imported"
+
+    other = WorkflowCanvas()
+    imported_id = other.import_workflow(exported)
+    assert imported_id == "imported"
+    assert_index_consistent(other, imported_id)
+    assert other.get_node_dependencies(imported_id, "n3") == ["n1"]
+    print("✅ Imported workflow is indexed")
+
+
+if __name__ == "__main__":
+    tests = [
+        test_add_and_remove_connections,
+        test_remove_node_drops_its_connections,
+        test_random_edit_sequence,
+        test_cycle_detection_uses_current_connections,
+        test_import_rebuilds_indexes,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__} failed: {e}")
+    if failed:
+        sys.exit(1)
+    print("\n🎉 Workflow canvas index tests passed!")